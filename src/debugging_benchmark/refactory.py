@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from ast import literal_eval
-from typing import Type, List, Callable, Dict, Sequence, Any
+from typing import Type, List, Callable, Dict, Sequence, Any, Optional
 from pathlib import Path
 import string
 import os
@@ -10,7 +10,14 @@ from debugging_framework.input.oracle import OracleResult
 from debugging_framework.benchmark.loader import load_object_dynamically
 from debugging_framework.benchmark.program import BenchmarkProgram
 from debugging_framework.benchmark.repository import BenchmarkRepository
-from debugging_framework.input.oracle_construction import FunctionalOracleConstructor
+from debugging_framework.input.oracle_construction import (
+    FunctionalOracleConstructor,
+    ReferenceMemo,
+)
+from debugging_framework.execution.timeout_calibration import (
+    calibrate_timeout,
+    get_calibration_inputs,
+)
 
 
 class RefactoryBenchmarkProgram(BenchmarkProgram):
@@ -22,8 +29,17 @@ class RefactoryBenchmarkProgram(BenchmarkProgram):
         grammar: Grammar,
         initial_inputs: List[str],
         oracle: Callable,
+        timeout: Optional[float] = None,
     ):
-        super().__init__(name, grammar, oracle, initial_inputs)
+        # Whether an initial input passes depends on the variant
+        super().__init__(
+            name,
+            grammar,
+            oracle,
+            failing_inputs=initial_inputs,
+            passing_inputs=[],
+            timeout=timeout,
+        )
         self.bug_id = bug_id
         self.implementation_function_name = implementation_function_name
 
@@ -85,19 +101,24 @@ class RefactoryBenchmarkRepository(BenchmarkRepository, ABC):
         error_def: Dict[Type[Exception], OracleResult],
         default_oracle: OracleResult,
         solution_type: str,
+        reference_memo: Optional[ReferenceMemo] = None,
+        timeout: Optional[float] = None,
     ) -> RefactoryBenchmarkProgram:
         formatted_bug_id = str(bug_id).zfill(3)
         ground_truth = self.load_ground_truth(implementation_function_name)
         program = self.load_implementation(solution_type, formatted_bug_id, implementation_function_name)
+        if timeout is None:
+            timeout = self.calibrate_timeout(implementation_function_name)
 
         oracle = FunctionalOracleConstructor(
             program=program,
             program_oracle=ground_truth,
             error_definitions=error_def,
             default_oracle_result=default_oracle,
-            timeout=0.01,
-            harness_function=self.harness_function
-        )
+            timeout=timeout,
+            harness_function=self.harness_function,
+            reference_memo=reference_memo,
+        ).build()
 
         return RefactoryBenchmarkProgram(
             name=self.get_name(),
@@ -106,6 +127,17 @@ class RefactoryBenchmarkRepository(BenchmarkRepository, ABC):
             grammar=self.get_grammar(),
             initial_inputs=self.get_initial_inputs(),
             oracle=oracle,
+            timeout=timeout,
+        )
+
+    def calibrate_timeout(self, implementation_function_name: str) -> float:
+        """
+        Calibrates the timeout on the reference implementation of the question.
+        """
+        return calibrate_timeout(
+            self.load_ground_truth(implementation_function_name),
+            get_calibration_inputs(self.get_grammar(), self.get_initial_inputs()),
+            harness_function=self.harness_function,
         )
 
     def build(
@@ -117,12 +149,30 @@ class RefactoryBenchmarkRepository(BenchmarkRepository, ABC):
         path_to_subjects = self.get_dir() / Path(f"code/{solution_type}")
         number_of_subjects = len(list(path_to_subjects.resolve().glob("*.py")))
 
+        # All variants share one reference implementation per function
+        reference_memos: Dict[str, ReferenceMemo] = {
+            implementation_function_name: ReferenceMemo()
+            for implementation_function_name in self.get_implementation_function_name()
+        }
+        timeouts: Dict[str, float] = {
+            implementation_function_name: self.calibrate_timeout(
+                implementation_function_name
+            )
+            for implementation_function_name in self.get_implementation_function_name()
+        }
+
         constructed_test_programs: List[RefactoryBenchmarkProgram] = []
         for bug_id in range(1, number_of_subjects):
             try:
                 for implementation_function_name in self.get_implementation_function_name():
                     subject = self._construct_test_program(
-                        bug_id, implementation_function_name, err_def, default_oracle, solution_type
+                        bug_id,
+                        implementation_function_name,
+                        err_def,
+                        default_oracle,
+                        solution_type,
+                        reference_memos[implementation_function_name],
+                        timeouts[implementation_function_name],
                 )
                     constructed_test_programs.append(subject)
             except Exception as e:
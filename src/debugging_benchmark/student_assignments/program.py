@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from debugging_framework.benchmark.program import BenchmarkProgram
 from debugging_framework.fuzzingbook.grammar import Grammar
@@ -13,8 +13,11 @@ class StudentAssignmentBenchmarkProgram(BenchmarkProgram):
         failing_inputs: List[str],
         passing_inputs: List[str],
         oracle: OracleType,
+        timeout: Optional[float] = None,
     ):
-        super().__init__(name, grammar, oracle, failing_inputs, passing_inputs)
+        super().__init__(
+            name, grammar, oracle, failing_inputs, passing_inputs, timeout=timeout
+        )
 
     def __repr__(self):
         return f"StudentAssignmentBenchmarkProgram({self.name})"
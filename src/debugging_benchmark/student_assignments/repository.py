@@ -10,7 +10,14 @@ from debugging_benchmark.student_assignments.program import (
 )
 from debugging_framework.benchmark.loader import load_function_from_class
 import debugging_benchmark.student_assignments.projects as sap_projects
-from debugging_framework.input.oracle_construction import FunctionalOracleConstructor
+from debugging_framework.input.oracle_construction import (
+    FunctionalOracleConstructor,
+    ReferenceMemo,
+)
+from debugging_framework.execution.timeout_calibration import (
+    calibrate_timeout,
+    get_calibration_inputs,
+)
 
 
 class StudentAssignmentRepository(BenchmarkRepository, ABC):
@@ -20,6 +27,35 @@ class StudentAssignmentRepository(BenchmarkRepository, ABC):
         :param List[StudentAssignmentProject] projects: The projects to be included in the benchmark repository.
         """
         self.projects = projects
+        self._reference_memos: Dict[Path, ReferenceMemo] = {}
+        self._timeouts: Dict[Path, float] = {}
+
+    def get_reference_memo(
+        self, project: sap_projects.StudentAssignmentProject
+    ) -> ReferenceMemo:
+        """
+        Returns the memo of reference results shared by all projects with the same ground truth.
+        """
+        ground_truth_location = self.get_ground_truth_location(project)
+        if ground_truth_location not in self._reference_memos:
+            self._reference_memos[ground_truth_location] = ReferenceMemo()
+        return self._reference_memos[ground_truth_location]
+
+    def get_timeout(self, project: sap_projects.StudentAssignmentProject) -> float:
+        """
+        Returns the timeout calibrated on the ground truth of the project.
+        The calibration runs once per ground truth and is shared by all projects using it.
+        """
+        ground_truth_location = self.get_ground_truth_location(project)
+        if ground_truth_location not in self._timeouts:
+            self._timeouts[ground_truth_location] = calibrate_timeout(
+                self.load_ground_truth(project),
+                get_calibration_inputs(
+                    project.grammar, project.passing_inputs + project.failing_inputs
+                ),
+                harness_function=project.harness_function,
+            )
+        return self._timeouts[ground_truth_location]
 
     @staticmethod
     def get_ground_truth_location(
@@ -45,14 +81,16 @@ class StudentAssignmentRepository(BenchmarkRepository, ABC):
     ) -> StudentAssignmentBenchmarkProgram:
         ground_truth = self.load_ground_truth(project=project)
         program = self.load_implementation(project=project)
+        timeout = self.get_timeout(project)
 
         oracle = FunctionalOracleConstructor(
             program=program,
             program_oracle=ground_truth,
             error_definitions=err_def,
             default_oracle_result=default_oracle,
-            timeout=0.01,
+            timeout=timeout,
             harness_function=project.harness_function,
+            reference_memo=self.get_reference_memo(project),
         ).build()
 
         return StudentAssignmentBenchmarkProgram(
@@ -61,6 +99,7 @@ class StudentAssignmentRepository(BenchmarkRepository, ABC):
             oracle=oracle,
             failing_inputs=project.failing_inputs,
             passing_inputs=project.passing_inputs,
+            timeout=timeout,
         )
 
     def build(
@@ -9,7 +9,8 @@ from tests4py.api.report import TestResult, GetTestReport
 from debugging_framework.input.input import Input
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.execution.exceptions import Tests4PySubjectException
-from debugging_framework.types import HarnessFunctionType
+from debugging_framework.execution.execution_handler import to_async_oracle
+from debugging_framework.types import HarnessFunctionType, AsyncOracleType
 
 # Set default working directory
 DEFAULT_WORK_DIR = Path("/tmp")
@@ -87,3 +88,15 @@ def construct_oracle(
             return map_result(report.test_result), exception
 
     return oracle
+
+
+def construct_async_oracle(
+    project: Project,
+    harness_function: HarnessFunctionType,
+    work_dir: Path = DEFAULT_WORK_DIR,
+    max_concurrency: int = 8,
+) -> AsyncOracleType:
+    """Construct an async oracle for the given project that waits for each run in a worker thread."""
+    return to_async_oracle(
+        construct_oracle(project, harness_function, work_dir), max_concurrency
+    )
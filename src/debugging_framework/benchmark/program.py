@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from abc import ABC
 import dill as pickle
 
@@ -18,12 +18,14 @@ class BenchmarkProgram(ABC):
         oracle: OracleType,
         failing_inputs: List[str],
         passing_inputs: List[str],
+        timeout: Optional[float] = None,
     ):
         self.name = name
         self.grammar = grammar
         self.oracle = oracle
         self.failing_inputs = failing_inputs
         self.passing_inputs = passing_inputs
+        self.timeout = timeout
 
     def __repr__(self):
         return f"BenchmarkProgram({self.name})"
@@ -70,6 +72,13 @@ class BenchmarkProgram(ABC):
         """
         return self.oracle
 
+    def get_timeout(self) -> Optional[float]:
+        """
+        Retrieves the timeout used by the oracle for a single program execution.
+        :return Optional[float]: The timeout in seconds, or None if the oracle does not enforce one.
+        """
+        return self.timeout
+
     def to_dict(self, only_passing: bool = False) -> Dict[str, Any]:
         """
         Serializes essential elements of the program to a dictionary, optionally filtering for only passing inputs.
@@ -22,4 +22,12 @@ def get_docker_runner_files():
         "debugging_framework.resources", "docker_runner_inputs.py"
     ) as runner_path:
         docker_files.append(runner_path)
+    with pkg_resources.path(
+        "debugging_framework.resources", "docker_worker.py"
+    ) as worker_path:
+        docker_files.append(worker_path)
+    with pkg_resources.path(
+        "debugging_framework.resources", "docker_runner_batch.py"
+    ) as runner_path:
+        docker_files.append(runner_path)
     return docker_files
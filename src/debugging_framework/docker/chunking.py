@@ -0,0 +1,61 @@
+from typing import Optional
+
+
+class AdaptiveChunkSize:
+    """
+    Chooses how many inputs are shipped to a container at once.
+
+    Every chunk pays a fixed round trip (archive upload, exec, result download) on top of the time per input.
+    After each chunk, the measured time per input is smoothed and the next chunk is sized so that it takes about
+    target_seconds; the size at most doubles per chunk, so the fixed costs are amortized over ever larger chunks
+    until the target is reached.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 16,
+        min_size: int = 1,
+        max_size: int = 1000,
+        target_seconds: float = 10.0,
+        smoothing: float = 0.5,
+    ):
+        """
+        :param int initial_size: The size of the first chunk.
+        :param int min_size: The minimum chunk size.
+        :param int max_size: The maximum chunk size.
+        :param float target_seconds: The time a single chunk should take.
+        :param float smoothing: The weight of the latest measurement in the moving average of the time per input.
+        """
+        assert 1 <= min_size <= initial_size <= max_size
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.smoothing = smoothing
+        self.seconds_per_input: Optional[float] = None
+
+    def update(self, number_of_inputs: int, elapsed_seconds: float) -> int:
+        """
+        Records the time a chunk took and computes the size of the next chunk.
+        :param int number_of_inputs: The number of inputs in the chunk.
+        :param float elapsed_seconds: The wall-clock time of the chunk, including the round trip.
+        :return int: The size of the next chunk.
+        """
+        if number_of_inputs <= 0:
+            return self.size
+
+        latency = elapsed_seconds / number_of_inputs
+        if self.seconds_per_input is None:
+            self.seconds_per_input = latency
+        else:
+            self.seconds_per_input = (
+                self.smoothing * latency
+                + (1 - self.smoothing) * self.seconds_per_input
+            )
+
+        if self.seconds_per_input > 0:
+            target_size = int(self.target_seconds / self.seconds_per_input)
+        else:
+            target_size = self.max_size
+        self.size = max(self.min_size, min(self.max_size, 2 * self.size, target_size))
+        return self.size
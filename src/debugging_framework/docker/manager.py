@@ -6,24 +6,56 @@ import queue
 import tarfile
 import io
 import hashlib
+import asyncio
+import weakref
 import concurrent.futures
+import json
+import time
+import uuid
 from docker.errors import BuildError, ImageNotFound, APIError
 from docker.models.images import Image
 from docker.models.containers import Container
 import tempfile
 import shutil
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from tests4py.projects import Project
 
 from debugging_framework.docker import get_base_dockerfile, get_docker_runner_files
+from debugging_framework.docker.worker import (
+    ContainerWorker,
+    ContainerWorkerError,
+    ContainerWorkerTimeout,
+)
+from debugging_framework.docker.chunking import AdaptiveChunkSize
 from debugging_framework.input.oracle import OracleResult
+from debugging_framework.types import AsyncOracleType
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 BASE_IMAGE_TAG = "base_image"
+BASE_REQUIREMENTS_FILE = "requirements_docker.txt"
+# Number of hex digits of the build input hash used in image tags
+IMAGE_HASH_LENGTH = 12
+BATCH_INPUTS_FILE = "batch_inputs.jsonl"
+BATCH_RESULTS_FILE = "batch_results.jsonl"
+
+# Labels identifying the containers of a project, so persistent containers can be found again
+LABEL_PROJECT = "debugging_framework.project"
+LABEL_IMAGE = "debugging_framework.image"
+LABEL_PERSISTENT = "debugging_framework.persistent"
+
+# State of a persistent container: busy while a session uses it, idle afterwards. A busy session refreshes the
+# time of the state as a heartbeat. The lock directory is created atomically by the session claiming the container.
+SESSION_STATE_FILE = ".session.json"
+SESSION_LOCK_DIR = ".session.lock"
+SESSION_BUSY = "busy"
+SESSION_IDLE = "idle"
+
+# Files in /app written by sessions, removed before a container is reused
+SCRATCH_FILES = ["input.txt", BATCH_INPUTS_FILE, BATCH_RESULTS_FILE]
 
 
 def copy_files_to_temp(src_files, temp_dir):
@@ -35,9 +67,107 @@ def get_input_hash(input_str: str) -> str:
     return hashlib.sha256(input_str.encode("utf-8")).hexdigest()
 
 
+def get_build_hash(dockerfile: str, files: List[str | os.PathLike], *extra: str) -> str:
+    """
+    Hashes the inputs of an image build, so the image can be tagged by its content and only rebuilt if they change.
+    :param str dockerfile: The text of the Dockerfile.
+    :param List files: The files copied into the build context; their names and contents are hashed.
+    :param str extra: Further values the image depends on, e.g., the python version.
+    :return str: The first IMAGE_HASH_LENGTH hex digits of the hash.
+    """
+    digest = hashlib.sha256()
+    digest.update(dockerfile.encode("utf-8"))
+    for file in sorted(files, key=lambda f: os.path.basename(f)):
+        digest.update(b"\0" + os.path.basename(file).encode("utf-8") + b"\0")
+        with open(file, "rb") as f:
+            digest.update(f.read())
+    for value in extra:
+        digest.update(b"\0" + str(value).encode("utf-8"))
+    return digest.hexdigest()[:IMAGE_HASH_LENGTH]
+
+
+class PoolHealth:
+    """
+    Summarizes the failures of the container pool during run_inputs.
+    """
+
+    def __init__(self):
+        self.container_failures = 0
+        self.worker_restarts = 0
+        self.replaced_containers: List[str] = []
+        self.lost_containers: List[str] = []
+        self.retried_inputs = 0
+        self.undefined_inputs: List[str] = []
+        self._lock = threading.Lock()
+
+    def record_failure(self, retried_inputs: List[str], undefined_inputs: List[str]):
+        with self._lock:
+            self.container_failures += 1
+            self.retried_inputs += len(retried_inputs)
+            self.undefined_inputs.extend(undefined_inputs)
+
+    def record_worker_restart(self, undefined_inputs: List[str]):
+        with self._lock:
+            self.worker_restarts += 1
+            self.undefined_inputs.extend(undefined_inputs)
+
+    def record_replacement(self, container: Container, replacement: Container | None):
+        with self._lock:
+            if replacement is None:
+                self.lost_containers.append(container.name)
+            else:
+                self.replaced_containers.append(container.name)
+
+    def record_undefined(self, inputs: List[str]):
+        with self._lock:
+            self.undefined_inputs.extend(inputs)
+
+    def is_healthy(self) -> bool:
+        return self.container_failures == 0 and not self.undefined_inputs
+
+    def summary(self) -> Dict[str, int]:
+        """
+        :return Dict[str, int]: The number of container failures, worker restarts, replaced and lost containers,
+            retried inputs and inputs recorded as UNDEFINED.
+        """
+        with self._lock:
+            return {
+                "container_failures": self.container_failures,
+                "worker_restarts": self.worker_restarts,
+                "replaced_containers": len(self.replaced_containers),
+                "lost_containers": len(self.lost_containers),
+                "retried_inputs": self.retried_inputs,
+                "undefined_inputs": len(self.undefined_inputs),
+            }
+
+
 class DockerManager:
 
-    def __init__(self, project: Project):
+    def __init__(
+        self,
+        project: Project,
+        use_workers: bool = True,
+        request_timeout: float | None = None,
+        max_retries: int = 2,
+        max_replacements: int = 5,
+        persistent: bool = False,
+        idle_ttl: float = 3600.0,
+    ):
+        """
+        :param Project project: The Tests4Py project to run.
+        :param bool use_workers: Whether inputs are sent to a long-lived worker in each container
+            (see ContainerWorker) instead of starting a new interpreter per input.
+        :param float | None request_timeout: Seconds an input may run in a worker before it is aborted and recorded
+            as UNDEFINED; a worker that stops answering is restarted and its input recorded as UNDEFINED (see
+            ContainerWorker). Runs forever if None.
+        :param int max_retries: How often an input is re-queued after the container running it failed, before it
+            is recorded as UNDEFINED.
+        :param int max_replacements: How often each container of the pool may be replaced after a failure.
+        :param bool persistent: Whether containers are kept running after the session and reused by later sessions
+            for the same project and image (see build_container).
+        :param float idle_ttl: Seconds a persistent container may stay idle before the next session removes it.
+            A busy container whose session has not refreshed its heartbeat for as long counts as abandoned.
+        """
         self.base_image = None
         self.image = None
         self.docker_socket = self._configure_docker_socket()
@@ -45,7 +175,17 @@ class DockerManager:
         self.container: List[Container] = []
         self.dockerfile_path = None
         self.project: Project = project
-        self._exception_event = threading.Event()
+        self.use_workers = use_workers
+        self.request_timeout = request_timeout
+        self.workers: Dict[str, ContainerWorker] = {}
+        self.max_retries = max_retries
+        self.max_replacements = max_replacements
+        self.health: PoolHealth = PoolHealth()
+        self._pool_lock = threading.Lock()
+        self.persistent = persistent
+        self.idle_ttl = idle_ttl
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
 
     def __enter__(self):
         return self
@@ -102,14 +242,25 @@ class DockerManager:
         return image
 
     def build(self):
+        """
+        Builds the base image, the python layer for the python version of the project, and the subject image.
+        Every image is tagged by a hash of its build inputs (Dockerfile, copied files, python version, project), so
+        an image is only rebuilt if its inputs changed. The python layer is shared by all subjects with the same
+        python version, so each interpreter is only installed once.
+        """
         # Build base image
         base_dockerfile = get_base_dockerfile()
         base_dockerfile_name = str(base_dockerfile.name)
         base_dockerfile_path = str(base_dockerfile.parent)
+        base_hash = get_build_hash(
+            base_dockerfile.read_text(),
+            [os.path.join(base_dockerfile_path, BASE_REQUIREMENTS_FILE)],
+        )
+        base_image_tag = f"{BASE_IMAGE_TAG}:{base_hash}"
 
         self.base_image = self.build_image(
             path_to_docker_dir=base_dockerfile_path,
-            image_tag=BASE_IMAGE_TAG,
+            image_tag=base_image_tag,
             dockerfile=base_dockerfile_name,
         )
 
@@ -117,12 +268,36 @@ class DockerManager:
         with tempfile.TemporaryDirectory() as temp_dir:
             logger.info("Temporary directory created at: %s", temp_dir)
 
+            # Build python layer, shared by all subjects with the same python version
+            python_version = self.project.python_version
+            python_dockerfile = self._get_python_dockerfile(base_image_tag)
+            python_image_tag = (
+                f"python_{python_version}:"
+                f"{get_build_hash(python_dockerfile, [], python_version)}"
+            )
+            python_dockerfile_name = f"Dockerfile.python_{python_version}"
+            self._write_dockerfile(
+                python_dockerfile, os.path.join(temp_dir, python_dockerfile_name)
+            )
+            self.build_image(
+                path_to_docker_dir=temp_dir,
+                image_tag=python_image_tag,
+                dockerfile=python_dockerfile_name,
+            )
+
             # Build subject image
-            subject_image_tag = f"{self.project.get_identifier()}_image"
+            subject_dockerfile = self._get_subject_dockerfile(python_image_tag)
+            subject_hash = get_build_hash(
+                subject_dockerfile,
+                get_docker_runner_files(),
+                python_version,
+                self.project.get_identifier(),
+            )
+            subject_image_tag = f"{self.project.get_identifier()}_image:{subject_hash}"
             subject_dockerfile_name = f"Dockerfile.{self.project.get_identifier()}"
 
             dockerfile_file_location = os.path.join(temp_dir, subject_dockerfile_name)
-            self._create_subject_dockerfile(dockerfile_file_location)
+            self._write_dockerfile(subject_dockerfile, dockerfile_file_location)
 
             # Copy files to the temporary directory
             copy_files_to_temp(get_docker_runner_files(), temp_dir)
@@ -138,10 +313,36 @@ class DockerManager:
             )
 
     def build_container(self, number_of_containers: int):
+        """
+        Starts the containers of the pool. In persistent mode, idle containers left running by earlier sessions for
+        the same project and image are reset and reused first, and expired or abandoned ones are removed. While the
+        session runs, a heartbeat marks its containers as busy.
+        :param int number_of_containers: The number of containers.
+        """
+        if self.persistent:
+            warm_containers = self._acquire_warm_containers(number_of_containers)
+            self.container.extend(warm_containers)
+            for _ in range(number_of_containers - len(warm_containers)):
+                self._create_container(container_name=self._get_unique_container_name())
+            self._start_heartbeat()
+            return
+
         container_name = f"{self.project.get_identifier()}_container"
         for i in range(number_of_containers):
             self._create_container(container_name=f"{container_name}_{i}")
 
+    def _get_unique_container_name(self) -> str:
+        return f"{self.project.get_identifier()}_container_{uuid.uuid4().hex[:8]}"
+
+    def _get_container_labels(self) -> Dict[str, str]:
+        labels = {
+            LABEL_PROJECT: self.project.get_identifier(),
+            LABEL_IMAGE: self.image.id,
+        }
+        if self.persistent:
+            labels[LABEL_PERSISTENT] = "true"
+        return labels
+
     def _create_container(self, container_name=None):
         if not self.image:
             raise RuntimeError("Image has not been built. Call build() first.")
@@ -152,14 +353,211 @@ class DockerManager:
                 detach=True,
                 tty=True,
                 stdin_open=True,
+                labels=self._get_container_labels(),
             )
+            if self.persistent:
+                # Claimed before it starts, so no other session can take or remove it
+                self._write_session_state(container, SESSION_BUSY, lock=True)
             container.start()
             self.container.append(container)
+            return container
         except APIError as e:
             logger.error(f"Error creating container: {e}")
             raise
 
+    def _write_session_state(self, container: Container, state: str, lock: bool = False):
+        """
+        Marks a persistent container as busy (used by a session) or idle, with the current time.
+        :param bool lock: Whether to create the lock directory in the same archive, e.g., for a new container.
+        """
+        state_bytes = json.dumps({"state": state, "since": time.time()}).encode("utf-8")
+        tarstream = io.BytesIO()
+        with tarfile.open(fileobj=tarstream, mode="w") as tar:
+            if lock:
+                lockinfo = tarfile.TarInfo(name=SESSION_LOCK_DIR)
+                lockinfo.type = tarfile.DIRTYPE
+                lockinfo.mode = 0o755
+                tar.addfile(lockinfo)
+            tarinfo = tarfile.TarInfo(name=SESSION_STATE_FILE)
+            tarinfo.size = len(state_bytes)
+            tar.addfile(tarinfo, io.BytesIO(state_bytes))
+        tarstream.seek(0)
+        container.put_archive(path="/app", data=tarstream)
+
+    @staticmethod
+    def _claim_container(container: Container) -> bool:
+        """
+        Claims a persistent container by creating its lock directory; mkdir fails if another session holds it.
+        :return bool: True if this session now holds the container.
+        """
+        exec_result = container.exec_run(
+            cmd=["mkdir", SESSION_LOCK_DIR], workdir="/app", tty=False
+        )
+        return exec_result.exit_code == 0
+
+    def _release_container(self, container: Container):
+        """
+        Marks a persistent container as idle and releases its lock, so the next session can claim it.
+        """
+        self._write_session_state(container, SESSION_IDLE)
+        container.exec_run(cmd=["rmdir", SESSION_LOCK_DIR], workdir="/app", tty=False)
+
+    def _start_heartbeat(self):
+        """
+        Refreshes the busy state of the session's containers in the background, so other sessions do not take
+        them for abandoned however long this session runs.
+        """
+        if self._heartbeat is not None:
+            return
+        self._heartbeat_stop.clear()
+
+        def beat():
+            while not self._heartbeat_stop.wait(self.idle_ttl / 4):
+                with self._pool_lock:
+                    containers = list(self.container)
+                for container in containers:
+                    try:
+                        self._write_session_state(container, SESSION_BUSY)
+                    except Exception as e:
+                        logger.warning(f"Heartbeat of container {container.name} failed: {e}")
+
+        self._heartbeat = threading.Thread(target=beat, daemon=True)
+        self._heartbeat.start()
+
+    def _stop_heartbeat(self):
+        if self._heartbeat is not None:
+            self._heartbeat_stop.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    @staticmethod
+    def _read_session_state(container: Container) -> Optional[Dict]:
+        try:
+            bits, _ = container.get_archive(f"/app/{SESSION_STATE_FILE}")
+            with tarfile.open(fileobj=io.BytesIO(b"".join(bits))) as tar:
+                member = tar.getmembers()[0]
+                return json.loads(tar.extractfile(member).read().decode("utf-8"))
+        except (docker.errors.NotFound, APIError, ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _reset_container(container: Container) -> bool:
+        """
+        Removes the scratch files of earlier sessions from /app and checks that the container still runs commands.
+        :return bool: True if the container is healthy.
+        """
+        exec_result = container.exec_run(
+            cmd=["rm", "-f"] + SCRATCH_FILES, workdir="/app", tty=False
+        )
+        return exec_result.exit_code == 0
+
+    def _acquire_warm_containers(self, number_of_containers: int) -> List[Container]:
+        """
+        Finds the persistent containers left by earlier sessions for this project. Idle containers of the current
+        image are claimed, reset and reused, up to number_of_containers. Containers are only removed if this session
+        could claim them (outdated image, idle for longer than idle_ttl, unhealthy), if they stopped running, or if
+        their session has not refreshed its heartbeat for longer than idle_ttl (abandoned by a crashed session).
+        Containers of running sessions, including non-persistent ones, are never touched.
+        :param int number_of_containers: The maximum number of containers to reuse.
+        :return List[Container]: The reused containers, marked as busy.
+        """
+        acquired = []
+        candidates = self.client.containers.list(
+            all=True,
+            filters={
+                "label": [
+                    f"{LABEL_PROJECT}={self.project.get_identifier()}",
+                    f"{LABEL_PERSISTENT}=true",
+                ]
+            },
+        )
+        for container in candidates:
+            state = self._read_session_state(container)
+            if state is None:
+                # Every persistent container gets its state before it starts; without one, it is still created
+                if container.status == "created":
+                    continue
+            elif state["state"] == SESSION_BUSY:
+                if time.time() - state["since"] <= self.idle_ttl:
+                    # In use by another session
+                    continue
+            elif container.status == "running":
+                stale = (
+                    time.time() - state["since"] > self.idle_ttl
+                    or container.labels.get(LABEL_IMAGE) != self.image.id
+                )
+                if not stale and len(acquired) >= number_of_containers:
+                    # Keep it warm for the next session
+                    continue
+                try:
+                    if not self._claim_container(container):
+                        # Claimed by another session in the meantime
+                        continue
+                    if not stale and self._reset_container(container):
+                        self._write_session_state(container, SESSION_BUSY)
+                        acquired.append(container)
+                        logger.info("Reusing warm container %s.", container.name)
+                        continue
+                except APIError as e:
+                    logger.warning(f"Container {container.name} is not healthy: {e}")
+
+            logger.info("Removing stale container %s.", container.name)
+            try:
+                container.remove(force=True)
+            except APIError as e:
+                logger.warning(f"Could not remove container {container.name}: {e}")
+        return acquired
+
+    def _replace_container(self, container: Container) -> Container:
+        """
+        Quarantines a failed container, i.e., takes it out of the pool and removes it, and starts a replacement.
+        :param Container container: The failed container.
+        :return Container: The replacement.
+        """
+        worker = self.workers.pop(container.id, None)
+        if worker:
+            worker.close()
+        with self._pool_lock:
+            if container in self.container:
+                self.container.remove(container)
+        try:
+            container.kill()
+            container.remove()
+        except Exception as e:
+            logger.warning(f"Could not remove quarantined container {container.name}: {e}")
+
+        with self._pool_lock:
+            replacement = self._create_container(
+                container_name=self._get_unique_container_name()
+            )
+        logger.info("Replaced container %s by %s.", container.name, replacement.name)
+        return replacement
+
+    def _get_worker(self, container: Container) -> ContainerWorker:
+        worker = self.workers.get(container.id)
+        if worker is None:
+            worker = ContainerWorker(
+                self.client, container, request_timeout=self.request_timeout
+            )
+            self.workers[container.id] = worker
+        return worker
+
     def cleanup(self):
+        for worker in self.workers.values():
+            worker.close()
+        self.workers.clear()
+
+        if self.persistent:
+            self._stop_heartbeat()
+            # Keep the containers warm for the next session
+            for container in self.container:
+                try:
+                    self._release_container(container)
+                except Exception as e:
+                    logger.error(f"Error releasing container {container.name}: {e}")
+            self.container = []
+            return
+
         for container in self.container:
             try:
                 container.kill()
@@ -169,7 +567,24 @@ class DockerManager:
             except Exception as e:
                 logger.error(f"Error during container cleanup: {e}")
 
+    @staticmethod
+    def _is_running(container: Container) -> bool:
+        try:
+            container.reload()
+        except Exception:
+            return False
+        return container.status == "running"
+
     def _run_input_in_container(self, container: Container, input_str: str) -> str:
+        if not self.use_workers:
+            return self._exec_input_in_container(container, input_str)
+        try:
+            return self._get_worker(container).run(input_str)
+        except Exception as e:
+            logger.error(f"Error running input in worker of container {container.name}: {e}")
+            raise
+
+    def _exec_input_in_container(self, container: Container, input_str: str) -> str:
         try:
             # Create a tar archive in memory containing the input file
             tarstream = io.BytesIO()
@@ -195,55 +610,297 @@ class DockerManager:
             return output.strip()
         except Exception as e:
             logger.error(f"Error executing command in container {container.name}: {e}")
-            self._exception_event.set()
             raise
 
-    def run_inputs(self, inputs: List[str]) -> Dict[str, OracleResult]:
+    def _run_batch_in_container(
+        self, container: Container, inputs: List[str]
+    ) -> List[str]:
+        if not self.use_workers:
+            return self._exec_batch_in_container(container, inputs)
+        try:
+            return self._get_worker(container).run_many(inputs)
+        except Exception as e:
+            logger.error(f"Error running inputs in worker of container {container.name}: {e}")
+            raise
+
+    def _exec_batch_in_container(
+        self, container: Container, inputs: List[str]
+    ) -> List[str]:
+        try:
+            # Create a tar archive in memory containing all inputs, one JSON string per line
+            tarstream = io.BytesIO()
+            with tarfile.open(fileobj=tarstream, mode="w") as tar:
+                tarinfo = tarfile.TarInfo(name=BATCH_INPUTS_FILE)
+                input_bytes = "".join(
+                    json.dumps(input_str) + "\n" for input_str in inputs
+                ).encode("utf-8")
+                tarinfo.size = len(input_bytes)
+                tar.addfile(tarinfo, io.BytesIO(input_bytes))
+            tarstream.seek(0)
+            container.put_archive(path="/app", data=tarstream)
+
+            # Run all inputs with a single exec
+            command = [
+                "python3",
+                "docker_runner_batch.py",
+                BATCH_INPUTS_FILE,
+                BATCH_RESULTS_FILE,
+            ]
+            exec_result = container.exec_run(
+                cmd=command, workdir="/app", tty=False, demux=True
+            )
+            stdout, stderr = exec_result.output
+            if exec_result.exit_code != 0:
+                raise RuntimeError(
+                    f"Batch runner exited with {exec_result.exit_code}: "
+                    f"{(stderr or stdout or b'').decode('utf-8')}"
+                )
+
+            # Fetch the result file, one JSON object per input
+            bits, _ = container.get_archive(f"/app/{BATCH_RESULTS_FILE}")
+            with tarfile.open(fileobj=io.BytesIO(b"".join(bits))) as tar:
+                member = tar.getmembers()[0]
+                lines = tar.extractfile(member).read().decode("utf-8").splitlines()
+            results = [json.loads(line)["result"] for line in lines if line.strip()]
+            if len(results) != len(inputs):
+                raise RuntimeError(
+                    f"Batch runner returned {len(results)} results for {len(inputs)} inputs."
+                )
+            return results
+        except Exception as e:
+            logger.error(f"Error executing batch in container {container.name}: {e}")
+            raise
+
+    def run_inputs(
+        self, inputs: List[str], batched: bool = False, chunk_size: int | None = None
+    ) -> Dict[str, OracleResult]:
+        """
+        Runs the inputs in all containers of the pool.
+        If a worker does not answer in time, only the worker is restarted: the input it hangs on is recorded as
+        UNDEFINED and the inputs after it are re-queued. If a container fails, it is quarantined and replaced (at
+        most max_replacements times per container), and its in-flight inputs are re-queued; if only its worker died,
+        the container is kept and the worker restarted. An input is recorded as UNDEFINED once it was part of more
+        than max_retries failures, or if no container is left to run it. The results collected so far are always returned; the
+        health attribute summarizes the failures of the run.
+        :param List[str] inputs: The inputs.
+        :param bool batched: Whether each container takes chunks of inputs instead of single inputs.
+            Chunks are run by the worker, or with a single exec of docker_runner_batch.py if workers are disabled.
+        :param int | None chunk_size: A fixed chunk size; if None, the chunk size adapts to the measured time per
+            input (see AdaptiveChunkSize).
+        :return Dict[str, OracleResult]: The oracle result of every input.
+        """
         outputs = {}
-        outputs_lock = threading.Lock()
-        self._exception_event = threading.Event()
+        self.health = PoolHealth()
         input_queue = queue.Queue()
+        retry_queue = queue.Queue()
         for input_str in inputs:
-            input_queue.put(input_str)
-
-        def process_input(container):
-            while not input_queue.empty() and not self._exception_event.is_set():
-                try:
-                    input_str = input_queue.get_nowait()
-                except queue.Empty:
+            input_queue.put((input_str, 0))
+
+        # Guards outputs, the number of queued or in-flight inputs and the number of active containers;
+        # signalled whenever an input is resolved or re-queued, so idle containers wait for retries
+        # instead of stopping early
+        pending = len(inputs)
+        active = len(self.container)
+        condition = threading.Condition()
+
+        def resolve(results: List[Tuple[str, OracleResult]]):
+            # A list rather than a dict, so duplicate inputs are counted once per queued item
+            nonlocal pending
+            with condition:
+                outputs.update(results)
+                pending -= len(results)
+                condition.notify_all()
+
+        def next_chunk(size: int) -> List:
+            with condition:
+                while pending > 0:
+                    # Retried inputs run alone, so a single input that breaks containers
+                    # cannot use up the retries of the inputs it was shipped with
+                    try:
+                        return [retry_queue.get_nowait()]
+                    except queue.Empty:
+                        pass
+                    chunk = []
+                    while len(chunk) < size:
+                        try:
+                            chunk.append(input_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    if chunk:
+                        return chunk
+                    if active <= 1:
+                        # No other container is left to re-queue inputs
+                        break
+                    # Inputs are still in flight in other containers and may be re-queued
+                    condition.wait()
+                return []
+
+        def process_inputs(container):
+            nonlocal active
+            try:
+                run_container(container)
+            finally:
+                with condition:
+                    active -= 1
+                    condition.notify_all()
+
+        def run_container(container):
+            chunking = (
+                AdaptiveChunkSize() if batched and chunk_size is None else None
+            )
+            size = chunking.size if chunking else (chunk_size if batched else 1)
+            replacements = 0
+            while True:
+                chunk = next_chunk(size)
+                if not chunk:
                     break
+                chunk_inputs = [input_str for input_str, _ in chunk]
+
                 try:
-                    output = self._run_input_in_container(container, input_str)
-                    oracle_result = self._parse_output_to_oracle_result(output)
-                    with outputs_lock:
-                        outputs[input_str] = oracle_result
-                    input_queue.task_done()
+                    start = time.perf_counter()
+                    if batched:
+                        chunk_outputs = self._run_batch_in_container(
+                            container, chunk_inputs
+                        )
+                    else:
+                        chunk_outputs = [
+                            self._run_input_in_container(container, chunk_inputs[0])
+                        ]
+                    elapsed = time.perf_counter() - start
+                except ContainerWorkerTimeout as e:
+                    logger.error(
+                        f"Worker in container {container.name} timed out and is restarted: {e}"
+                    )
+                    # The worker was killed and starts again on the next chunk; a hanging input is not retried,
+                    # as it would hang again
+                    answered = len(e.results)
+                    hung = chunk_inputs[answered]
+                    self.health.record_worker_restart([hung])
+                    with condition:
+                        for item in chunk[answered + 1:]:
+                            input_queue.put(item)
+                        condition.notify_all()
+                    resolve(
+                        [
+                            (input_str, self._parse_output_to_oracle_result(output))
+                            for input_str, output in zip(chunk_inputs, e.results)
+                        ]
+                        + [(hung, OracleResult.UNDEFINED)]
+                    )
+                    continue
                 except Exception as e:
                     logger.error(
                         f"Exception occurred while processing input in container {container.name}: {e}"
                     )
-                    self._exception_event.set()
-                    input_queue.task_done()
-                    break
+                    # Re-queue the in-flight inputs, unless they failed too often
+                    retried = [
+                        (input_str, attempts + 1)
+                        for input_str, attempts in chunk
+                        if attempts < self.max_retries
+                    ]
+                    exhausted = [
+                        input_str
+                        for input_str, attempts in chunk
+                        if attempts >= self.max_retries
+                    ]
+                    self.health.record_failure(
+                        [input_str for input_str, _ in retried], exhausted
+                    )
+                    with condition:
+                        for item in retried:
+                            retry_queue.put(item)
+                        condition.notify_all()
+                    resolve([(input_str, OracleResult.UNDEFINED) for input_str in exhausted])
+
+                    if isinstance(e, ContainerWorkerError) and self._is_running(container):
+                        # Only the worker died; it starts again on the next chunk
+                        continue
+
+                    replacement = None
+                    if replacements < self.max_replacements:
+                        replacements += 1
+                        try:
+                            replacement = self._replace_container(container)
+                        except Exception as replacement_error:
+                            logger.error(
+                                f"Could not replace container {container.name}: {replacement_error}"
+                            )
+                    self.health.record_replacement(container, replacement)
+                    if replacement is None:
+                        break
+                    container = replacement
+                    continue
+
+                resolve(
+                    [
+                        (input_str, self._parse_output_to_oracle_result(output))
+                        for input_str, output in zip(chunk_inputs, chunk_outputs)
+                    ]
+                )
+                if chunking:
+                    size = chunking.update(len(chunk), elapsed)
 
         with concurrent.futures.ThreadPoolExecutor(
-            max_workers=len(self.container)
+            max_workers=max(1, len(self.container))
         ) as executor:
             futures = [
-                executor.submit(process_input, container)
-                for container in self.container
+                executor.submit(process_inputs, container)
+                for container in list(self.container)
             ]
-            # Wait for all tasks to be done
-            input_queue.join()
-
-        if self._exception_event.is_set():
-            self.cleanup()
-            raise RuntimeError(
-                "An error occurred during input processing. See logs for details."
-            )
+            # Wait for all containers to be done
+            concurrent.futures.wait(futures)
+        for future in futures:
+            # Re-raises exceptions of the threads, e.g., from the bookkeeping
+            future.result()
+
+        # Inputs left over when all containers were lost
+        unprocessed = []
+        for remaining_queue in (retry_queue, input_queue):
+            while True:
+                try:
+                    input_str, _ = remaining_queue.get_nowait()
+                except queue.Empty:
+                    break
+                unprocessed.append(input_str)
+                outputs[input_str] = OracleResult.UNDEFINED
+        if unprocessed:
+            self.health.record_undefined(unprocessed)
 
+        if not self.health.is_healthy():
+            logger.warning("Container pool health: %s", self.health.summary())
         return outputs
 
+    def get_async_oracle(self) -> AsyncOracleType:
+        """
+        Returns an async oracle that runs each input in the next free container.
+        The blocking Docker calls are awaited in worker threads, so up to one input per container is in flight.
+        """
+        # asyncio queues are bound to the event loop they are used in
+        free_containers_per_loop: Dict[asyncio.AbstractEventLoop, asyncio.Queue] = (
+            weakref.WeakKeyDictionary()
+        )
+
+        async def async_oracle(inp):
+            loop = asyncio.get_running_loop()
+            if loop not in free_containers_per_loop:
+                free_containers_per_loop[loop] = asyncio.Queue()
+                for container in self.container:
+                    free_containers_per_loop[loop].put_nowait(container)
+            free_containers = free_containers_per_loop[loop]
+
+            container = await free_containers.get()
+            try:
+                output = await asyncio.to_thread(
+                    self._run_input_in_container, container, str(inp)
+                )
+            except Exception as e:
+                return OracleResult.UNDEFINED, e
+            finally:
+                free_containers.put_nowait(container)
+            return self._parse_output_to_oracle_result(output), None
+
+        return async_oracle
+
     def _parse_output_to_oracle_result(self, output_str: str) -> OracleResult:
         output_str = output_str.strip()
         try:
@@ -252,15 +909,21 @@ class DockerManager:
             oracle_result = OracleResult.UNDEFINED
         return oracle_result
 
-    def _create_subject_dockerfile(self, file_location: str):
-        dockerfile = f"""FROM {BASE_IMAGE_TAG}
+    def _get_python_dockerfile(self, base_image_tag: str) -> str:
+        return f"""FROM {base_image_tag}
 
 # Install python using pyenv
 RUN bash -c "source ~/.bashrc && pyenv install {self.project.python_version}"
+"""
+
+    def _get_subject_dockerfile(self, python_image_tag: str) -> str:
+        return f"""FROM {python_image_tag}
 
 COPY ./docker_setup.py /app
 COPY ./docker_runner.py /app
 COPY ./docker_runner_inputs.py /app
+COPY ./docker_worker.py /app
+COPY ./docker_runner_batch.py /app
 
 RUN bash -c "python3 docker_setup.py {self.project.project_name} {self.project.bug_id}"
 
@@ -270,6 +933,9 @@ WORKDIR /app
 # Set the command to keep the container running
 CMD ["tail", "-f", "/dev/null"]
 """
+
+    @staticmethod
+    def _write_dockerfile(dockerfile: str, file_location: str):
         try:
             with open(file_location, "w") as file:
                 file.write(dockerfile)
@@ -0,0 +1,245 @@
+import itertools
+import json
+import logging
+import select
+import socket
+from typing import Optional, Dict, Any, List
+
+import docker
+from docker.models.containers import Container
+from docker.utils.socket import next_frame_header, read_exactly, STDOUT, STDERR
+
+logger = logging.getLogger(__name__)
+
+WORKER_COMMAND = ["python3", "docker_worker.py"]
+# The maximum number of requests sent to a worker before reading its responses
+PIPELINE_DEPTH = 64
+# Seconds the client waits beyond the request timeout, so the worker can report the timeout itself
+TIMEOUT_GRACE = 5.0
+
+
+class ContainerWorkerError(Exception):
+    """
+    Raised if the worker in a container cannot be started, dies, or breaks the protocol.
+    """
+
+    pass
+
+
+class ContainerWorkerTimeout(ContainerWorkerError):
+    """
+    Raised if the worker does not answer within the request timeout plus TIMEOUT_GRACE.
+    The worker answers in order, so results holds the answers to the inputs before the one that hangs.
+    """
+
+    def __init__(self, message: str, results: Optional[List[str]] = None):
+        super().__init__(message)
+        self.results = results or []
+
+
+class ContainerWorker:
+    """
+    A long-lived worker process inside a container that loads the benchmark program once and
+    answers newline-delimited JSON requests (see resources/docker_worker.py).
+
+    The worker is started with exec_create/exec_start and talks over the attached socket. Without a TTY, Docker
+    multiplexes stdout and stderr over this socket in frames with an 8-byte header (stream type and payload size),
+    which are demultiplexed here. A worker must only be used by one thread at a time.
+
+    With a request timeout, the worker aborts inputs running longer and reports them as UNDEFINED. If it does not
+    answer within TIMEOUT_GRACE seconds after that, e.g., because it hangs in native code, its process is killed
+    and a ContainerWorkerTimeout is raised. The container itself is not affected.
+    """
+
+    def __init__(
+        self,
+        client: docker.DockerClient,
+        container: Container,
+        request_timeout: Optional[float] = None,
+    ):
+        """
+        :param docker.DockerClient client: The Docker client.
+        :param Container container: The running container to start the worker in.
+        :param Optional[float] request_timeout: Seconds an input may run in the worker; runs forever if None.
+        """
+        self.client = client
+        self.container = container
+        self.request_timeout = request_timeout
+        self._socket = None
+        self._buffer = b""
+        self._next_id = 0
+        self._pid: Optional[int] = None
+
+    def start(self):
+        """
+        Starts the worker and waits until it has loaded the benchmark program.
+        """
+        command = list(WORKER_COMMAND)
+        if self.request_timeout is not None:
+            command.append(str(self.request_timeout))
+        exec_id = self.client.api.exec_create(
+            self.container.id,
+            command,
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            tty=False,
+            workdir="/app",
+        )
+        self._socket = self.client.api.exec_start(exec_id, socket=True)
+        self._raw_socket().settimeout(self._response_timeout())
+
+        message = self._receive()
+        if not message.get("ready"):
+            raise ContainerWorkerError(
+                f"Unexpected greeting from worker in {self.container.name}: {message}"
+            )
+        self._pid = message.get("pid")
+        logger.info("Worker in container %s is ready.", self.container.name)
+
+    def _response_timeout(self) -> Optional[float]:
+        if self.request_timeout is None:
+            return None
+        return self.request_timeout + TIMEOUT_GRACE
+
+    def _raw_socket(self) -> socket.socket:
+        # exec_start returns a SocketIO wrapper on Unix sockets
+        return getattr(self._socket, "_sock", self._socket)
+
+    @property
+    def is_running(self) -> bool:
+        return self._socket is not None
+
+    def _send(self, message: Dict[str, Any]):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        try:
+            self._raw_socket().sendall(data)
+        except OSError as e:
+            raise ContainerWorkerError(
+                f"Cannot send to worker in {self.container.name}: {e}"
+            ) from e
+
+    def _read_stdout(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Reads frames until a stdout frame arrives; stderr frames are logged.
+        Raises a ContainerWorkerError if no frame arrives within the timeout.
+        """
+        while True:
+            # Docker's frame reader polls without a timeout, so the socket timeout alone does not bound the wait
+            if timeout is not None:
+                readable, _, _ = select.select([self._raw_socket()], [], [], timeout)
+                if not readable:
+                    raise ContainerWorkerTimeout(
+                        f"Worker in {self.container.name} did not answer within {timeout} seconds."
+                    )
+            try:
+                stream, size = next_frame_header(self._socket)
+                if stream == -1:
+                    raise ContainerWorkerError(
+                        f"Worker in {self.container.name} closed the connection."
+                    )
+                payload = read_exactly(self._socket, size) if size else b""
+            except (OSError, socket.timeout) as e:
+                raise ContainerWorkerError(
+                    f"Cannot read from worker in {self.container.name}: {e}"
+                ) from e
+
+            if stream == STDOUT:
+                return payload
+            if stream == STDERR and payload.strip():
+                logger.debug(
+                    "Worker in %s: %s",
+                    self.container.name,
+                    payload.decode("utf-8", errors="replace").rstrip(),
+                )
+
+    def _receive(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        while b"\n" not in self._buffer:
+            self._buffer += self._read_stdout(timeout)
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ContainerWorkerError(
+                f"Invalid response from worker in {self.container.name}: {line!r}"
+            ) from e
+
+    def _receive_result(self, results: Dict[int, str]):
+        # Loading the program before the greeting is not bounded, only the responses are
+        response = self._receive(self._response_timeout())
+        if response.get("exception"):
+            logger.debug("Input %s raised %s", response.get("id"), response["exception"])
+        results[response["id"]] = response["result"]
+
+    def run(self, input_str: str) -> str:
+        """
+        Runs a single input in the worker.
+        :param str input_str: The input.
+        :return str: The oracle result reported by the worker, e.g., "FAILING".
+        """
+        return self.run_many([input_str])[0]
+
+    def run_many(self, inputs: List[str]) -> List[str]:
+        """
+        Sends up to PIPELINE_DEPTH requests ahead of the responses, so the requests are pipelined.
+        :param List[str] inputs: The inputs.
+        :return List[str]: The oracle results reported by the worker, in the order of the inputs.
+        """
+        try:
+            if not self.is_running:
+                self.start()
+
+            ids = []
+            results = {}
+            for input_str in inputs:
+                # Bound the requests in flight, so neither side blocks on a full socket buffer
+                if len(ids) - len(results) >= PIPELINE_DEPTH:
+                    self._receive_result(results)
+                self._send({"id": self._next_id, "input": input_str})
+                ids.append(self._next_id)
+                self._next_id += 1
+
+            while len(results) < len(ids):
+                self._receive_result(results)
+            return [results[i] for i in ids]
+        except ContainerWorkerTimeout as e:
+            e.results = [
+                results[i] for i in itertools.takewhile(lambda i: i in results, ids)
+            ]
+            self.kill()
+            raise
+        except ContainerWorkerError:
+            # The protocol state is lost; the next call starts a fresh worker
+            self.kill()
+            raise
+
+    def kill(self):
+        """
+        Kills the worker process inside the container, so a hung worker does not keep running, and closes the socket.
+        """
+        pid, self._pid = self._pid, None
+        if pid is not None:
+            try:
+                self.container.exec_run(
+                    ["python3", "-c", f"import os, signal; os.kill({pid}, signal.SIGKILL)"]
+                )
+            except Exception as e:
+                logger.warning(
+                    "Could not kill worker %s in %s: %s", pid, self.container.name, e
+                )
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker by closing its stdin.
+        """
+        if self._socket is None:
+            return
+        try:
+            self._raw_socket().close()
+        except OSError:
+            pass
+        finally:
+            self._socket = None
+            self._pid = None
+            self._buffer = b""
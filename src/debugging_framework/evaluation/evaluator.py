@@ -56,7 +56,7 @@ class Evaluation:
         """
         initializes an empty results dataframe
 
-                                        Result
+                                        Result              Telemetry
         Run | Approach | Subject ID
          1      Fuzzer      1           UnexpectedResult
                             2           UnexpecredResult
@@ -100,6 +100,9 @@ class Evaluation:
                 df_results.at[
                     (i, self.tool.name, str(subject)), ("Result")
                 ] = report.to_dict()
+                df_results.at[
+                    (i, self.tool.name, str(subject)), ("Telemetry")
+                ] = report.telemetry.summary()
 
         if self.out_file:
             VLOGGER.info(f"Saving results to {self.out_file}")
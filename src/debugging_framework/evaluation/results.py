@@ -22,18 +22,18 @@ def initialize_dataframe(
     """
     initializes empty DataFrame
 
-                                            Result
+                                            Result              Telemetry
         Run | Approach | Subject ID
-         1      Fuzzer      1           UnexpectedResult
-                            2           UnexpecredResult
+         1      Fuzzer      1           UnexpectedResult    {"p50": ..., "throughput": ...}
+                            2           UnexpecredResult    {"p50": ..., "throughput": ...}
         
-         2      Fuzzer      1           TimeoutResult
-                            2           UnexpectedResult
+         2      Fuzzer      1           TimeoutResult       {"p50": ..., "throughput": ...}
+                            2           UnexpectedResult    {"p50": ..., "throughput": ...}
     """
 
     subject_ids = subject_names
     #columns = pd.MultiIndex.from_tuples(subject_names, names=["Subject", "ID"])
-    columns = pd.Index(["Result"], dtype = "str")
+    columns = pd.Index(["Result", "Telemetry"], dtype = "str")
     index = pd.MultiIndex.from_product(
         [range(1, number_of_runs + 1), tool_names, subject_ids], names=["Run", "Approach", "Subject ID"]
     )
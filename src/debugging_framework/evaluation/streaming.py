@@ -0,0 +1,131 @@
+from typing import Callable, Iterator, Iterable, Optional, Set, Any
+import threading
+import queue
+
+_END_OF_STREAM = object()
+
+
+class InputStream:
+    """
+    Streams generated inputs from a producer thread to a consumer through a bounded queue.
+    The producer calls the generator max_generated_inputs times and forwards every input it has not seen before,
+    so deduplication happens on the fly and at most max_queue_size inputs wait for execution at any time.
+    Generation overlaps with execution whenever the consumer releases the GIL (e.g., oracles running in
+    fork server workers, subprocesses or containers).
+
+    If keep_inputs is False, only the hashes of the inputs are kept for deduplication, which keeps the memory
+    for very large budgets low; generated_inputs then stays empty.
+
+    Instead of a generator function, an iterable of inputs can be streamed, e.g., a fuzzer's fuzz_many;
+    the producer then forwards its unique inputs until it ends or max_generated_inputs were drawn from it. The
+    evaluation tools stream iterables that skip duplicates, so max_generated_inputs counts unique inputs there.
+    An iterable that skips duplicates itself can look them up with is_duplicate instead of keeping its own record.
+    """
+
+    def __init__(
+        self,
+        generate: Optional[Callable[[], str]],
+        max_generated_inputs: int,
+        max_queue_size: int = 1024,
+        keep_inputs: bool = True,
+        inputs: Optional[Iterable[str]] = None,
+    ):
+        """
+        :param Callable[[], str] generate: Generates a single input, e.g., a fuzzer's fuzz method.
+        :param int max_generated_inputs: The number of calls to generate, including duplicates, or the number of
+            inputs drawn from the iterable.
+        :param int max_queue_size: The maximum number of inputs waiting in the queue.
+        :param bool keep_inputs: Whether the unique inputs are kept in generated_inputs.
+        :param Iterable[str] inputs: The inputs to stream instead of calling generate.
+        """
+        assert (generate is None) != (inputs is None), "Either generate or inputs"
+        self.generate = generate
+        self.inputs = inputs
+        self.max_generated_inputs = max_generated_inputs
+        self.keep_inputs = keep_inputs
+        self.generated_inputs: Set[str] = set()
+
+        self._seen: Set[Any] = set()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._producer = threading.Thread(target=self._produce, daemon=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _put(self, item: Any) -> bool:
+        """
+        Puts an item into the queue unless the stream is closed in the meantime.
+        :return bool: False if the stream was closed.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _key(self, inp: str) -> Any:
+        return inp if self.keep_inputs else hash(inp)
+
+    def is_duplicate(self, inp: str) -> bool:
+        """
+        :param str inp: The input.
+        :return bool: True if the input was streamed before.
+        """
+        return self._key(inp) in self._seen
+
+    def _draw(self) -> Iterator[str]:
+        if self.inputs is None:
+            for _ in range(self.max_generated_inputs):
+                yield self.generate()
+        else:
+            for _, inp in zip(range(self.max_generated_inputs), self.inputs):
+                yield inp
+
+    def _produce(self):
+        try:
+            for inp in self._draw():
+                if self._stop_event.is_set():
+                    return
+                key = self._key(inp)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                if self.keep_inputs:
+                    self.generated_inputs.add(inp)
+                if not self._put(inp):
+                    return
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._put(_END_OF_STREAM)
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._producer.is_alive() and self._producer.ident is None:
+            self._producer.start()
+
+        while True:
+            item = self._queue.get()
+            if item is _END_OF_STREAM:
+                break
+            yield item
+
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        """
+        Stops the producer, e.g., if the consumer stopped early.
+        """
+        self._stop_event.set()
+        if self._producer.ident is not None:
+            self._producer.join()
+
+    def __len__(self):
+        return len(self._seen)
@@ -1,15 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Callable, List
+from typing import Callable, List, Optional, Iterable
+import logging
 
 from isla.fuzzer import GrammarFuzzer as ISLaGrammarFuzzer
-from isla.parser import EarleyParser
 
 from debugging_framework.types import Grammar
 from debugging_framework.fuzzingbook.probalistic_fuzzer import ProbabilisticGrammarFuzzer
 from debugging_framework.fuzzingbook.probalistic_grammar_miner import ProbabilisticGrammarMiner
-from debugging_framework.fuzzingbook.fuzzer import GrammarFuzzer
-from debugging_framework.execution.execution_handler import SingleExecutionHandler
+from debugging_framework.fuzzingbook.fuzzer import GrammarFuzzer, draw_unique
+from debugging_framework.execution.execution_handler import (
+    SingleExecutionHandler,
+    ParallelExecutionHandler,
+)
 from debugging_framework.execution.report import MultipleFailureReport, Report
+from debugging_framework.execution.stopping_policy import StoppingPolicy
+from debugging_framework.evaluation.streaming import InputStream
+from debugging_framework.input.parsing import get_parser
+
+logger = logging.getLogger(__name__)
 
 
 class Tool(ABC):
@@ -30,6 +38,16 @@ class Tool(ABC):
 
 
 class GrammarBasedEvaluationTool(Tool, ABC):
+    """
+    Fuzzes inputs from a grammar and labels them while they are generated: the fuzzer runs in a producer thread
+    and streams unique inputs through a bounded queue to the execution handler (see InputStream).
+
+    For every tool, max_generated_inputs is the number of unique inputs labelled. The fuzzer skips inputs the
+    stream has already seen (see draw_unique), draws at most ten times as many inputs, and stops early once the
+    reachable language is exhausted; `exhausted` tells whether this happened. Passing a seed makes the generated
+    inputs reproducible.
+    """
+
     def __init__(
         self,
         grammar,
@@ -37,63 +55,113 @@ class GrammarBasedEvaluationTool(Tool, ABC):
         initial_inputs,
         max_non_terminals: int = 5,
         max_generated_inputs: int = 10000,
+        max_workers: int = 1,
+        stopping_policy: Optional[StoppingPolicy] = None,
+        max_queue_size: int = 1024,
+        keep_generated_inputs: bool = True,
+        seed: Optional[int] = None,
         **kwargs,
     ):
         super().__init__(grammar, oracle, initial_inputs)
+        if stopping_policy is not None and max_workers > 1:
+            # The stopping policy is checked after every input, so it only applies to the serial handler.
+            raise ValueError(
+                "A stopping policy requires max_workers=1; "
+                "the parallel execution handler labels inputs ahead of the policy."
+            )
         self.report = MultipleFailureReport(name=type(self).__name__)
-        self.execution_handler = SingleExecutionHandler(self.oracle)
+        self.execution_handler = (
+            ParallelExecutionHandler(self.oracle, max_workers=max_workers)
+            if max_workers > 1
+            else SingleExecutionHandler(self.oracle, stopping_policy=stopping_policy)
+        )
 
         self.max_non_terminals = max_non_terminals
         self.max_generated_inputs = max_generated_inputs
+        self.max_queue_size = max_queue_size
+        self.keep_generated_inputs = keep_generated_inputs
+        self.seed = seed
+        self.exhausted = False
 
+    @abstractmethod
+    def create_fuzzer(self):
+        """
+        Creates the fuzzer whose fuzz() method generates the inputs.
+        """
+        raise NotImplementedError
 
-class GrammarBasedEvaluationFuzzer(GrammarBasedEvaluationTool):
-    name = "GrammarBasedFuzzer"
+    def generate_inputs(
+        self, fuzzer, is_duplicate: Callable[[str], bool]
+    ) -> Iterable[str]:
+        """
+        Generates up to max_generated_inputs unique inputs with the fuzzer.
+        :param fuzzer: The fuzzer.
+        :param Callable[[str], bool] is_duplicate: Tells whether an input was streamed before.
+        """
+        return fuzzer.fuzz_many(
+            self.max_generated_inputs,
+            seed=self.seed,
+            is_duplicate=is_duplicate,
+        )
 
     def run(self) -> Report:
-        fuzzer = GrammarFuzzer(self.grammar, max_nonterminals=self.max_non_terminals)
+        fuzzer = self.create_fuzzer()
+        # The stream deduplicates, so the fuzzer looks duplicates up in the stream instead of keeping a second record
+        test_inputs = InputStream(
+            None,
+            self.max_generated_inputs,
+            max_queue_size=self.max_queue_size,
+            keep_inputs=self.keep_generated_inputs,
+            inputs=self.generate_inputs(
+                fuzzer, lambda inp: test_inputs.is_duplicate(inp)
+            ),
+        )
+        with test_inputs:
+            self.execution_handler.label_strings(test_inputs, self.report)
+        self.generated_inputs = test_inputs.generated_inputs
+
+        self.exhausted = getattr(fuzzer, "exhausted", False)
+        if self.exhausted:
+            logger.info(
+                f"{self.name}: language exhausted after {len(test_inputs)} unique inputs"
+            )
+        return self.report
 
-        test_inputs = set()
-        for _ in range(self.max_generated_inputs):
-            test_inputs.add(fuzzer.fuzz())
 
-        self.execution_handler.label_strings(test_inputs, self.report)
-        self.generated_inputs = test_inputs
-        return self.report
+class GrammarBasedEvaluationFuzzer(GrammarBasedEvaluationTool):
+    name = "GrammarBasedFuzzer"
+
+    def create_fuzzer(self) -> GrammarFuzzer:
+        return GrammarFuzzer(self.grammar, max_nonterminals=self.max_non_terminals)
 
 
 class InputsFromHellEvaluationFuzzer(GrammarBasedEvaluationTool):
     name = "InputsFromHellFuzzer"
 
-    def run(self) -> Report:
+    def create_fuzzer(self) -> ProbabilisticGrammarFuzzer:
         prob_grammar = ProbabilisticGrammarMiner(
-            EarleyParser(self.grammar)
+            get_parser(self.grammar)
         ).mine_probabilistic_grammar(inputs=self.initial_inputs)
-        fuzzer = ProbabilisticGrammarFuzzer(
+        return ProbabilisticGrammarFuzzer(
             prob_grammar, max_nonterminals=self.max_non_terminals
         )
 
-        test_inputs = set()
-        for _ in range(self.max_generated_inputs):
-            test_inputs.add(fuzzer.fuzz())
-
-        self.execution_handler.label_strings(test_inputs, self.report)
-        self.generated_inputs = test_inputs
-        return self.report
-
 
 class ISLaGrammarEvaluationFuzzer(GrammarBasedEvaluationTool):
     name = "ISLaGrammarBasedFuzzer"
 
-    def run(self) -> Report:
-        fuzzer = ISLaGrammarFuzzer(
+    def create_fuzzer(self) -> ISLaGrammarFuzzer:
+        return ISLaGrammarFuzzer(
             self.grammar, max_nonterminals=self.max_non_terminals
         )
 
-        test_inputs = set()
-        for _ in range(self.max_generated_inputs):
-            test_inputs.add(fuzzer.fuzz())
-
-        self.execution_handler.label_strings(test_inputs, self.report)
-        self.generated_inputs = test_inputs
-        return self.report
+    def generate_inputs(
+        self, fuzzer: ISLaGrammarFuzzer, is_duplicate: Callable[[str], bool]
+    ) -> Iterable[str]:
+        # ISLa's fuzzer has no fuzz_many; its inputs are drawn with the same budget of unique inputs
+        return draw_unique(
+            fuzzer.fuzz,
+            self.max_generated_inputs,
+            is_duplicate,
+            on_exhausted=lambda _: setattr(fuzzer, "exhausted", True),
+        )
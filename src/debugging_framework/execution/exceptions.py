@@ -4,3 +4,17 @@ class UnexpectedResultError(Exception):
 
 class Tests4PySubjectException(Exception):
     pass
+
+
+class WorkerDiedError(ChildProcessError):
+    """
+    Raised when a fork server worker dies while processing a request.
+    The exit code is negative if the worker was killed by a signal.
+    """
+
+    def __init__(self, exitcode):
+        super().__init__(f"Worker process died with exit code {exitcode}")
+        self.exitcode = exitcode
+
+    def __reduce__(self):
+        return WorkerDiedError, (self.exitcode,)
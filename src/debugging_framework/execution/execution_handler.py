@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Union, Optional, Set, List, Tuple
+from typing import Union, Optional, Set, List, Tuple, Sequence, Iterable, Iterator
+from collections import deque
+from collections.abc import Collection
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import itertools
+import time
+import os
+
+import dill
 
 from debugging_framework.input.input import Input
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.execution.report import TResultMonad, Report
-from debugging_framework.types import OracleType, BatchOracleType
+from debugging_framework.execution.stopping_policy import StoppingPolicy
+from debugging_framework.types import OracleType, BatchOracleType, AsyncOracleType
 
 
 class ExecutionHandler(ABC):
@@ -14,7 +24,7 @@ class ExecutionHandler(ABC):
     using a specified oracle that determines the result of each test input.
     """
 
-    def __init__(self, oracle: OracleType | BatchOracleType):
+    def __init__(self, oracle: OracleType | BatchOracleType | AsyncOracleType):
         """
         Initializes the ExecutionHandler with a specific oracle.
         :param OracleType oracle: The oracle used to evaluate test inputs.
@@ -60,9 +70,30 @@ class ExecutionHandler(ABC):
 class SingleExecutionHandler(ExecutionHandler):
     """
     Handles the execution of individual test inputs serially, applying an oracle to each input and updating the report.
+    An optional stopping policy ends a labelling session early; the remaining inputs are not executed.
     Inherits from ExecutionHandler.
     """
 
+    def __init__(
+        self, oracle: OracleType, stopping_policy: Optional[StoppingPolicy] = None
+    ):
+        """
+        Initializes the SingleExecutionHandler.
+        :param OracleType oracle: The oracle used to evaluate test inputs.
+        :param Optional[StoppingPolicy] stopping_policy: Decides when to stop executing further inputs.
+        """
+        super().__init__(oracle)
+        self.stopping_policy = stopping_policy
+
+    def _should_stop(self, report: Report) -> bool:
+        return self.stopping_policy is not None and self.stopping_policy.should_stop(
+            report
+        )
+
+    def _start_session(self):
+        if self.stopping_policy is not None:
+            self.stopping_policy.start()
+
     def _get_label(self, test_input: Union[Input, str]) -> TResultMonad:
         """
         Applies the oracle to a single test input and returns the result wrapped in a TResultMonad.
@@ -71,17 +102,40 @@ class SingleExecutionHandler(ExecutionHandler):
         """
         return TResultMonad(self.oracle(test_input))
 
+    def _get_measured_label(
+        self, test_input: Union[Input, str], report: Report
+    ) -> Tuple[OracleResult, Optional[Exception]]:
+        """
+        Applies the oracle to a single test input and records its telemetry in the report.
+        :param Union[Input, str] test_input: The test input to be evaluated.
+        :param Report report: The report holding the telemetry.
+        :return Tuple[OracleResult, Optional[Exception]]: The oracle result and the exception, if any.
+        """
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        label, exception = self._get_label(test_input).value()
+        report.telemetry.record(
+            time.perf_counter() - start_wall,
+            time.process_time() - start_cpu,
+            label,
+            exception,
+        )
+        return label, exception
+
     def label(self, test_inputs: Set[Input], report: Report):
         """
         Labels each input in a set individually, updates the input's oracle attribute, and reports failures if any.
         :param Set[Input] test_inputs: The set of inputs to be processed.
         :param Report report: The report where results will be recorded.
         """
-        for inp in test_inputs:
-            label, exception = self._get_label(inp).value()
-            inp.oracle = label
-            if self.map_result(label):
-                self.add_to_report(report, inp, exception)
+        self._start_session()
+        with report.telemetry.session():
+            for inp in test_inputs:
+                label, exception = self._get_measured_label(inp, report)
+                inp.oracle = label
+                if self.map_result(label):
+                    self.add_to_report(report, inp, exception)
+                if self._should_stop(report):
+                    break
 
     def label_strings(self, test_inputs: Set[str], report: Report):
         """
@@ -89,10 +143,14 @@ class SingleExecutionHandler(ExecutionHandler):
         :param Set[str] test_inputs: The set of string inputs to be processed.
         :param Report report: The report where results will be recorded.
         """
-        for inp in test_inputs:
-            label, exception = self._get_label(inp).value()
-            if self.map_result(label):
-                self.add_to_report(report, inp, exception)
+        self._start_session()
+        with report.telemetry.session():
+            for inp in test_inputs:
+                label, exception = self._get_measured_label(inp, report)
+                if self.map_result(label):
+                    self.add_to_report(report, inp, exception)
+                if self._should_stop(report):
+                    break
 
 
 class BatchExecutionHandler(ExecutionHandler):
@@ -121,9 +179,301 @@ class BatchExecutionHandler(ExecutionHandler):
         :param Set[Input] test_inputs: The set of inputs to be processed.
         :param Report report: The report where results will be recorded.
         """
-        test_results = self._get_label(test_inputs)
-        for inp, test_result in test_results:
-            label, exception = test_result.value()
+        with report.telemetry.session():
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            test_results = self._get_label(test_inputs)
+            # The batch oracle is measured as a whole; its cost is spread evenly over the inputs.
+            number_of_inputs = max(1, len(test_results))
+            wall_time = (time.perf_counter() - start_wall) / number_of_inputs
+            cpu_time = (time.process_time() - start_cpu) / number_of_inputs
+            for inp, test_result in test_results:
+                label, exception = test_result.value()
+                report.telemetry.record(wall_time, cpu_time, label, exception)
+                inp.oracle = label
+                if self.map_result(label):
+                    self.add_to_report(report, inp, exception)
+
+
+_WORKER_ORACLE: Optional[OracleType] = None
+# Chunk size for inputs of unknown number, e.g., an InputStream
+STREAM_CHUNK_SIZE = 8
+# Chunks submitted per worker ahead of the results, bounding the inputs held in memory
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def _initialize_worker(serialized_oracle: bytes):
+    """
+    Deserializes the oracle once per worker process, so it does not need to be shipped with every chunk.
+    :param bytes serialized_oracle: The dill-serialized oracle.
+    """
+    global _WORKER_ORACLE
+    _WORKER_ORACLE = dill.loads(serialized_oracle)
+
+
+def _label_in_worker(
+    test_input: Union[Input, str]
+) -> Tuple[OracleResult, Optional[Exception], float, float]:
+    """
+    Applies the worker's oracle to a single test input and measures the execution.
+    :param Union[Input, str] test_input: The test input to be evaluated.
+    :return Tuple[OracleResult, Optional[Exception], float, float]: The oracle result, the exception, if any,
+    the wall time and the CPU time.
+    """
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    label, exception = TResultMonad(_WORKER_ORACLE(test_input)).value()
+    return (
+        label,
+        exception,
+        time.perf_counter() - start_wall,
+        time.process_time() - start_cpu,
+    )
+
+
+def _label_chunk_in_worker(
+    test_inputs: List[Union[Input, str]]
+) -> List[Tuple[OracleResult, Optional[Exception], float, float]]:
+    """
+    Applies the worker's oracle to a chunk of test inputs (see _label_in_worker).
+    """
+    return [_label_in_worker(test_input) for test_input in test_inputs]
+
+
+class ParallelExecutionHandler(ExecutionHandler):
+    """
+    Handles the execution of test inputs by distributing them over a pool of worker processes.
+    Inputs are read and submitted in chunks as they arrive, with a bounded number of chunks in flight, so a stream
+    of inputs is labelled while it is still generated. The results are merged back into the report in the order
+    of the inputs, so the report does not depend on the order in which the workers finish.
+    Inherits from ExecutionHandler.
+    """
+
+    def __init__(
+        self,
+        oracle: OracleType,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        """
+        Initializes the ParallelExecutionHandler.
+        :param OracleType oracle: The oracle used to evaluate test inputs. It is serialized with dill,
+        so closures (e.g., oracles built by an OracleConstructor) are supported.
+        :param Optional[int] max_workers: The number of worker processes. Defaults to the number of CPUs.
+        :param Optional[int] chunk_size: The number of inputs sent to a worker at once.
+        Defaults to an even split of the inputs into four chunks per worker, or to STREAM_CHUNK_SIZE for streams.
+        """
+        super().__init__(oracle)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def _get_chunk_size(self, test_inputs: Iterable[Union[Input, str]]) -> int:
+        """
+        Determines the number of inputs per chunk.
+        :param Iterable[Union[Input, str]] test_inputs: The inputs to be processed.
+        :return int: The chunk size.
+        """
+        if self.chunk_size:
+            return self.chunk_size
+        if not isinstance(test_inputs, Collection):
+            return STREAM_CHUNK_SIZE
+        return max(1, len(test_inputs) // (self.max_workers * 4))
+
+    def _get_labels(
+        self, test_inputs: Iterable[Union[Input, str]], report: Report
+    ) -> Iterator[Tuple[Union[Input, str], OracleResult, Optional[Exception]]]:
+        """
+        Applies the oracle to the test inputs in parallel and records the telemetry reported by the workers.
+        :param Iterable[Union[Input, str]] test_inputs: The inputs to be evaluated; read lazily in chunks.
+        :param Report report: The report holding the telemetry.
+        :return Iterator: Every input with its oracle result and exception, in the order of the inputs.
+        """
+        chunk_size = self._get_chunk_size(test_inputs)
+        max_in_flight = self.max_workers * CHUNKS_IN_FLIGHT_PER_WORKER
+        inputs = iter(test_inputs)
+        in_flight = deque()
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialize_worker,
+            initargs=(dill.dumps(self.oracle, recurse=True),),
+        ) as executor:
+            while True:
+                chunk = list(itertools.islice(inputs, chunk_size))
+                if chunk:
+                    in_flight.append(
+                        (chunk, executor.submit(_label_chunk_in_worker, chunk))
+                    )
+                if not in_flight:
+                    break
+                if chunk and len(in_flight) < max_in_flight:
+                    continue
+
+                chunk, future = in_flight.popleft()
+                for inp, (label, exception, wall_time, cpu_time) in zip(
+                    chunk, future.result()
+                ):
+                    report.telemetry.record(wall_time, cpu_time, label, exception)
+                    yield inp, label, exception
+
+    def label(self, test_inputs: Set[Input], report: Report):
+        """
+        Labels all inputs in parallel, updates each input's oracle attribute, and reports failures if any.
+        :param Set[Input] test_inputs: The set of inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        # The session ends after the workers have terminated, so their peak RSS is included in its sample
+        with report.telemetry.session():
+            for inp, label, exception in self._get_labels(test_inputs, report):
+                inp.oracle = label
+                if self.map_result(label):
+                    self.add_to_report(report, inp, exception)
+
+    def label_strings(self, test_inputs: Set[str], report: Report):
+        """
+        Labels all string inputs in parallel and updates the report accordingly.
+        :param Set[str] test_inputs: The set of string inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        with report.telemetry.session():
+            for inp, label, exception in self._get_labels(test_inputs, report):
+                if self.map_result(label):
+                    self.add_to_report(report, inp, exception)
+
+
+def to_async_oracle(oracle: OracleType, max_concurrency: int = 8) -> AsyncOracleType:
+    """
+    Turns a blocking oracle into an async oracle that waits for the result in a worker thread.
+    Useful for oracles that block on subprocesses or containers. Oracles relying on SIGALRM-based timeouts
+    cannot run in threads; build them with use_fork_server=True instead.
+    The oracle runs in a dedicated pool of max_concurrency threads: a thread cannot be cancelled, so a call that
+    timed out in the AsyncExecutionHandler keeps its thread until it returns, and further calls wait for a free one.
+    Pass the max_concurrency of the handler, so it bounds the executions that actually run.
+    Call close() on the returned oracle once it is no longer used, so the pool releases its threads.
+    :param OracleType oracle: The blocking oracle.
+    :param int max_concurrency: The maximum number of oracle calls running at the same time.
+    :return AsyncOracleType: The async oracle, with a close(wait=True) method that shuts down its pool.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="async-oracle"
+    )
+
+    async def async_oracle(inp: Union[Input, str]):
+        return await asyncio.get_running_loop().run_in_executor(executor, oracle, inp)
+
+    def close(wait: bool = True):
+        # Pending calls are cancelled; with wait=False, calls still running keep their threads until they return
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+    async_oracle.close = close
+    return async_oracle
+
+
+class AsyncExecutionHandler(ExecutionHandler):
+    """
+    Handles the execution of test inputs with an async oracle, keeping up to max_concurrency inputs in flight
+    at the same time, so oracles waiting on subprocesses or containers can overlap their waits.
+    An oracle that raises an exception labels only its own input, as UNDEFINED with the exception.
+    Inherits from ExecutionHandler.
+    """
+
+    def __init__(
+        self,
+        oracle: AsyncOracleType,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+        timeout_result: OracleResult = OracleResult.UNDEFINED,
+    ):
+        """
+        Initializes the AsyncExecutionHandler.
+        :param AsyncOracleType oracle: The coroutine function used to evaluate test inputs.
+        :param int max_concurrency: The maximum number of inputs evaluated at the same time.
+        :param Optional[float] timeout: Maximum time in seconds for a single input, or None for no limit.
+        :param OracleResult timeout_result: The result assigned to inputs that exceed the timeout.
+        """
+        super().__init__(oracle)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.timeout_result = timeout_result
+
+    async def _get_label(
+        self,
+        test_input: Union[Input, str],
+        semaphore: asyncio.Semaphore,
+        report: Report,
+    ) -> Tuple[OracleResult, Optional[Exception]]:
+        """
+        Applies the oracle to a single test input once a slot is free and records its telemetry.
+        The CPU time of concurrent inputs cannot be told apart and is recorded as NaN.
+        :param Union[Input, str] test_input: The test input to be evaluated.
+        :param asyncio.Semaphore semaphore: Limits the number of inputs in flight.
+        :param Report report: The report holding the telemetry.
+        :return Tuple[OracleResult, Optional[Exception]]: The oracle result and the exception, if any.
+        """
+        async with semaphore:
+            start_wall = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self.oracle(test_input), self.timeout)
+                label, exception = TResultMonad(result).value()
+            except asyncio.TimeoutError:
+                label, exception = self.timeout_result, TimeoutError(
+                    "Function call timed out"
+                )
+            except Exception as e:
+                label, exception = OracleResult.UNDEFINED, e
+            report.telemetry.record(
+                time.perf_counter() - start_wall, float("nan"), label, exception
+            )
+        return label, exception
+
+    async def _get_labels(
+        self, test_inputs: Sequence[Union[Input, str]], report: Report
+    ) -> List[Tuple[OracleResult, Optional[Exception]]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with report.telemetry.session():
+            return await asyncio.gather(
+                *(self._get_label(inp, semaphore, report) for inp in test_inputs)
+            )
+
+    async def alabel(self, test_inputs: Set[Input], report: Report):
+        """
+        Labels all inputs concurrently, updates each input's oracle attribute, and reports failures if any.
+        Use this coroutine instead of label() if an event loop is already running.
+        :param Set[Input] test_inputs: The set of inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        ordered_inputs = list(test_inputs)
+        for inp, (label, exception) in zip(
+            ordered_inputs, await self._get_labels(ordered_inputs, report)
+        ):
             inp.oracle = label
             if self.map_result(label):
                 self.add_to_report(report, inp, exception)
+
+    async def alabel_strings(self, test_inputs: Set[str], report: Report):
+        """
+        Labels all string inputs concurrently and updates the report accordingly.
+        Use this coroutine instead of label_strings() if an event loop is already running.
+        :param Set[str] test_inputs: The set of string inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        ordered_inputs = list(test_inputs)
+        for inp, (label, exception) in zip(
+            ordered_inputs, await self._get_labels(ordered_inputs, report)
+        ):
+            if self.map_result(label):
+                self.add_to_report(report, inp, exception)
+
+    def label(self, test_inputs: Set[Input], report: Report):
+        """
+        Labels all inputs concurrently in a new event loop.
+        :param Set[Input] test_inputs: The set of inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        asyncio.run(self.alabel(test_inputs, report))
+
+    def label_strings(self, test_inputs: Set[str], report: Report):
+        """
+        Labels all string inputs concurrently in a new event loop.
+        :param Set[str] test_inputs: The set of string inputs to be processed.
+        :param Report report: The report where results will be recorded.
+        """
+        asyncio.run(self.alabel_strings(test_inputs, report))
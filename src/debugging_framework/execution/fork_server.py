@@ -0,0 +1,260 @@
+from typing import Callable, Optional, Any, List
+from multiprocessing.connection import Connection
+import multiprocessing
+import threading
+import queue
+import pickle
+import weakref
+
+from debugging_framework.execution.exceptions import WorkerDiedError
+
+
+class ForkServerWorker:
+    """
+    A single pre-forked worker process together with the parent's end of its pipe.
+    """
+
+    def __init__(self, process: multiprocessing.Process, connection: Connection):
+        self.process = process
+        self.connection = connection
+
+    def kill(self):
+        """
+        Kills the worker process and closes the pipe.
+        """
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def _make_picklable(value: Any) -> Any:
+    """
+    Replaces exceptions that cannot be sent over a pipe with a picklable exception of the same type if possible.
+    :param Any value: The value to be sent.
+    :return Any: A picklable version of the value.
+    """
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        pass
+
+    if isinstance(value, tuple):
+        return tuple(_make_picklable(v) for v in value)
+    if isinstance(value, BaseException):
+        try:
+            substitute = type(value)(str(value))
+            pickle.dumps(substitute)
+            return substitute
+        except Exception:
+            return Exception(f"{type(value).__name__}: {value}")
+    return repr(value)
+
+
+def _kill_workers(workers: List[ForkServerWorker]):
+    """
+    Kills the workers and empties the list. Also called by the finalizer of a ForkServer, so it must not
+    reference the server itself.
+    """
+    for worker in workers:
+        worker.kill()
+    workers.clear()
+
+
+def _serve(
+    connection: Connection,
+    target: Callable[[Any], Any],
+    initializer: Optional[Callable[[], None]],
+):
+    """
+    Main loop of a worker process. Receives requests over the pipe, applies the target and sends back
+    a tuple (success, value) until the parent closes its end of the pipe.
+    """
+    if initializer:
+        initializer()
+
+    while True:
+        try:
+            request = connection.recv()
+        except (EOFError, OSError):
+            break
+
+        try:
+            response = (True, target(request))
+        except BaseException as e:
+            response = (False, e)
+
+        try:
+            connection.send(response)
+        except Exception:
+            # Pickling failed before anything was written to the pipe
+            connection.send(_make_picklable(response))
+
+
+class ForkServer:
+    """
+    Keeps a pool of warm, pre-forked worker processes that apply a target function to their requests.
+    Timeouts are enforced by killing the worker, which also interrupts hangs in C code, and a fresh worker
+    is forked in its place. Calls are thread-safe: every call checks out its own worker.
+    Only available on platforms that support the 'fork' start method.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        timeout: float,
+        number_of_workers: int = 1,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initializes the ForkServer. Workers are forked lazily on the first call.
+        :param Callable target: The function executed by the workers.
+        :param float timeout: Maximum allowed time for a single call in seconds.
+        :param int number_of_workers: The number of worker processes kept warm.
+        :param Optional[Callable] initializer: Called once in every worker after forking.
+        """
+        self.target = target
+        self.timeout = timeout
+        self.number_of_workers = number_of_workers
+        self.initializer = initializer
+
+        self._context = multiprocessing.get_context("fork")
+        # Idle workers; None marks a slot whose worker still has to be forked. The queue always holds a token for
+        # every slot not checked out by a call, so the number of slots stays number_of_workers.
+        self._idle_workers: queue.Queue = queue.Queue()
+        for _ in range(number_of_workers):
+            self._idle_workers.put(None)
+        self._workers: List[ForkServerWorker] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._finalizer = weakref.finalize(self, _kill_workers, self._workers)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _fork_worker(self) -> ForkServerWorker:
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_serve,
+            args=(child_connection, self.target, self.initializer),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        return ForkServerWorker(process, parent_connection)
+
+    def _take_idle(self) -> List[Optional[ForkServerWorker]]:
+        """
+        Takes all idle workers and free slots from the queue without blocking.
+        """
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle_workers.get_nowait())
+            except queue.Empty:
+                return idle
+
+    def start(self):
+        """
+        Forks the workers of all free slots of the pool. Slots whose worker cannot be forked are left free and
+        forked by the call checking them out.
+        """
+        with self._lock:
+            if self._started:
+                return
+            for worker in self._take_idle():
+                if worker is None:
+                    try:
+                        worker = self._fork_worker()
+                    except OSError:
+                        self._idle_workers.put(None)
+                        continue
+                    self._workers.append(worker)
+                self._idle_workers.put(worker)
+            self._started = True
+
+    def close(self):
+        """
+        Kills all workers of the pool. The slots are kept: calls waiting for a worker fork a new one, and calls
+        running in a killed worker free their slot when they fail.
+        """
+        with self._lock:
+            _kill_workers(self._workers)
+            for _ in self._take_idle():
+                self._idle_workers.put(None)
+            self._started = False
+
+    def _replace(self, worker: ForkServerWorker):
+        """
+        Kills a worker. Its replacement is forked by the next call that checks out the free slot.
+        """
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        self._idle_workers.put(None)
+
+    def _checkout(self) -> ForkServerWorker:
+        """
+        Takes an idle worker from the pool, forking a replacement for a killed worker if needed.
+        :raises ChildProcessError: If the replacement cannot be forked; the slot is kept for the next call.
+        """
+        worker = self._idle_workers.get()
+        if worker is not None:
+            return worker
+
+        try:
+            replacement = self._fork_worker()
+        except OSError as e:
+            self._idle_workers.put(None)
+            raise ChildProcessError(f"Cannot fork a worker process: {e}") from e
+        with self._lock:
+            self._workers.append(replacement)
+        return replacement
+
+    def __call__(self, request: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Applies the target to the request in one of the workers.
+        :param Any request: The argument passed to the target.
+        :param Optional[float] timeout: Overrides the timeout of the server for this call.
+        :return Any: The value returned by the target.
+        :raises TimeoutError: If the worker does not answer within the timeout.
+        :raises WorkerDiedError: If the worker died while processing the request.
+        :raises ChildProcessError: If the worker cannot be forked.
+        Exceptions raised by the target are re-raised in the calling process.
+        """
+        if not self._started:
+            self.start()
+
+        worker = self._checkout()
+        # The slot always goes back to the pool: with the worker after a complete exchange, otherwise freed.
+        # A request that cannot be pickled also frees it, as the state of the pipe is unknown.
+        completed = False
+        try:
+            worker.connection.send(request)
+            if not worker.connection.poll(timeout if timeout is not None else self.timeout):
+                raise TimeoutError("Function call timed out")
+            success, value = worker.connection.recv()
+            completed = True
+        except TimeoutError:  # A subclass of OSError
+            raise
+        except (EOFError, OSError):
+            # Let the dying worker exit on its own, so its exit code is not replaced by the SIGKILL of _replace
+            worker.process.join(timeout=1)
+            raise WorkerDiedError(worker.process.exitcode)
+        finally:
+            if completed:
+                self._idle_workers.put(worker)
+            else:
+                self._replace(worker)
+
+        if success:
+            return value
+        if isinstance(value, Exception):
+            raise value
+        raise ChildProcessError(f"Worker raised {type(value).__name__}: {value}")
@@ -4,8 +4,43 @@ import threading
 import signal
 import time
 
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None
+
+
+def limit_memory(max_memory: float):
+    """
+    Limits the memory the current process may allocate on top of its current footprint by setting
+    RLIMIT_AS and RLIMIT_DATA. Allocations beyond the limit raise a MemoryError in the process itself,
+    so this is meant to be called in an isolated worker process (e.g., a fork server worker).
+    The limit is relative, as the inherited address space of a forked interpreter is already large.
+    :param float max_memory: The additional memory in MB the process may allocate.
+    """
+    if resource is None:
+        raise NotImplementedError("Memory limits require the resource module")
+
+    memory_info = psutil.Process(os.getpid()).memory_info()
+    additional_bytes = int(max_memory * 1024 * 1024)
+    for limit, used in (
+        (resource.RLIMIT_AS, memory_info.vms),
+        (resource.RLIMIT_DATA, getattr(memory_info, "data", memory_info.vms)),
+    ):
+        _, hard = resource.getrlimit(limit)
+        soft = used + additional_bytes
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(limit, (soft, hard))
+
 
 class ManageMemory:
+    """
+    Polls the RSS of the current process and raises a MemoryError via SIGTERM once it exceeds max_memory.
+    Superseded by the max_memory option of the OracleConstructor, which puts an rlimit on an isolated worker
+    (see limit_memory) instead of polling and signalling the calling process.
+    """
+
     def __init__(self, max_memory: float):
         self.max_memory = max_memory
         self.memory_check_thread = threading.Thread(target=self.check_memory_usage)
@@ -0,0 +1,221 @@
+from typing import Union, Optional, Tuple, Dict
+from pathlib import Path
+import builtins
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+
+from debugging_framework.input.input import Input
+from debugging_framework.input.oracle import OracleResult
+from debugging_framework.execution.report import TResultMonad
+from debugging_framework.types import OracleType, OracleResultType
+
+DEFAULT_CACHE_FILE = "oracle_cache.db"
+ACCESS_FLUSH_INTERVAL = 1000
+
+
+def get_cache_key(subject_id: str, input_str: str) -> str:
+    """
+    Computes the content address of an oracle result.
+    :param str subject_id: The identity of the subject under test.
+    :param str input_str: The input string.
+    :return str: The hex digest identifying the pair.
+    """
+    return hashlib.sha256(f"{subject_id}\0{input_str}".encode("utf-8")).hexdigest()
+
+
+def encode_exception(exception: Optional[Exception]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Encodes an exception as its fully qualified type name and its message.
+    """
+    if exception is None:
+        return None, None
+    exception_type = type(exception)
+    return f"{exception_type.__module__}:{exception_type.__qualname__}", str(exception)
+
+
+def decode_exception(
+    exception_type: Optional[str], message: Optional[str]
+) -> Optional[Exception]:
+    """
+    Reconstructs an exception from its fully qualified type name and its message.
+    The type is only resolved among the builtins and the modules that are already imported, so the database
+    cannot trigger imports. Falls back to a plain Exception if the type is unknown or cannot be instantiated.
+    """
+    if exception_type is None:
+        return None
+    module_name, _, qualname = exception_type.partition(":")
+    try:
+        cls = builtins if module_name == "builtins" else sys.modules[module_name]
+        for attribute in qualname.split("."):
+            cls = getattr(cls, attribute)
+        if not (isinstance(cls, type) and issubclass(cls, Exception)):
+            return Exception(message)
+        return cls(message) if message else cls()
+    except Exception:
+        return Exception(message)
+
+
+class CachedOracle:
+    """
+    Wraps an oracle with a persistent, content-addressed result cache.
+    Results are keyed by the subject identity and the hash of the input string and stored in an SQLite database
+    together with the exception type and message. The least recently used entries are evicted once the cache
+    exceeds max_entries. The access times of cache hits are buffered and written together with the next insert,
+    every ACCESS_FLUSH_INTERVAL hits or on close(), so lookups do not open write transactions. Results caused by a
+    TimeoutError are not cached, as they depend on the machine's load.
+    """
+
+    def __init__(
+        self,
+        oracle: OracleType,
+        subject_id: str,
+        cache_file: Union[str, Path] = DEFAULT_CACHE_FILE,
+        max_entries: int = 1_000_000,
+    ):
+        """
+        Initializes the CachedOracle.
+        :param OracleType oracle: The oracle whose results are cached.
+        :param str subject_id: Identifies the subject; oracles of different subjects must use different ids.
+        :param Union[str, Path] cache_file: The SQLite database holding the cache. Can be shared by several oracles.
+        :param int max_entries: The maximum number of entries kept in the database.
+        """
+        self.oracle = oracle
+        self.subject_id = subject_id
+        self.cache_file = str(cache_file)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._number_of_entries: Optional[int] = None
+        self._pending_accesses: Dict[str, int] = {}
+
+    def __getstate__(self):
+        # The connection cannot be shared with other processes; it is reopened lazily.
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_lock"] = None
+        state["_pending_accesses"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.cache_file, timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """ CREATE TABLE IF NOT EXISTS oracle_results (
+                        key text PRIMARY KEY,
+                        result text,
+                        exception_type text,
+                        message text,
+                        last_access integer
+                    ); """
+            )
+            self._conn.execute(
+                """ CREATE INDEX IF NOT EXISTS oracle_results_last_access
+                        ON oracle_results (last_access); """
+            )
+            self._conn.commit()
+            self._number_of_entries = self._conn.execute(
+                "SELECT COUNT(*) FROM oracle_results"
+            ).fetchone()[0]
+        return self._conn
+
+    def _lookup(self, key: str) -> Optional[OracleResultType]:
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT result, exception_type, message FROM oracle_results WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        self._pending_accesses[key] = time.time_ns()
+        if len(self._pending_accesses) >= ACCESS_FLUSH_INTERVAL:
+            self._flush_accesses()
+            conn.commit()
+        result, exception_type, message = row
+        return OracleResult(result), decode_exception(exception_type, message)
+
+    def _flush_accesses(self):
+        """
+        Writes the buffered access times of cache hits; the caller commits.
+        """
+        if self._pending_accesses:
+            self._get_conn().executemany(
+                "UPDATE oracle_results SET last_access = ? WHERE key = ?",
+                [(t, key) for key, t in self._pending_accesses.items()],
+            )
+            self._pending_accesses.clear()
+
+    def _store(self, key: str, result: OracleResult, exception: Optional[Exception]):
+        conn = self._get_conn()
+        self._flush_accesses()
+        exception_type, message = encode_exception(exception)
+        cursor = conn.execute(
+            """ INSERT OR IGNORE INTO oracle_results
+                    (key, result, exception_type, message, last_access)
+                    VALUES (?, ?, ?, ?, ?); """,
+            (key, result.value, exception_type, message, time.time_ns()),
+        )
+        self._number_of_entries += cursor.rowcount
+        if self._number_of_entries > self.max_entries:
+            self._evict()
+        conn.commit()
+
+    def _evict(self):
+        """
+        Removes the least recently used tenth of the entries, so eviction is amortized over many inserts.
+        """
+        conn = self._get_conn()
+        number_to_evict = self._number_of_entries - int(self.max_entries * 0.9)
+        conn.execute(
+            """ DELETE FROM oracle_results WHERE key IN (
+                    SELECT key FROM oracle_results ORDER BY last_access ASC LIMIT ?
+                ); """,
+            (number_to_evict,),
+        )
+        self._number_of_entries = conn.execute(
+            "SELECT COUNT(*) FROM oracle_results"
+        ).fetchone()[0]
+
+    def __call__(self, inp: Union[Input, str]) -> OracleResultType:
+        """
+        Returns the cached result for the input or evaluates the wrapped oracle and caches its result.
+        :param Union[Input, str] inp: The input to be evaluated.
+        :return OracleResultType: The oracle result and the exception, if any.
+        """
+        key = get_cache_key(self.subject_id, str(inp))
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result, exception = TResultMonad(self.oracle(inp)).value()
+        if not isinstance(exception, TimeoutError):
+            with self._lock:
+                self._store(key, result, exception)
+        return result, exception
+
+    def close(self):
+        """
+        Closes the connection to the cache database.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._flush_accesses()
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
@@ -3,6 +3,7 @@ from typing import Dict, Set, Union, List
 from collections import defaultdict
 
 from debugging_framework.input.input import Input
+from debugging_framework.execution.telemetry import ExecutionTelemetry
 
 
 class TResultMonad:
@@ -46,6 +47,7 @@ class Report(ABC):
     def __init__(self, name: str = "EvoGFuzz"):
         self.failures: Dict[Failure, Set[Input]] = defaultdict(set)
         self.name = name
+        self.telemetry = ExecutionTelemetry()
 
     def __repr__(self):
         report = f"Report for {self.name}\n"
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+import time
+
+from debugging_framework.execution.report import Report
+
+
+class StoppingPolicy(ABC):
+    """
+    Decides when an execution handler may stop labelling further inputs, because the report already
+    answers the questions asked of the run. Policies can be combined with `|`: the combination stops
+    as soon as any of its policies stops.
+    """
+
+    def start(self):
+        """
+        Called by the execution handler before the first input of a labelling session is executed.
+        """
+        pass
+
+    @abstractmethod
+    def should_stop(self, report: Report) -> bool:
+        """
+        Called after every executed input.
+        :param Report report: The report holding the results so far.
+        :return bool: True if no further inputs need to be executed.
+        """
+        raise NotImplementedError
+
+    def __or__(self, other: "StoppingPolicy") -> "StoppingPolicy":
+        return AnyStoppingPolicy(self, other)
+
+
+class AnyStoppingPolicy(StoppingPolicy):
+    """
+    Stops as soon as any of its policies stops.
+    """
+
+    def __init__(self, *policies: StoppingPolicy):
+        self.policies = policies
+
+    def start(self):
+        for policy in self.policies:
+            policy.start()
+
+    def should_stop(self, report: Report) -> bool:
+        return any(policy.should_stop(report) for policy in self.policies)
+
+
+class FailureQuotaStoppingPolicy(StoppingPolicy):
+    """
+    Stops once number_of_failures distinct failures (Failure signatures) have been found with at least
+    inputs_per_failure failure-inducing inputs each.
+    """
+
+    def __init__(self, inputs_per_failure: int, number_of_failures: int = 1):
+        self.inputs_per_failure = inputs_per_failure
+        self.number_of_failures = number_of_failures
+
+    def should_stop(self, report: Report) -> bool:
+        saturated_failures = sum(
+            1
+            for failing_inputs in report.get_failures().values()
+            if len(failing_inputs) >= self.inputs_per_failure
+        )
+        return saturated_failures >= self.number_of_failures
+
+
+class TotalFailuresStoppingPolicy(StoppingPolicy):
+    """
+    Stops once the report holds max_failures failure-inducing inputs, regardless of their Failure.
+    """
+
+    def __init__(self, max_failures: int):
+        self.max_failures = max_failures
+
+    def should_stop(self, report: Report) -> bool:
+        return (
+            sum(len(failing_inputs) for failing_inputs in report.get_failures().values())
+            >= self.max_failures
+        )
+
+
+class TimeBudgetStoppingPolicy(StoppingPolicy):
+    """
+    Stops once the wall-clock budget of a labelling session is used up.
+    """
+
+    def __init__(self, budget: float):
+        """
+        :param float budget: The budget in seconds.
+        """
+        self.budget = budget
+        self._start: Optional[float] = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def should_stop(self, report: Report) -> bool:
+        if self._start is None:
+            self.start()
+        return time.perf_counter() - self._start >= self.budget
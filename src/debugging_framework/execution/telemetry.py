@@ -0,0 +1,130 @@
+from typing import List, Dict, Any, Optional
+from collections import Counter
+import contextlib
+import math
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None
+import psutil
+
+from debugging_framework.input.oracle import OracleResult
+
+TIMEOUT = "TIMEOUT"
+MEMORY = "MEMORY"
+CRASH = "CRASH"
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the high-water mark of the resident set size in KiB of this process and its terminated children
+    (e.g., fork server workers). Falls back to the current RSS where getrusage is not available.
+    This is a process-wide value, not the memory used by a single input.
+    """
+    if resource is None:
+        return psutil.Process().memory_info().rss // 1024
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+def classify_outcome(result: OracleResult, exception: Optional[Exception]) -> str:
+    """
+    Classifies the outcome of a single execution. Timeouts and memory limit breaches are split from the plain oracle
+    results, as are crashes: exceptions the oracle could not label (UNDEFINED). Exceptions labelled FAILING are the
+    expected bug triggers of the subject and stay FAILING.
+    :return str: TIMEOUT, MEMORY, CRASH, or the value of the OracleResult.
+    """
+    if isinstance(exception, TimeoutError):
+        return TIMEOUT
+    if isinstance(exception, MemoryError):
+        return MEMORY
+    if exception is not None and result == OracleResult.UNDEFINED:
+        return CRASH
+    return result.value if isinstance(result, OracleResult) else str(result)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ExecutionTelemetry:
+    """
+    Collects per-input execution telemetry in columns: wall time and CPU time in seconds, and the outcome.
+    The execution handlers record one row per input. The peak RSS in KiB of the process and its terminated
+    children is sampled once at the end of every session, as it is a process-wide high-water mark.
+    """
+
+    def __init__(self):
+        self.wall_times: List[float] = []
+        self.cpu_times: List[float] = []
+        self.outcomes: List[str] = []
+        self.elapsed: float = 0.0
+        self.process_peak_rss: int = 0
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def record(
+        self,
+        wall_time: float,
+        cpu_time: float,
+        result: OracleResult,
+        exception: Optional[Exception],
+    ):
+        """
+        Records the telemetry of a single input.
+        """
+        self.wall_times.append(wall_time)
+        self.cpu_times.append(cpu_time)
+        self.outcomes.append(classify_outcome(result, exception))
+
+    @contextlib.contextmanager
+    def session(self):
+        """
+        Measures the wall time of a labelling session, used to compute the throughput, and samples the peak RSS
+        of the process at its end.
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.elapsed += time.perf_counter() - start
+            self.process_peak_rss = max(self.process_peak_rss, get_peak_rss())
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """
+        Returns the raw per-input telemetry as columns.
+        """
+        return {
+            "wall_time": self.wall_times,
+            "cpu_time": self.cpu_times,
+            "outcome": self.outcomes,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarizes the telemetry: latency percentiles in seconds, throughput in inputs per second,
+        total CPU time, peak RSS of the process in KiB, and a histogram of the outcomes.
+        """
+        wall_times = sorted(self.wall_times)
+        cpu_times = [cpu_time for cpu_time in self.cpu_times if not math.isnan(cpu_time)]
+        return {
+            "inputs": len(self),
+            "throughput": len(self) / self.elapsed if self.elapsed > 0 else math.nan,
+            "p50": percentile(wall_times, 50),
+            "p95": percentile(wall_times, 95),
+            "p99": percentile(wall_times, 99),
+            "cpu_time": sum(cpu_times),
+            "process_peak_rss": self.process_peak_rss,
+            "outcomes": dict(Counter(self.outcomes)),
+        }
@@ -0,0 +1,137 @@
+from typing import Callable, List, Optional, Iterable
+import contextlib
+import logging
+import time
+
+from debugging_framework.types import Grammar
+from debugging_framework.fuzzingbook.fuzzer import GrammarFuzzer
+from debugging_framework.execution.timeout_manager import ManageTimeout
+from debugging_framework.execution.telemetry import percentile
+
+LOGGER = logging.getLogger("timeout_calibration")
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_MULTIPLIER = 10.0
+# Absolute floor of calibrated timeouts: below it, scheduler jitter on a loaded machine causes spurious timeouts
+MIN_TIMEOUT = 0.01
+MAX_TIMEOUT = 1.0
+OVERHEAD_REPETITIONS = 50
+
+
+def get_calibration_inputs(
+    grammar: Grammar,
+    initial_inputs: Iterable[str],
+    number_of_samples: int = 50,
+    max_nonterminals: int = 5,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Returns the initial inputs of a subject together with a sample of fuzzed inputs.
+    The sample is drawn with a fixed seed, so the calibration is reproducible across runs.
+    Fuzzed inputs are unique; fewer than number_of_samples are added if the grammar has fewer inputs.
+    :param Grammar grammar: The grammar of the subject.
+    :param Iterable[str] initial_inputs: The initial inputs of the subject.
+    :param int number_of_samples: The number of fuzzed inputs added to the initial inputs.
+    :param int max_nonterminals: Limits the size of the fuzzed inputs.
+    :param int seed: The seed of the sample.
+    :return List[str]: The inputs used for the calibration.
+    """
+    inputs = list(dict.fromkeys(initial_inputs))
+    fuzzer = GrammarFuzzer(grammar, max_nonterminals=max_nonterminals)
+    inputs.extend(fuzzer.fuzz_many(number_of_samples, seed=seed))
+    return inputs
+
+
+def measure_execution_times(
+    program: Callable,
+    inp: str,
+    harness_function: Optional[Callable] = None,
+    max_timeout: float = MAX_TIMEOUT,
+    repetitions: int = 3,
+) -> Optional[List[float]]:
+    """
+    Measures the wall time of several executions of a program on an input, including the cost of arming the
+    timeout and redirecting stdout, as the oracles do. All repetitions are kept: the slow ones show how much the
+    execution time varies under load. Executions are cut off after max_timeout seconds.
+    Exceptions raised by the program are ignored, only the time it took to raise them counts.
+    :return Optional[List[float]]: The execution times in seconds, or None if the harness rejects the input.
+    """
+    execution_times = []
+    for _ in range(repetitions):
+        try:
+            param = harness_function(inp) if harness_function else (inp,)
+        except Exception:
+            return None
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(None):
+                with ManageTimeout(max_timeout):
+                    program(*param)
+        except TimeoutError:
+            execution_times.append(max_timeout)
+            break
+        except Exception:
+            pass
+        execution_times.append(time.perf_counter() - start)
+    return execution_times
+
+
+def measure_overhead(
+    p: float = DEFAULT_PERCENTILE, repetitions: int = OVERHEAD_REPETITIONS
+) -> float:
+    """
+    Measures the cost of an execution that does nothing: arming the timeout, redirecting stdout and the call.
+    :return float: The p-th percentile of the overhead in seconds.
+    """
+    overheads = measure_execution_times(
+        lambda: None, "", lambda _: (), repetitions=repetitions
+    )
+    return percentile(sorted(overheads), p)
+
+
+def calibrate_timeout(
+    program: Callable,
+    inputs: Iterable[str],
+    harness_function: Optional[Callable] = None,
+    p: float = DEFAULT_PERCENTILE,
+    multiplier: float = DEFAULT_MULTIPLIER,
+    min_timeout: Optional[float] = None,
+    max_timeout: float = MAX_TIMEOUT,
+    repetitions: int = 3,
+) -> float:
+    """
+    Derives a timeout from the execution times of a (reference) program: a high percentile of the
+    execution times of all repetitions scaled by a safety multiplier, clamped to [min_timeout, max_timeout].
+    The multiplier leaves head room for machines loaded with many workers. The percentile keeps single huge
+    fuzzed inputs from inflating the timeout, which would hide buggy variants that are orders of magnitude slower.
+    :param Callable program: The program to be timed, usually the reference implementation.
+    :param Iterable[str] inputs: The inputs the program is timed on.
+    :param Optional[Callable] harness_function: Turns an input string into the program's arguments.
+    :param float p: The percentile of the execution times the timeout is derived from.
+    :param float multiplier: Scales the percentile of the execution times.
+    :param Optional[float] min_timeout: The lower bound of the timeout in seconds. Defaults to the measured
+        overhead of an execution scaled by the multiplier. Timeouts are never below MIN_TIMEOUT.
+    :param float max_timeout: The upper bound of the timeout in seconds; also cuts off hanging executions.
+    :param int repetitions: The number of executions per input.
+    :return float: The calibrated timeout in seconds.
+    """
+    if min_timeout is None:
+        min_timeout = measure_overhead(p) * multiplier
+    min_timeout = max(min_timeout, MIN_TIMEOUT)
+
+    execution_times = []
+    for inp in inputs:
+        measurements = measure_execution_times(
+            program, inp, harness_function, max_timeout, repetitions
+        )
+        if measurements is not None:
+            execution_times.extend(measurements)
+    if not execution_times:
+        return max_timeout
+
+    execution_times.sort()
+    timeout = min(max(percentile(execution_times, p) * multiplier, min_timeout), max_timeout)
+    LOGGER.debug(
+        f"Calibrated timeout of {timeout:.4f}s from {len(execution_times)} executions"
+    )
+    return timeout
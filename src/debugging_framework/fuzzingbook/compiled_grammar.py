@@ -0,0 +1,131 @@
+from typing import Dict, List, Tuple, Set, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+from debugging_framework.types import Grammar, START_SYMBOL
+from debugging_framework.fuzzingbook.grammar import (
+    exp_string,
+    split_expansion,
+    Token,
+)
+
+
+def grammar_fingerprint(grammar: Grammar) -> str:
+    """Return a content hash of `grammar`, including the options of its expansions.
+    Equal grammars have equal fingerprints, regardless of their identity."""
+    canonical = json.dumps(grammar, sort_keys=True, default=repr)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompiledGrammar:
+    """A grammar analysed once for the hot loops of miners and feature extraction.
+
+    Every symbol gets an integer id. For every expansion, the tokens
+    (pre-split into terminals and nonterminals) are stored, and the reachability
+    between symbols is kept as one bitset per symbol id.
+    A compiled grammar reflects the grammar at compile time; compile again after changing it.
+    """
+
+    def __init__(self, grammar: Grammar, fingerprint: Optional[str] = None):
+        self.fingerprint = fingerprint or grammar_fingerprint(grammar)
+
+        # Symbol ids; nonterminals that are used but not defined get ids, too
+        self.symbols: List[str] = list(grammar)
+        self.symbol_ids: Dict[str, int] = {
+            symbol: i for (i, symbol) in enumerate(self.symbols)
+        }
+
+        self.expansion_tokens: List[List[Tuple[Token, ...]]] = []
+        expansion_nonterminals: List[List[Tuple[str, ...]]] = []
+        for symbol in grammar:
+            tokens = [
+                split_expansion(exp_string(expansion)) for expansion in grammar[symbol]
+            ]
+            self.expansion_tokens.append(tokens)
+            expansion_nonterminals.append(
+                [
+                    tuple(token for (token, nonterminal) in expansion if nonterminal)
+                    for expansion in tokens
+                ]
+            )
+            for expansion in expansion_nonterminals[-1]:
+                for nonterminal in expansion:
+                    self._get_or_add_symbol(nonterminal)
+
+        self.expansion_nonterminal_ids: List[List[Tuple[int, ...]]] = [
+            [
+                tuple(self.symbol_ids[nonterminal] for nonterminal in expansion)
+                for expansion in expansions
+            ]
+            for expansions in expansion_nonterminals
+        ]
+        self.reachable: List[int] = self._compute_reachability()
+
+    def _get_or_add_symbol(self, symbol: str) -> int:
+        if symbol not in self.symbol_ids:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self.symbol_ids[symbol]
+
+    def _compute_reachability(self) -> List[int]:
+        """Compute the transitive closure of the "directly uses" relation as bitsets.
+        Every symbol reaches itself."""
+        reachable = [1 << i for i in range(len(self.symbols))]
+        for i, expansions in enumerate(self.expansion_nonterminal_ids):
+            for expansion in expansions:
+                for j in expansion:
+                    reachable[i] |= 1 << j
+
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(reachable)):
+                closure = reachable[i]
+                bits = closure & ~(1 << i)
+                while bits:
+                    lowest = bits & -bits
+                    closure |= reachable[lowest.bit_length() - 1]
+                    bits ^= lowest
+                if closure != reachable[i]:
+                    reachable[i] = closure
+                    changed = True
+        return reachable
+
+    def is_nonterminal(self, symbol: str) -> bool:
+        """Return whether `symbol` is a nonterminal of the grammar."""
+        return symbol in self.symbol_ids
+
+    def tokens(self, symbol: str, index: int) -> Tuple[Token, ...]:
+        """Return the tokens of the `index`-th expansion of `symbol`."""
+        return self.expansion_tokens[self.symbol_ids[symbol]][index]
+
+    def reachable_nonterminals(self, symbol: str = START_SYMBOL) -> Set[str]:
+        """Return all nonterminals that can be derived from `symbol`, including itself."""
+        bits = self.reachable[self.symbol_ids[symbol]]
+        return {s for (i, s) in enumerate(self.symbols) if bits >> i & 1}
+
+
+_COMPILED_GRAMMARS: "OrderedDict[str, CompiledGrammar]" = OrderedDict()
+_COMPILED_GRAMMARS_LOCK = threading.Lock()
+MAX_COMPILED_GRAMMARS = 64
+
+
+def compile_grammar(grammar: Grammar) -> CompiledGrammar:
+    """Return the compiled form of `grammar`.
+    Compiled grammars are shared through a small LRU cache keyed by the grammar fingerprint,
+    so equal grammars are only analysed once per process."""
+    fingerprint = grammar_fingerprint(grammar)
+    with _COMPILED_GRAMMARS_LOCK:
+        compiled = _COMPILED_GRAMMARS.get(fingerprint)
+        if compiled is not None:
+            _COMPILED_GRAMMARS.move_to_end(fingerprint)
+            return compiled
+
+    compiled = CompiledGrammar(grammar, fingerprint)
+    with _COMPILED_GRAMMARS_LOCK:
+        _COMPILED_GRAMMARS[fingerprint] = compiled
+        while len(_COMPILED_GRAMMARS) > MAX_COMPILED_GRAMMARS:
+            _COMPILED_GRAMMARS.popitem(last=False)
+    return compiled
@@ -1,4 +1,14 @@
-from typing import Optional, List, Callable, Set, Union
+from typing import (
+    Optional,
+    List,
+    Callable,
+    Set,
+    Union,
+    Dict,
+    Tuple,
+    FrozenSet,
+    Iterator,
+)
 import random
 
 from isla.derivation_tree import DerivationTree
@@ -9,9 +19,46 @@ from debugging_framework.fuzzingbook.grammar import (
     expansion_to_children,
     nonterminals,
     all_terminals,
+    exp_string,
 )
 
 
+def draw_unique(
+    draw: Callable[[], str],
+    n: int,
+    is_duplicate: Callable[[str], bool],
+    max_attempts: Optional[int] = None,
+    max_consecutive_duplicates: int = 1000,
+    on_exhausted: Optional[Callable[[int], None]] = None,
+) -> Iterator[str]:
+    """Produce up to `n` strings not reported by `is_duplicate`, calling `draw()`
+    at most `max_attempts` times (default: 10 * `n`).
+    The caller must record every produced string before drawing the next one.
+    If `max_consecutive_duplicates` draws in a row are duplicates, the reachable
+    language is considered exhausted: `on_exhausted` is called with the number of
+    strings produced and the generator stops.
+    Shared by GrammarFuzzer.fuzz_many and fuzzers without it, so `n` means the same
+    for all of them."""
+    if max_attempts is None:
+        max_attempts = 10 * n
+    produced = 0
+    duplicates = 0
+    for _ in range(max_attempts):
+        if produced >= n:
+            return
+        inp = draw()
+        if is_duplicate(inp):
+            duplicates += 1
+            if duplicates >= max_consecutive_duplicates:
+                if on_exhausted is not None:
+                    on_exhausted(produced)
+                return
+            continue
+        duplicates = 0
+        produced += 1
+        yield inp
+
+
 class Fuzzer:
     """Base class for fuzzers."""
 
@@ -51,8 +98,16 @@ class GrammarFuzzer(Fuzzer):
         self.max_nonterminals = max_nonterminals
         self.disp = disp
         self.log = log
+        # Source of all random choices; the random module unless fuzz_many() is seeded
+        self.rng = random
+        self.exhausted = False
         self.check_grammar()  # Invokes is_valid_grammar()
 
+        # Memoized costs; they only depend on the grammar, which must not change afterwards.
+        self._symbol_costs: Dict[Tuple[str, FrozenSet[str]], Union[int, float]] = {}
+        self._expansion_costs: Dict[Tuple[str, FrozenSet[str]], Union[int, float]] = {}
+        self._node_expansion_costs: Dict[str, List[Union[int, float]]] = {}
+
     def check_grammar(self) -> None:
         """Check the grammar passed"""
         assert self.start_symbol in self.grammar
@@ -75,7 +130,7 @@ class GrammarFuzzer(Fuzzer):
         """Return index of expansion in `children_alternatives` to be selected.
         'children_alternatives`: a list of possible children for `node`.
         Defaults to random. To be overloaded in subclasses."""
-        return random.randrange(0, len(children_alternatives))
+        return self.rng.randrange(0, len(children_alternatives))
 
     def expansion_to_children(self, expansion: Expansion) -> List[DerivationTree]:
         return expansion_to_children(expansion)
@@ -113,25 +168,33 @@ class GrammarFuzzer(Fuzzer):
         return chosen_children
 
     def possible_expansions(self, node: DerivationTree) -> int:
-        (symbol, children) = node
-        if children is None:
-            return 1
-
-        return sum(self.possible_expansions(c) for c in children)
+        """Return the number of unexpanded leaves of `node`."""
+        count = 0
+        stack: List[DerivationTree] = [node]
+        while stack:
+            (symbol, children) = stack.pop()
+            if children is None:
+                count += 1
+            else:
+                stack.extend(children)
+        return count
 
     def any_possible_expansions(self, node: DerivationTree) -> bool:
-        (symbol, children) = node
-        if children is None:
-            return True
-
-        return any(self.any_possible_expansions(c) for c in children)
+        """Return whether `node` has an unexpanded leaf."""
+        stack: List[DerivationTree] = [node]
+        while stack:
+            (symbol, children) = stack.pop()
+            if children is None:
+                return True
+            stack.extend(children)
+        return False
 
     def choose_tree_expansion(
         self, tree: DerivationTree, children: List[DerivationTree]
     ) -> int:
         """Return index of subtree in `children` to be selected for expansion.
         Defaults to random."""
-        return random.randrange(0, len(children))
+        return self.rng.randrange(0, len(children))
 
     def expand_tree_once(self, tree: DerivationTree) -> DerivationTree:
         """Choose an unexpanded symbol in tree; expand it.
@@ -141,40 +204,54 @@ class GrammarFuzzer(Fuzzer):
             # Expand this node
             return self.expand_node(tree)
 
-        # Find all children with possible expansions
-        expandable_children = [c for c in children if self.any_possible_expansions(c)]
-
-        # `index_map` translates an index in `expandable_children`
-        # back into the original index in `children`
-        index_map = [i for (i, c) in enumerate(children) if c in expandable_children]
-
-        # Select a random child
-        child_to_be_expanded = self.choose_tree_expansion(tree, expandable_children)
-
-        # Expand in place
-        children[index_map[child_to_be_expanded]] = self.expand_tree_once(
-            expandable_children[child_to_be_expanded]
-        )
-
+        # Count the unexpanded leaves once instead of searching every subtree
+        # on the way down; this needs no recursion and stays linear for deep trees
+        counts, _ = self.count_open_leaves(tree)
+        self.expand_frontier_once(tree, counts)
         return tree
 
     def symbol_cost(self, symbol: str, seen: Set[str] = set()) -> Union[int, float]:
-        expansions = self.grammar[symbol]
-        return min(self.expansion_cost(e, seen | {symbol}) for e in expansions)
+        key = (symbol, frozenset(seen))
+        cost = self._symbol_costs.get(key)
+        if cost is None:
+            expansions = self.grammar[symbol]
+            seen = key[1] | {symbol}
+            cost = min(self.expansion_cost(e, seen) for e in expansions)
+            self._symbol_costs[key] = cost
+        return cost
 
     def expansion_cost(
         self, expansion: Expansion, seen: Set[str] = set()
     ) -> Union[int, float]:
+        key = (exp_string(expansion), frozenset(seen))
+        cost = self._expansion_costs.get(key)
+        if cost is not None:
+            return cost
+
         symbols = nonterminals(expansion)
         if len(symbols) == 0:
-            return 1  # no symbol
-
-        if any(s in seen for s in symbols):
-            return float("inf")
-
-        # the value of a expansion is the sum of all expandable variables
-        # inside + 1
-        return sum(self.symbol_cost(s, seen) for s in symbols) + 1
+            cost = 1  # no symbol
+        elif any(s in seen for s in symbols):
+            cost = float("inf")
+        else:
+            # the value of a expansion is the sum of all expandable variables
+            # inside + 1
+            cost = sum(self.symbol_cost(s, key[1]) for s in symbols) + 1
+
+        self._expansion_costs[key] = cost
+        return cost
+
+    def node_expansion_costs(self, symbol: str) -> List[Union[int, float]]:
+        """Return the costs of all expansions of `symbol`, as used when expanding a node by cost.
+        The table is computed once per symbol."""
+        costs = self._node_expansion_costs.get(symbol)
+        if costs is None:
+            costs = [
+                self.expansion_cost(expansion, {symbol})
+                for expansion in self.grammar[symbol]
+            ]
+            self._node_expansion_costs[symbol] = costs
+        return costs
 
     def expand_node_by_cost(
         self, node: DerivationTree, choose: Callable = min
@@ -185,26 +262,17 @@ class GrammarFuzzer(Fuzzer):
         # Fetch the possible expansions from grammar...
         expansions = self.grammar[symbol]
 
-        children_alternatives_with_cost = [
-            (
-                self.expansion_to_children(expansion),
-                self.expansion_cost(expansion, {symbol}),
-                expansion,
-            )
-            for expansion in expansions
-        ]
-
-        costs = [cost for (child, cost, expansion) in children_alternatives_with_cost]
+        costs = self.node_expansion_costs(symbol)
         chosen_cost = choose(costs)
-        children_with_chosen_cost = [
-            child
-            for (child, child_cost, _) in children_alternatives_with_cost
-            if child_cost == chosen_cost
-        ]
+        # Only the alternatives with the chosen cost need to be turned into children
         expansion_with_chosen_cost = [
             expansion
-            for (_, child_cost, expansion) in children_alternatives_with_cost
-            if child_cost == chosen_cost
+            for (expansion, cost) in zip(expansions, costs)
+            if cost == chosen_cost
+        ]
+        children_with_chosen_cost = [
+            self.expansion_to_children(expansion)
+            for expansion in expansion_with_chosen_cost
         ]
 
         index = self.choose_node_expansion(node, children_with_chosen_cost)
@@ -236,6 +304,73 @@ class GrammarFuzzer(Fuzzer):
             print("Tree:", all_terminals(tree))
             # print(self.possible_expansions(tree), "possible expansion(s) left")
 
+    def count_open_leaves(
+        self, tree: DerivationTree
+    ) -> Tuple[Dict[int, List[int]], int]:
+        """Count the unexpanded leaves below every inner node of `tree`.
+        Return a table mapping the id of each children list with unexpanded leaves
+        to the counts of its children, and the total number of unexpanded leaves."""
+        (symbol, children) = tree
+        if children is None:
+            return {}, 1
+
+        counts: Dict[int, List[int]] = {}
+        stack: List[Tuple[List[DerivationTree], List[int]]] = [(children, [])]
+        while True:
+            children, child_counts = stack[-1]
+            if len(child_counts) < len(children):
+                (_, grandchildren) = children[len(child_counts)]
+                if grandchildren is None:
+                    child_counts.append(1)
+                elif not grandchildren:
+                    child_counts.append(0)
+                else:
+                    stack.append((grandchildren, []))
+                continue
+
+            stack.pop()
+            total = sum(child_counts)
+            if total > 0:
+                counts[id(children)] = child_counts
+            if not stack:
+                return counts, total
+            stack[-1][1].append(total)
+
+    def expand_frontier_once(
+        self, tree: DerivationTree, counts: Dict[int, List[int]]
+    ) -> int:
+        """Choose an unexpanded symbol in `tree` and expand it, finding the expandable
+        children at every level in the table of `count_open_leaves()` instead of
+        searching the subtrees, and update the table along the path. Makes the same
+        choices as the fuzzingbook's recursive tree walk.
+        Return the change of the number of unexpanded leaves."""
+        path: List[Tuple[List[int], int]] = []
+        node = tree
+        while True:
+            (symbol, children) = node
+            child_counts = counts[id(children)]
+            expandable_indexes = [i for (i, c) in enumerate(child_counts) if c > 0]
+
+            # Select a random child
+            child_to_be_expanded = self.choose_tree_expansion(
+                node, [children[i] for i in expandable_indexes]
+            )
+            index = expandable_indexes[child_to_be_expanded]
+            path.append((child_counts, index))
+
+            node = children[index]
+            if node[1] is None:
+                # Expand in place
+                children[index] = self.expand_node(node)
+                new_counts, new_leaves = self.count_open_leaves(children[index])
+                counts.update(new_counts)
+                break
+
+        delta = new_leaves - 1
+        for child_counts, index in path:
+            child_counts[index] += delta
+        return delta
+
     def expand_tree_with_strategy(
         self,
         tree: DerivationTree,
@@ -243,12 +378,28 @@ class GrammarFuzzer(Fuzzer):
         limit: Optional[int] = None,
     ):
         """Expand tree using `expand_node_method` as node expansion function
-        until the number of possible expansions reaches `limit`."""
+        until the number of possible expansions reaches `limit`.
+        The unexpanded leaves are counted once; afterwards every expansion only
+        updates the counts along the path to the expanded leaf.
+        Subclasses overriding `expand_tree_once()` get it called for every expansion
+        instead, at the cost of counting the leaves again every time."""
         self.expand_node = expand_node_method  # type: ignore
-        while (
-            limit is None or self.possible_expansions(tree) < limit
-        ) and self.any_possible_expansions(tree):
-            tree = self.expand_tree_once(tree)
+        if type(self).expand_tree_once is not GrammarFuzzer.expand_tree_once:
+            while (
+                limit is None or self.possible_expansions(tree) < limit
+            ) and self.any_possible_expansions(tree):
+                tree = self.expand_tree_once(tree)
+                self.log_tree(tree)
+            return tree
+
+        counts, open_leaves = self.count_open_leaves(tree)
+        if tree[1] is None and (limit is None or open_leaves < limit):
+            tree = self.expand_node(tree)
+            self.log_tree(tree)
+            counts, open_leaves = self.count_open_leaves(tree)
+
+        while (limit is None or open_leaves < limit) and open_leaves > 0:
+            open_leaves += self.expand_frontier_once(tree, counts)
             self.log_tree(tree)
         return tree
 
@@ -283,3 +434,78 @@ class GrammarFuzzer(Fuzzer):
         """Produce a string from the grammar."""
         self.derivation_tree = self.fuzz_tree()
         return all_terminals(self.derivation_tree)
+
+    def fuzz_many(
+        self,
+        n: int,
+        unique: bool = True,
+        seed: Optional[Union[int, str]] = None,
+        max_attempts: Optional[int] = None,
+        stream: int = 0,
+        max_consecutive_duplicates: int = 1000,
+        is_duplicate: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[str]:
+        """Produce up to `n` strings from the grammar, calling `fuzz()` at most
+        `max_attempts` times (default: 10 * `n`).
+        If `unique` is set, duplicates are dropped; if `max_consecutive_duplicates`
+        draws in a row are duplicates, the reachable language is considered exhausted
+        and `self.exhausted` is set.
+        Duplicates are detected with a private set of all produced strings, unless the
+        caller keeps its own record and passes `is_duplicate` to look strings up in it;
+        the caller must record every produced string before drawing the next one.
+        If `seed` is given, the choices are drawn from a private RNG seeded with
+        `seed` and `stream`, so workers using the same seed and different streams
+        produce independent, reproducible inputs. `self.rng` is only swapped during
+        each `fuzz()` call, so stopping early leaves the fuzzer unchanged."""
+        if max_attempts is None:
+            max_attempts = 10 * n
+        rng = random.Random(f"{seed}/{stream}") if seed is not None else None
+        self.exhausted = False
+
+        if not unique:
+            return (self._fuzz_with(rng) for _ in range(min(n, max_attempts)))
+        if is_duplicate is None:
+            return self._fuzz_many_unique(
+                n, rng, max_attempts, max_consecutive_duplicates
+            )
+        return draw_unique(
+            lambda: self._fuzz_with(rng),
+            n,
+            is_duplicate,
+            max_attempts,
+            max_consecutive_duplicates,
+            self._set_exhausted,
+        )
+
+    def _fuzz_many_unique(
+        self,
+        n: int,
+        rng: Optional[random.Random],
+        max_attempts: int,
+        max_consecutive_duplicates: int,
+    ) -> Iterator[str]:
+        seen: Set[str] = set()
+        for inp in draw_unique(
+            lambda: self._fuzz_with(rng),
+            n,
+            seen.__contains__,
+            max_attempts,
+            max_consecutive_duplicates,
+            self._set_exhausted,
+        ):
+            seen.add(inp)
+            yield inp
+
+    def _set_exhausted(self, produced: int) -> None:
+        self.exhausted = True
+        if self.log:
+            print("Language exhausted after", produced, "inputs")
+
+    def _fuzz_with(self, rng: Optional[random.Random]) -> str:
+        if rng is None:
+            return self.fuzz()
+        previous_rng, self.rng = self.rng, rng
+        try:
+            return self.fuzz()
+        finally:
+            self.rng = previous_rng
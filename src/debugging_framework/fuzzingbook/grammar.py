@@ -1,6 +1,7 @@
 import sys
 import re
 import copy
+import functools
 from typing import Set, Optional, Tuple, Dict, Any, cast, Union, List
 
 from isla.derivation_tree import DerivationTree
@@ -12,6 +13,9 @@ from debugging_framework.types import (
     Option,
 )
 
+# A token of an expansion: the string and whether it is a nonterminal
+Token = Tuple[str, bool]
+
 
 def is_valid_grammar(
     grammar: Grammar, start_symbol: str = START_SYMBOL, supported_opts: Set[str] = set()
@@ -122,13 +126,25 @@ def unreachable_nonterminals(grammar: Grammar, start_symbol=START_SYMBOL) -> Set
     return grammar.keys() - reachable_nonterminals(grammar, start_symbol)
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def split_expansion(expansion: str) -> Tuple[Token, ...]:
+    """Split an expansion string into its terminal and nonterminal tokens.
+    Empty tokens are dropped. The result is cached, as grammars split the same
+    expansions over and over."""
+    return tuple(
+        (s, bool(is_nonterminal(s)))
+        for s in re.split(RE_NONTERMINAL, expansion)
+        if len(s) > 0
+    )
+
+
 def nonterminals(expansion: str):
     # In later chapters, we allow expansions to be tuples,
     # with the expansion being the first element
     if isinstance(expansion, tuple):
         expansion = expansion[0]
 
-    return RE_NONTERMINAL.findall(expansion)
+    return [token for (token, nonterminal) in split_expansion(expansion) if nonterminal]
 
 
 def is_nonterminal(s):
@@ -181,17 +197,22 @@ def exp_probabilities(
 
 def all_terminals(tree: DerivationTree) -> str:
     (symbol, children) = tree
-    if children is None:
-        # This is a nonterminal symbol not expanded yet
-        return symbol
-
-    if len(children) == 0:
-        # This is a terminal symbol
+    if not children:
+        # This is a terminal symbol or a nonterminal symbol not expanded yet
         return symbol
 
     # This is an expanded symbol:
-    # Concatenate all terminal symbols from all children
-    return "".join([all_terminals(c) for c in children])
+    # Concatenate all terminal symbols from all children, using an explicit stack
+    # so deep trees do not hit the recursion limit
+    terminals: List[str] = []
+    stack: List[DerivationTree] = [tree]
+    while stack:
+        (symbol, children) = stack.pop()
+        if children:
+            stack.extend(reversed(children))
+        else:
+            terminals.append(symbol)
+    return "".join(terminals)
 
 
 def extend_grammar(grammar: Grammar, extension: Grammar = {}) -> Grammar:
@@ -324,5 +345,7 @@ def expansion_to_children(expansion: Expansion) -> List[DerivationTree]:
     if expansion == "":  # Special case: epsilon expansion
         return [("", [])]
 
-    strings = re.split(RE_NONTERMINAL, expansion)
-    return [(s, None) if is_nonterminal(s) else (s, []) for s in strings if len(s) > 0]
+    return [
+        (s, None) if nonterminal else (s, [])
+        for (s, nonterminal) in split_expansion(expansion)
+    ]
@@ -1,10 +1,18 @@
+from typing import List
+
 from isla.derivation_tree import DerivationTree
 from debugging_framework.fuzzingbook.grammar import is_nonterminal
 
 
 def tree_to_string(tree: DerivationTree) -> str:
-    symbol, children, *_ = tree
-    if children:
-        return "".join(tree_to_string(c) for c in children)
-    else:
-        return "" if is_nonterminal(symbol) else symbol
+    """Return the string derived by `tree`; unexpanded nonterminals derive "".
+    Uses an explicit stack, so deep trees do not hit the recursion limit."""
+    strings: List[str] = []
+    stack: List[DerivationTree] = [tree]
+    while stack:
+        symbol, children, *_ = stack.pop()
+        if children:
+            stack.extend(reversed(children))
+        elif not is_nonterminal(symbol):
+            strings.append(symbol)
+    return "".join(strings)
@@ -1,20 +1,44 @@
-import random
-from typing import List
+from itertools import accumulate
+from typing import List, Dict
 
 from isla.derivation_tree import DerivationTree
 
-from debugging_framework.fuzzingbook.grammar import exp_probabilities, all_terminals
+from debugging_framework.fuzzingbook.grammar import (
+    exp_probabilities,
+    all_terminals,
+    exp_string,
+)
 from debugging_framework.fuzzingbook.fuzzer import GrammarFuzzer
 
 
 class ProbabilisticGrammarFuzzer(GrammarFuzzer):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        # Sampling tables, computed once per symbol; the grammar must not change afterwards.
+        self._probabilities: Dict[str, Dict[str, float]] = {}
+        self._cum_weights: Dict[str, List[float]] = {}
+        for symbol, expansions in self.grammar.items():
+            probabilities = exp_probabilities(expansions)
+            weights = [probabilities[exp_string(e)] for e in expansions]
+            self._probabilities[symbol] = probabilities
+            self._cum_weights[symbol] = list(accumulate(weights))
+
     def choose_node_expansion(
         self, node: DerivationTree, children_alternatives: List[List[DerivationTree]]
     ) -> int:
         (symbol, tree) = node
-        expansions = self.grammar[symbol]
-        probabilities = exp_probabilities(expansions)
+        population = range(len(children_alternatives))
+
+        cum_weights = self._cum_weights[symbol]
+        if len(children_alternatives) == len(cum_weights) and not self.log:
+            # All expansions are alternatives, in grammar order
+            if cum_weights[-1] == 0:
+                return self.rng.choices(population)[0]
+            return self.rng.choices(population, cum_weights=cum_weights)[0]
 
+        # A subset of the expansions (e.g., expanding at minimum cost)
+        probabilities = self._probabilities[symbol]
         weights: List[float] = []
         for children in children_alternatives:
             expansion = all_terminals((symbol, children))
@@ -25,6 +49,6 @@ class ProbabilisticGrammarFuzzer(GrammarFuzzer):
 
         if sum(weights) == 0:
             # No alternative (probably expanding at minimum cost)
-            return random.choices(range(len(children_alternatives)))[0]
+            return self.rng.choices(population)[0]
         else:
-            return random.choices(range(len(children_alternatives)), weights=weights)[0]
+            return self.rng.choices(population, weights=weights)[0]
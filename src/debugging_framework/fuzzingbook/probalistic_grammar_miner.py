@@ -10,12 +10,15 @@ from debugging_framework.fuzzingbook.grammar import (
     expansion_key,
     set_prob,
 )
+from debugging_framework.fuzzingbook.compiled_grammar import compile_grammar
+from debugging_framework.input.parsing import parse, has_default_settings
 
 
 class ExpansionCountMiner:
     def __init__(self, parser: Parser, log: bool = False) -> None:
         assert isinstance(parser, Parser)
         self.grammar = extend_grammar(parser.grammar())
+        self.compiled_grammar = compile_grammar(self.grammar)
         self.parser = parser
         self.log = log
         self.reset()
@@ -34,23 +37,30 @@ class ExpansionCountMiner:
         self.expansion_counts[key] += 1
 
     def add_tree(self, tree: DerivationTree) -> None:
-        (symbol, children) = tree
-        if not is_nonterminal(symbol):
-            return
-        assert children is not None
-
-        direct_children: List[DerivationTree] = [
-            (symbol, None) if is_nonterminal(symbol) else (symbol, [])
-            for symbol, c in children
-        ]
-        self.add_coverage(symbol, direct_children)
-
-        for c in children:
-            self.add_tree(c)
+        is_nonterminal = self.compiled_grammar.is_nonterminal
+        stack = [tree]
+        while stack:
+            (symbol, children) = stack.pop()
+            if not is_nonterminal(symbol):
+                continue
+            assert children is not None
+
+            # Same key as expansion_key(symbol, direct_children),
+            # without building the direct children first
+            key = symbol + " -> " + "".join(child for child, _ in children)
+            if self.log:
+                print("Found", key)
+            self.expansion_counts[key] = self.expansion_counts.get(key, 0) + 1
+
+            stack.extend(reversed(children))
 
     def count_expansions(self, inputs: List[str]) -> None:
         for inp in inputs:
-            tree, *_ = self.parser.parse(inp)
+            if has_default_settings(self.parser):
+                # Parse trees are cached per grammar and string
+                tree = parse(self.grammar, inp)
+            else:
+                tree, *_ = self.parser.parse(inp)
             self.add_tree(tree)
 
     def counts(self) -> Dict[str, int]:
@@ -1,10 +1,26 @@
-from typing import Generator, Optional, Final
+from typing import Generator, Optional, Final, Iterable, List
+from concurrent.futures import ProcessPoolExecutor
 
 from isla.derivation_tree import DerivationTree
-from isla.parser import EarleyParser
 
 from debugging_framework.input.oracle import OracleResult
 
+# debugging_framework.input.parsing is imported where it is needed,
+# as it depends on debugging_framework.types, which depends on this module.
+
+_worker_grammar = None
+
+
+def _initialize_worker(grammar):
+    global _worker_grammar
+    _worker_grammar = grammar
+
+
+def _parse_in_worker(input_string: str) -> DerivationTree:
+    from debugging_framework.input.parsing import parse
+
+    return parse(_worker_grammar, input_string)
+
 
 class Input:
     """
@@ -116,9 +132,35 @@ class Input:
         :param Optional[OracleResult] oracle: The optional oracle result.
         :return Input: The created Input instance.
         """
-        return cls(
-            DerivationTree.from_parse_tree(
-                next(EarleyParser(grammar).parse(input_string))
-            ),
-            oracle,
-        )
+        from debugging_framework.input.parsing import parse
+
+        return cls(parse(grammar, input_string), oracle)
+
+    @classmethod
+    def from_strings(
+        cls, grammar, input_strings: Iterable[str], workers: Optional[int] = None
+    ) -> List["Input"]:
+        """
+        Factory method to create Input instances from many strings, reusing one cached parser per process.
+        :param grammar: The grammar used for parsing the input strings.
+        :param Iterable[str] input_strings: The input strings to parse.
+        :param Optional[int] workers: The number of worker processes to parse in; parses in this process if None or 1.
+        :return List[Input]: The created Input instances, in the order of the strings.
+        """
+        from debugging_framework.input.parsing import parse
+
+        input_strings = list(input_strings)
+        if workers is None or workers <= 1 or len(input_strings) <= 1:
+            return [cls(parse(grammar, inp)) for inp in input_strings]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(grammar,),
+        ) as executor:
+            trees = executor.map(
+                _parse_in_worker,
+                input_strings,
+                chunksize=max(1, len(input_strings) // (workers * 4)),
+            )
+            return [cls(tree) for tree in trees]
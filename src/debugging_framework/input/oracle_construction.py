@@ -1,13 +1,210 @@
-from typing import Callable, Dict, Type, Optional, Any, Sequence
+from typing import Callable, Dict, Type, Optional, Any, Sequence, Tuple, List
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
 import contextlib
+import signal
+import threading
 from copy import deepcopy
 
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.input.input import Input
 from debugging_framework.execution.timeout_manager import ManageTimeout
-from debugging_framework.execution.exceptions import UnexpectedResultError
-from debugging_framework.types import OracleResultType, OracleType
+from debugging_framework.execution.fork_server import ForkServer
+from debugging_framework.execution.memory_manager import limit_memory
+from debugging_framework.execution.exceptions import (
+    UnexpectedResultError,
+    WorkerDiedError,
+)
+from debugging_framework.types import OracleResultType, OracleType, BatchOracleType
+
+
+# The OOM killer sends SIGKILL; allocation failures in native code end in abort()
+_MEMORY_SIGNALS = (signal.SIGKILL, signal.SIGABRT)
+
+
+class CopyStrategy(Enum):
+    """
+    Determines how the harness parameters are copied before they are passed to a program.
+
+    - DEEP: Always deep-copies the parameters.
+    - STRUCTURAL: Rebuilds lists, dicts, sets and tuples of primitives; falls back to a deep copy otherwise.
+    - AUTO: Passes immutable parameters as they are and copies everything else structurally.
+    - NONE: Never copies the parameters. Only safe if the programs do not mutate their arguments.
+    """
+
+    DEEP = "DEEP"
+    STRUCTURAL = "STRUCTURAL"
+    AUTO = "AUTO"
+    NONE = "NONE"
+
+
+_PRIMITIVE_TYPES = (int, float, bool, str, bytes, complex, type(None))
+
+
+class _NotStructural(Exception):
+    pass
+
+
+def is_immutable(value: Any) -> bool:
+    """
+    Checks whether a value is a primitive or a (frozen) tuple or frozenset composed only of immutable values.
+    """
+    if type(value) in _PRIMITIVE_TYPES:
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(is_immutable(element) for element in value)
+    return False
+
+
+def _structural_copy(value: Any) -> Any:
+    value_type = type(value)
+    if value_type in _PRIMITIVE_TYPES:
+        return value
+    if value_type is list:
+        return [_structural_copy(element) for element in value]
+    if value_type is tuple:
+        return tuple(_structural_copy(element) for element in value)
+    if value_type is dict:
+        return {key: _structural_copy(element) for key, element in value.items()}
+    if value_type is set:
+        return {_structural_copy(element) for element in value}
+    if value_type is frozenset:
+        return frozenset(_structural_copy(element) for element in value)
+    raise _NotStructural
+
+
+def structural_copy(value: Any) -> Any:
+    """
+    Copies containers of primitives without the bookkeeping of deepcopy.
+    Falls back to deepcopy for values containing any other type.
+    """
+    try:
+        return _structural_copy(value)
+    except _NotStructural:
+        return deepcopy(value)
+
+
+def copy_parameters(param: Sequence, strategy: CopyStrategy) -> Sequence:
+    """
+    Copies the parameters passed to a program according to the given copy strategy.
+    :param Sequence param: The parameters produced by the harness function.
+    :param CopyStrategy strategy: The copy strategy.
+    :return Sequence: The parameters to unpack into the program call.
+    """
+    match strategy:
+        case CopyStrategy.NONE:
+            return param
+        case CopyStrategy.DEEP:
+            return deepcopy(param)
+        case CopyStrategy.STRUCTURAL:
+            return structural_copy(param)
+        case CopyStrategy.AUTO:
+            if all(is_immutable(element) for element in param):
+                return param
+            return structural_copy(param)
+
+
+def canonical_key(value: Any) -> Any:
+    """
+    Serializes primitives and lists, tuples, dicts, sets and frozensets of them into a canonical, hashable key:
+    equal values of the same types get equal keys, regardless of the order of sets and dicts.
+    :raises _NotStructural: If the value contains any other type, which has no canonical serialization.
+    """
+    value_type = type(value)
+    if value_type in _PRIMITIVE_TYPES:
+        # The type name tells apart values that compare equal, e.g., 1, 1.0 and True
+        return value_type.__name__, repr(value)
+    if value_type in (list, tuple):
+        return value_type.__name__, tuple(canonical_key(element) for element in value)
+    if value_type in (set, frozenset):
+        return value_type.__name__, tuple(
+            sorted(canonical_key(element) for element in value)
+        )
+    if value_type is dict:
+        return "dict", tuple(
+            sorted(
+                (canonical_key(key), canonical_key(element))
+                for key, element in value.items()
+            )
+        )
+    raise _NotStructural
+
+
+def _is_reconstructible(exception: Exception) -> bool:
+    try:
+        type(exception)(*exception.args)
+        return True
+    except Exception:
+        return False
+
+
+class ReferenceMemo:
+    """
+    Bounded, thread-safe memo of reference implementation results keyed by the harness parameters.
+    A single memo can be shared by all FunctionalOracleConstructors that use the same reference implementation,
+    so the reference runs only once per distinct input. Exceptions raised by the reference are memoized as well,
+    except for TimeoutErrors, which depend on the machine's load; a fresh exception is raised on every hit.
+
+    Parameters are keyed by their canonical serialization (see canonical_key); parameters containing other
+    objects bypass the memo. The memo only helps in the process it lives in: with use_fork_server or a
+    ParallelExecutionHandler, the reference runs in child processes, each of which fills its own copy.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initializes the ReferenceMemo.
+        :param int max_entries: Maximum number of memoized results; the least recently used are dropped first.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[Any, Tuple[bool, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get_or_compute(self, param: Sequence, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the memoized result for the parameters or computes and memoizes it.
+        :param Sequence param: The harness parameters passed to the reference implementation.
+        :param Callable compute: Executes the reference implementation.
+        :return Any: The result of the reference implementation. Memoized exceptions are re-raised.
+        """
+        try:
+            key = canonical_key(param)
+        except _NotStructural:
+            return compute()
+
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            try:
+                entry = (True, compute())
+            except TimeoutError:
+                raise
+            except Exception as e:
+                # Only memoize exceptions that can be raised afresh from their type and arguments
+                if not _is_reconstructible(e):
+                    raise
+                entry = (False, (type(e), e.args))
+            with self._lock:
+                self._results[key] = entry
+                if len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+
+        successful, value = entry
+        if not successful:
+            exception_type, args = value
+            raise exception_type(*args)
+        return value
 
 
 class OracleConstructor(ABC):
@@ -19,8 +216,17 @@ class OracleConstructor(ABC):
         error_definitions (Dict[Type[Exception], OracleResult]): Custom mappings from exceptions to OracleResults.
         default_oracle_result (OracleResult): Default OracleResult if no specific error mapping exists.
         timeout (float): Maximum allowed execution time for the program in seconds.
+        use_fork_server (bool): If True, the oracle runs in pre-forked worker processes that are killed on timeout,
+            instead of using SIGALRM in the calling process. This makes the oracle safe to call from any thread.
+        number_of_workers (int): Number of warm worker processes kept by the fork server.
+        copy_strategy (CopyStrategy): How the harness parameters are copied before each program execution.
+        max_memory (Optional[float]): Memory in MB a fork server worker may allocate on top of its footprint.
+            Setting it implies use_fork_server. Exceeding it results in a MemoryError for the current input only.
+        program_calls (int): The number of program executions per input, used to scale the timeout.
     """
 
+    program_calls: int = 1
+
     def __init__(
         self,
         program: Callable,
@@ -28,6 +234,10 @@ class OracleConstructor(ABC):
         error_definitions: Optional[Dict[Type[Exception], OracleResult]] = None,
         default_oracle_result: OracleResult = OracleResult.UNDEFINED,
         timeout: float = 1.0,
+        use_fork_server: bool = False,
+        number_of_workers: int = 1,
+        copy_strategy: CopyStrategy = CopyStrategy.AUTO,
+        max_memory: Optional[float] = None,
     ):
         if error_definitions is not None and not isinstance(error_definitions, dict):
             raise ValueError(
@@ -41,53 +251,250 @@ class OracleConstructor(ABC):
             OracleResult.FAILING if not error_definitions else default_oracle_result
         )
         self.timeout = timeout
+        self.max_memory = max_memory
+        self.use_fork_server = use_fork_server or max_memory is not None
+        self.number_of_workers = number_of_workers
+        self.copy_strategy = copy_strategy
+        self._manage_timeout = True
+
+    def get_parameters(self, inp: Input | str) -> Sequence:
+        """
+        Turns an input into the parameters of the program using the harness function, if any.
+        :param Input | str inp: The input.
+        :return Sequence: The parameters to pass to the program.
+        """
+        return self.harness_function(str(inp)) if self.harness_function else str(inp)
+
+    @staticmethod
+    def map_harness_exception(exception: Exception) -> OracleResultType:
+        """
+        Labels an input the harness function cannot turn into parameters. The program never ran, so the input is
+        UNDEFINED regardless of the error definitions. Used by every oracle built, with or without a fork server.
+        :param Exception exception: The exception raised by the harness function.
+        :return OracleResultType: UNDEFINED and the exception.
+        """
+        return OracleResult.UNDEFINED, exception
+
+    def map_exception(self, exception: Exception) -> OracleResultType:
+        """
+        Maps an exception raised while evaluating an input to its OracleResult.
+        :param Exception exception: The exception.
+        :return OracleResultType: The OracleResult defined for the exception type and the exception.
+        """
+        return (
+            self.error_definitions.get(type(exception), self.default_oracle_result),
+            exception,
+        )
+
+    def call_program(self, program: Callable, param: Sequence) -> Any:
+        """
+        Calls the program with a copy of the parameters, without any timeout or stdout handling.
+        :param Callable program: The program to execute.
+        :param Sequence param: Parameters to pass to the program.
+        :return Any: The result of the program execution.
+        """
+        return program(*copy_parameters(param, self.copy_strategy))
 
     def execute_program(self, program: Callable, param: Sequence) -> Any:
         """
         Executes the given program with the specified parameters within a controlled timeout context.
+        Inside a fork server worker, the timeout is enforced by the parent process instead.
         :param Callable program: The program to execute.
         :param Sequence param: Parameters to pass to the program.
         :return Any: The result of the program execution.
         """
-        with ManageTimeout(self.timeout):
-            with contextlib.redirect_stdout(None):  # Silencing stdout.
-                return program(*deepcopy(param))
+        timeout_context = (
+            ManageTimeout(self.timeout)
+            if self._manage_timeout
+            else contextlib.nullcontext()
+        )
+        # The alarm is cancelled before stdout is restored, so it cannot leave sys.stdout redirected
+        with contextlib.redirect_stdout(None):  # Silencing stdout.
+            with timeout_context:
+                return self.call_program(program, param)
 
     @abstractmethod
-    def build(self) -> OracleType:
+    def evaluate(
+        self, param: Sequence, execute: Callable[[Callable, Sequence], Any]
+    ) -> OracleResultType:
         """
-        Constructs and returns an oracle function.
+        Evaluates the parameters of a single input.
+        :param Sequence param: The parameters produced by the harness function.
+        :param Callable execute: Executes a program with the parameters, e.g., execute_program or call_program.
+        :return OracleResultType: The OracleResult and the exception, if any.
         """
         pass
 
+    def execute_batch(self, inputs: Sequence[str]) -> List[OracleResultType]:
+        """
+        Evaluates several inputs in one tight loop. All inputs are passed through the harness function up front,
+        stdout is redirected once and the alarm signal handler is installed once; only the timer is re-armed
+        for every input.
+        :param Sequence[str] inputs: The inputs to be evaluated.
+        :return List[OracleResultType]: The results in the order of the inputs.
+        """
+        params = []
+        for inp in inputs:
+            try:
+                params.append((self.get_parameters(inp), None))
+            except Exception as e:
+                params.append((None, e))
 
-class FailureOracleConstructor(OracleConstructor):
-    """
-    Concrete implementation of OracleConstructor for generating oracles that
-    identify failures based on exceptions thrown during program execution.
-    """
+        timeout = self.timeout * self.program_calls
+        results: List[OracleResultType] = []
+        with contextlib.redirect_stdout(None), ManageTimeout(timeout):
+            for param, harness_exception in params:
+                if harness_exception is not None:
+                    results.append(self.map_harness_exception(harness_exception))
+                    continue
+                try:
+                    ManageTimeout.set_alarm(timeout)
+                    results.append(self.evaluate(param, self.call_program))
+                except TimeoutError as e:  # The alarm went off outside the program.
+                    results.append(self.map_exception(e))
+                finally:
+                    ManageTimeout.cancel_alarm()
+        return results
+
+    def _initialize_fork_server_worker(self):
+        """
+        Called in every fork server worker after forking. The worker is killed by the parent on timeout,
+        so no alarm signals need to be installed. Applies the memory limit, if any, to the worker.
+        """
+        self._manage_timeout = False
+        if self.max_memory is not None:
+            limit_memory(self.max_memory)
+
+    def _create_fork_server(self, target: Callable) -> ForkServer:
+        return ForkServer(
+            target=target,
+            timeout=self.timeout * self.program_calls,
+            number_of_workers=self.number_of_workers,
+            initializer=self._initialize_fork_server_worker,
+        )
+
+    def _map_worker_exception(self, exception: Exception) -> OracleResultType:
+        """
+        Maps an exception raised by a fork server call to its OracleResult.
+        A worker killed by the OOM killer or aborted by the allocator under a memory limit counts as a MemoryError;
+        any other worker death is a crash and labelled UNDEFINED unless ChildProcessError has an error definition.
+        """
+        if (
+            isinstance(exception, WorkerDiedError)
+            and self.max_memory is not None
+            and exception.exitcode is not None
+            and -exception.exitcode in _MEMORY_SIGNALS
+        ):
+            exception = MemoryError(
+                f"Memory limit of {self.max_memory} MB exceeded: {exception}"
+            )
+        elif isinstance(exception, ChildProcessError):
+            return (
+                self.error_definitions.get(ChildProcessError, OracleResult.UNDEFINED),
+                exception,
+            )
+        return self.map_exception(exception)
+
+    def _finalize_oracle(self, oracle: OracleType) -> OracleType:
+        """
+        Moves the oracle into a fork server if requested, otherwise returns it unchanged.
+        :param OracleType oracle: The oracle evaluating a single input in the current process.
+        :return OracleType: The oracle to be handed out by build().
+        """
+        if not self.use_fork_server:
+            return oracle
+
+        fork_server = self._create_fork_server(oracle)
+
+        def sandboxed_oracle(inp: Input | str) -> OracleResultType:
+            try:
+                return fork_server(str(inp))
+            except Exception as e:
+                return self._map_worker_exception(e)
+
+        # The oracle owns the fork server: its workers are killed by close() or once the oracle is garbage collected
+        sandboxed_oracle.fork_server = fork_server
+        sandboxed_oracle.close = fork_server.close
+        return sandboxed_oracle
 
     def build(self) -> OracleType:
         """
-        Builds an oracle that evaluates program executions by checking for exceptions
-        and comparing them against predefined error definitions.
+        Builds an oracle that evaluates a single input.
+        With a fork server, the oracle has a close() method that kills the workers.
         :return OracleType: A callable that takes an input and returns a tuple of OracleResult and any exception.
         """
 
         def oracle(inp: Input | str) -> OracleResultType:
-            param = (
-                self.harness_function(str(inp)) if self.harness_function else str(inp)
-            )
             try:
-                self.execute_program(self.program, param)
+                param = self.get_parameters(inp)
+            except Exception as e:
+                return self.map_harness_exception(e)
+            return self.evaluate(param, self.execute_program)
+
+        return self._finalize_oracle(oracle)
+
+    def build_batch(self) -> BatchOracleType:
+        """
+        Builds an oracle that evaluates a whole collection of inputs at once (see execute_batch).
+        With a fork server, every batch is evaluated in a single worker; the per-input timeout is still enforced
+        inside the worker, the parent only kills workers that exceed the budget of the whole batch.
+        If the worker dies or is killed, the inputs of the batch are evaluated again one at a time, so the failure
+        is only charged to the input causing it.
+        :return BatchOracleType: A callable that takes a collection of inputs and returns their results in order.
+        """
+        if not self.use_fork_server:
+
+            def batch_oracle(inputs) -> List[OracleResultType]:
+                return self.execute_batch([str(inp) for inp in inputs])
+
+            return batch_oracle
+
+        fork_server = self._create_fork_server(self.execute_batch)
+
+        def evaluate_alone(input_string: str) -> OracleResultType:
+            try:
+                return fork_server([input_string])[0]
             except Exception as e:
-                return (
-                    self.error_definitions.get(type(e), self.default_oracle_result),
-                    e,
+                return self._map_worker_exception(e)
+
+        def sandboxed_batch_oracle(inputs) -> List[OracleResultType]:
+            input_strings = [str(inp) for inp in inputs]
+            if not input_strings:
+                return []
+            try:
+                return fork_server(
+                    input_strings,
+                    timeout=fork_server.timeout * len(input_strings),
                 )
-            return OracleResult.PASSING, None
+            except Exception:
+                return [evaluate_alone(input_string) for input_string in input_strings]
+
+        sandboxed_batch_oracle.fork_server = fork_server
+        sandboxed_batch_oracle.close = fork_server.close
+        return sandboxed_batch_oracle
+
+
+class FailureOracleConstructor(OracleConstructor):
+    """
+    Concrete implementation of OracleConstructor for generating oracles that
+    identify failures based on exceptions thrown during program execution.
+    """
 
-        return oracle
+    def evaluate(
+        self, param: Sequence, execute: Callable[[Callable, Sequence], Any]
+    ) -> OracleResultType:
+        """
+        Evaluates a program execution by checking for exceptions
+        and comparing them against predefined error definitions.
+        :param Sequence param: The parameters produced by the harness function.
+        :param Callable execute: Executes a program with the parameters.
+        :return OracleResultType: The OracleResult and the exception, if any.
+        """
+        try:
+            execute(self.program, param)
+        except Exception as e:
+            return self.map_exception(e)
+        return OracleResult.PASSING, None
 
 
 class FunctionalOracleConstructor(OracleConstructor):
@@ -96,8 +503,12 @@ class FunctionalOracleConstructor(OracleConstructor):
     the correctness of program outputs against expected results produced by a separate oracle program.
     Attributes:
         program_oracle (Callable): The reference oracle program used for generating expected results.
+        reference_memo (Optional[ReferenceMemo]): Memo of reference results, shared with other constructors using the
+            same reference implementation. With use_fork_server, every worker uses its own copy of the memo.
     """
 
+    program_calls: int = 2
+
     def __init__(
         self,
         program: Callable,
@@ -106,35 +517,61 @@ class FunctionalOracleConstructor(OracleConstructor):
         error_definitions: Optional[Dict[Type[Exception], OracleResult]] = None,
         default_oracle_result: OracleResult = OracleResult.UNDEFINED,
         timeout: float = 1.0,
+        use_fork_server: bool = False,
+        number_of_workers: int = 1,
+        copy_strategy: CopyStrategy = CopyStrategy.AUTO,
+        reference_memo: Optional[ReferenceMemo] = None,
+        max_memory: Optional[float] = None,
     ):
         super().__init__(
-            program, harness_function, error_definitions, default_oracle_result, timeout
+            program,
+            harness_function,
+            error_definitions,
+            default_oracle_result,
+            timeout,
+            use_fork_server,
+            number_of_workers,
+            copy_strategy,
+            max_memory,
         )
         self.program_oracle = program_oracle
+        self.reference_memo = reference_memo
 
-    def build(self) -> OracleType:
+    def execute_reference(
+        self,
+        param: Sequence,
+        execute: Optional[Callable[[Callable, Sequence], Any]] = None,
+    ) -> Any:
         """
-        Builds an oracle that compares the results of the target program against those generated by a reference oracle.
-        :return OracleType: A callable that takes an input and returns a tuple of OracleResult and any exception.
+        Executes the reference implementation, reusing memoized results if a reference memo is set.
+        :param Sequence param: Parameters to pass to the reference implementation.
+        :param Optional[Callable] execute: Executes the reference with the parameters. Defaults to execute_program.
+        :return Any: The expected result.
         """
+        execute = execute or self.execute_program
+        if self.reference_memo is None:
+            return execute(self.program_oracle, param)
+        return self.reference_memo.get_or_compute(
+            param, lambda: execute(self.program_oracle, param)
+        )
 
-        def oracle(inp: Input | str) -> OracleResultType:
-            param = (
-                self.harness_function(str(inp)) if self.harness_function else str(inp)
-            )
-            try:
-                produced_result = self.execute_program(self.program, param)
-                expected_result = self.execute_program(self.program_oracle, param)
-
-                if (expected_result != produced_result) or (
-                    type(expected_result) is not type(produced_result)
-                ):
-                    raise UnexpectedResultError(f"Results do not match: got {produced_result}, expected {expected_result}")
-            except Exception as e:
-                return (
-                    self.error_definitions.get(type(e), self.default_oracle_result),
-                    e,
-                )
-            return OracleResult.PASSING, None
+    def evaluate(
+        self, param: Sequence, execute: Callable[[Callable, Sequence], Any]
+    ) -> OracleResultType:
+        """
+        Compares the result of the target program against the one generated by the reference oracle.
+        :param Sequence param: The parameters produced by the harness function.
+        :param Callable execute: Executes a program with the parameters.
+        :return OracleResultType: The OracleResult and the exception, if any.
+        """
+        try:
+            produced_result = execute(self.program, param)
+            expected_result = self.execute_reference(param, execute)
 
-        return oracle
+            if (expected_result != produced_result) or (
+                type(expected_result) is not type(produced_result)
+            ):
+                raise UnexpectedResultError(f"Results do not match: got {produced_result}, expected {expected_result}")
+        except Exception as e:
+            return self.map_exception(e)
+        return OracleResult.PASSING, None
@@ -0,0 +1,137 @@
+from typing import Dict, Tuple, Optional
+from collections import OrderedDict
+import threading
+import copy
+
+from isla.derivation_tree import DerivationTree
+from isla.parser import EarleyParser, Parser, START_SYMBOL
+
+from debugging_framework.types import Grammar
+from debugging_framework.fuzzingbook.compiled_grammar import grammar_fingerprint
+
+MAX_PARSERS = 32
+MAX_PARSE_TREES = 4096
+
+_PARSERS: "OrderedDict[str, Tuple[EarleyParser, threading.Lock]]" = OrderedDict()
+_PARSERS_LOCK = threading.Lock()
+
+_PARSE_TREES: "OrderedDict[Tuple[str, str], DerivationTree]" = OrderedDict()
+_PARSE_TREES_LOCK = threading.Lock()
+_parse_tree_hits = 0
+_parse_tree_misses = 0
+
+
+def _get_parser_entry(
+    grammar: Grammar, fingerprint: Optional[str] = None
+) -> Tuple[EarleyParser, threading.Lock]:
+    fingerprint = fingerprint or grammar_fingerprint(grammar)
+    with _PARSERS_LOCK:
+        entry = _PARSERS.get(fingerprint)
+        if entry is not None:
+            _PARSERS.move_to_end(fingerprint)
+            return entry
+
+        # The parser keeps its grammar; a copy so later changes to the caller's grammar cannot leak into it
+        entry = (EarleyParser(copy.deepcopy(grammar)), threading.Lock())
+        _PARSERS[fingerprint] = entry
+        while len(_PARSERS) > MAX_PARSERS:
+            _PARSERS.popitem(last=False)
+        return entry
+
+
+def has_default_settings(parser: Parser) -> bool:
+    """
+    Checks whether a parser is a plain EarleyParser without any options, i.e., parses exactly like the cached
+    parser of its grammar. Only then can its parse trees be taken from parse().
+    :param Parser parser: The parser.
+    :return bool: True if the parser has the default start symbol, tokens and settings.
+    """
+    return (
+        type(parser) is EarleyParser
+        and parser.start_symbol() == START_SYMBOL
+        and not parser.tokens
+        and parser.coalesce_tokens
+        and not parser.log
+    )
+
+
+def get_parser(grammar: Grammar) -> EarleyParser:
+    """
+    Returns the process-wide Earley parser for a grammar.
+    Parsers are kept in a bounded LRU cache keyed by the grammar fingerprint, so equal grammars share one parser.
+    The parser keeps the chart of its last parse; use parse() to parse from several threads.
+    :param Grammar grammar: The grammar.
+    :return EarleyParser: The cached parser.
+    """
+    parser, _ = _get_parser_entry(grammar)
+    return parser
+
+
+def parse(grammar: Grammar, input_string: str) -> DerivationTree:
+    """
+    Parses a string with the cached parser of a grammar.
+    The derivation trees of the last parsed strings are kept in a bounded LRU cache keyed by the grammar fingerprint
+    and the string, so every distinct string is only parsed once. The cached trees are shared; as isla's derivation
+    trees are immutable, this is safe.
+    :param Grammar grammar: The grammar.
+    :param str input_string: The string to parse.
+    :return DerivationTree: The first derivation tree of the string.
+    :raises SyntaxError: If the string is not in the language of the grammar.
+    """
+    global _parse_tree_hits, _parse_tree_misses
+
+    fingerprint = grammar_fingerprint(grammar)
+    key = (fingerprint, input_string)
+    with _PARSE_TREES_LOCK:
+        tree = _PARSE_TREES.get(key)
+        if tree is not None:
+            _PARSE_TREES.move_to_end(key)
+            _parse_tree_hits += 1
+            return tree
+        _parse_tree_misses += 1
+
+    parser, lock = _get_parser_entry(grammar, fingerprint)
+    with lock:
+        parse_tree = next(parser.parse(input_string))
+    tree = DerivationTree.from_parse_tree(parse_tree)
+
+    with _PARSE_TREES_LOCK:
+        _PARSE_TREES[key] = tree
+        while len(_PARSE_TREES) > MAX_PARSE_TREES:
+            _PARSE_TREES.popitem(last=False)
+    return tree
+
+
+def get_parser_cache_info() -> Dict[str, int]:
+    """
+    :return Dict[str, int]: The number of cached parsers and the maximum number of cached parsers.
+    """
+    with _PARSERS_LOCK:
+        return {"size": len(_PARSERS), "max_size": MAX_PARSERS}
+
+
+def get_parse_tree_cache_info() -> Dict[str, int]:
+    """
+    :return Dict[str, int]: The hits and misses of the parse tree cache, its size and its maximum size.
+    """
+    with _PARSE_TREES_LOCK:
+        return {
+            "hits": _parse_tree_hits,
+            "misses": _parse_tree_misses,
+            "size": len(_PARSE_TREES),
+            "max_size": MAX_PARSE_TREES,
+        }
+
+
+def clear_parser_cache():
+    """
+    Removes all cached parsers and parse trees, and resets the hit and miss counters.
+    """
+    global _parse_tree_hits, _parse_tree_misses
+
+    with _PARSERS_LOCK:
+        _PARSERS.clear()
+    with _PARSE_TREES_LOCK:
+        _PARSE_TREES.clear()
+        _parse_tree_hits = 0
+        _parse_tree_misses = 0
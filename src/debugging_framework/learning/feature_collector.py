@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List, Dict, Optional, Any, Type
+from typing import List, Dict, Optional, Any, Type, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -54,17 +54,32 @@ class GrammarFeatureCollector(FeatureCollector):
         return feature_vector
 
     def set_features(self, tree: DerivationTree, feature_vector: FeatureVector):
-        (node, children) = tree
-
-        corresponding_features_1d = self.get_corresponding_feature(node)
-
-        for corresponding_feature in corresponding_features_1d:
-            value = corresponding_feature.evaluate(tree)
-            feature_vector.set_feature(corresponding_feature, value)
-
-        for child in children:
-            if is_nonterminal(child[0]):
-                self.set_features(child, feature_vector)
+        # Lengths of all subtrees, computed in one pass instead of stringifying every subtree
+        lengths = (
+            subtree_lengths(tree)
+            if any(isinstance(feature, LengthFeature) for feature in self.features)
+            else {}
+        )
+
+        # Visit the nonterminal nodes in pre-order, using an explicit stack
+        # so deep trees do not hit the recursion limit
+        stack: List[DerivationTree] = [tree]
+        while stack:
+            subtree = stack.pop()
+            (node, children) = subtree
+
+            corresponding_features_1d = self.get_corresponding_feature(node)
+
+            for corresponding_feature in corresponding_features_1d:
+                if isinstance(corresponding_feature, LengthFeature):
+                    value = lengths[id(subtree)]
+                else:
+                    value = corresponding_feature.evaluate(subtree)
+                feature_vector.set_feature(corresponding_feature, value)
+
+            stack.extend(
+                child for child in reversed(children) if is_nonterminal(child[0])
+            )
 
     @lru_cache
     def get_corresponding_feature(self, current_node: str) -> List[Feature]:
@@ -73,3 +88,24 @@ class GrammarFeatureCollector(FeatureCollector):
             for feature in self.features
             if (feature.non_terminal == current_node)
         ]
+
+
+def subtree_lengths(tree: DerivationTree) -> Dict[int, int]:
+    """
+    Computes the length of the string derived by every subtree in a single post-order pass.
+    :param DerivationTree tree: The derivation tree.
+    :return Dict[int, int]: A mapping from the id of each subtree to the length of its string.
+    """
+    lengths: Dict[int, int] = {}
+    stack: List[Tuple[DerivationTree, bool]] = [(tree, False)]
+    while stack:
+        subtree, children_done = stack.pop()
+        symbol, children, *_ = subtree
+        if not children:
+            lengths[id(subtree)] = 0 if is_nonterminal(symbol) else len(symbol)
+        elif children_done:
+            lengths[id(subtree)] = sum(lengths[id(child)] for child in children)
+        else:
+            stack.append((subtree, True))
+            stack.extend((child, False) for child in children)
+    return lengths
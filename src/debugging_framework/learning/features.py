@@ -1,12 +1,12 @@
 from typing import List, Set, Dict, Optional, Any
-import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
 
 from isla.derivation_tree import DerivationTree
 
 from debugging_framework.types import Grammar
-from debugging_framework.fuzzingbook.grammar import reachable_nonterminals, is_nonterminal
+from debugging_framework.fuzzingbook.helper import tree_to_string
+from debugging_framework.fuzzingbook.compiled_grammar import compile_grammar
 from debugging_framework.input.oracle import OracleResult
 
 
@@ -144,49 +144,26 @@ class NumericFeature(Feature):
         :param grammar: The input grammar.
         :return: A mapping from each rule to a set of derivable characters.
         """
-        # Regex for non-terminal symbols in expansions
-        re_non_terminal = re.compile(r"(<[^<> ]*>)")
+        compiled = compile_grammar(grammar)
 
         # Mapping from non-terminals to derivable terminal chars
         derivable_chars = defaultdict(set)
 
-        # Populate initial derivable_chars
-        for rule, expansions in grammar.items():
-            for expansion in expansions:
-                # Remove non-terminal symbols and whitespace from expansion
-                terminals = re.sub(re_non_terminal, "", expansion)
-                # Add each terminal char to the set of derivable chars
-                for char in terminals:
-                    derivable_chars[rule].add(char)
-
-        # Update derivable_chars until convergence
-        while True:
-            if not cls.update_derivable_chars(grammar, derivable_chars):
-                break
-
-        return derivable_chars
-
-    @classmethod
-    def update_derivable_chars(
-        cls, grammar: Grammar, derivable_chars: Dict[str, Set[str]]
-    ) -> bool:
-        """
-        Update the mapping of derivable characters for each rule.
-        :param grammar: The input grammar.
-        :param derivable_chars: The existing mapping of derivable characters.
-        :return: True if any set of derivable chars was updated, False otherwise.
-        """
-        updated = False
+        # Populate initial derivable_chars with the terminal chars of each expansion
+        for rule in grammar:
+            for index in range(len(grammar[rule])):
+                for token, nonterminal in compiled.tokens(rule, index):
+                    if not nonterminal:
+                        derivable_chars[rule].update(token)
+
+        # A rule derives the chars of all rules reachable from it,
+        # so a single pass over the precomputed reachability replaces the fixpoint iteration
+        direct_chars = {rule: set(chars) for rule, chars in derivable_chars.items()}
         for rule in grammar:
-            for reachable_rule in reachable_nonterminals(grammar, rule):
-                before_update = len(derivable_chars[rule])
-                derivable_chars[rule].update(derivable_chars[reachable_rule])
-                after_update = len(derivable_chars[rule])
+            for reachable_rule in compiled.reachable_nonterminals(rule):
+                derivable_chars[rule].update(direct_chars.get(reachable_rule, ()))
 
-                # Set of derivable chars was updated
-                if after_update > before_update:
-                    updated = True
-        return updated
+        return derivable_chars
 
     @classmethod
     def get_features(cls, derivable_chars: Dict[str, Set[str]]) -> List[Feature]:
@@ -279,10 +256,3 @@ class FeatureVector:
     def __repr__(self):
         return f"{self.test_input}: {self.features}"
 
-
-def tree_to_string(tree: DerivationTree) -> str:
-    symbol, children, *_ = tree
-    if children:
-        return "".join(tree_to_string(c) for c in children)
-    else:
-        return "" if is_nonterminal(symbol) else symbol
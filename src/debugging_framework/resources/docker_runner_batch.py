@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+
+from debugging_framework.benchmark.program import BenchmarkProgram
+from tests4py.api.logging import deactivate
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python3 docker_runner_batch.py <inputs_file> <results_file>")
+        sys.exit(1)
+    inputs_path = os.path.join('/app', sys.argv[1])
+    results_path = os.path.join('/app', sys.argv[2])
+    if not os.path.exists(inputs_path):
+        print(f"Input file {sys.argv[1]} does not exist in /app.")
+        sys.exit(1)
+
+    # One JSON string per line
+    with open(inputs_path, 'r') as f:
+        inputs = [json.loads(line) for line in f if line.strip()]
+
+    # Load the program once for the whole batch
+    benchmark_program: BenchmarkProgram = BenchmarkProgram.load("./benchmark_program.pickle")
+    oracle = benchmark_program.get_oracle()
+
+    # One JSON object per input, in the order of the inputs
+    with open(results_path, 'w') as f:
+        for inp in inputs:
+            try:
+                oracle_result, exception = oracle(inp)
+                result = {
+                    "result": str(oracle_result),
+                    "exception": repr(exception) if exception else None,
+                }
+            except Exception as e:
+                result = {"result": "UNDEFINED", "exception": repr(e)}
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == '__main__':
+    # Tests4Py logging
+    deactivate()
+
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import contextlib
+
+from debugging_framework.benchmark.program import BenchmarkProgram
+from debugging_framework.execution.timeout_manager import ManageTimeout
+from tests4py.api.logging import deactivate
+
+
+def main():
+    # Optional per-input timeout in seconds
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    # Answer on the original stdout only; everything the subject prints goes to stderr,
+    # so it cannot corrupt the protocol.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def respond(message: dict):
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    # Load the program once for all requests
+    benchmark_program: BenchmarkProgram = BenchmarkProgram.load("./benchmark_program.pickle")
+    oracle = benchmark_program.get_oracle()
+    # The pid lets the client kill this process if it stops answering
+    respond({"ready": True, "pid": os.getpid()})
+
+    # One JSON request per line: {"id": ..., "input": ...}
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            with ManageTimeout(timeout) if timeout else contextlib.nullcontext():
+                oracle_result, exception = oracle(request["input"])
+            respond(
+                {
+                    "id": request["id"],
+                    "result": str(oracle_result),
+                    "exception": repr(exception) if exception else None,
+                }
+            )
+        except Exception as e:
+            respond({"id": request["id"], "result": "UNDEFINED", "exception": repr(e)})
+
+
+if __name__ == '__main__':
+    # Tests4Py logging
+    deactivate()
+
+    main()
@@ -1,4 +1,4 @@
-from typing import Callable, Sequence, Type, Dict, List, Tuple, Any, Optional, Union, Set
+from typing import Callable, Sequence, Type, Dict, List, Tuple, Any, Optional, Union, Set, Awaitable
 from debugging_framework.input.input import Input
 import re
 from debugging_framework.input.oracle import OracleResult
@@ -17,3 +17,4 @@ RE_NONTERMINAL = re.compile(r"(<[^<> ]*>)")
 OracleResultType = Tuple[OracleResult, Optional[Exception]]
 OracleType = Callable[[Union[Input, str]], OracleResultType]
 BatchOracleType = Callable[[Union[Set[Input], Set[str]]], List[OracleResultType]]
+AsyncOracleType = Callable[[Union[Input, str]], Awaitable[OracleResultType]]
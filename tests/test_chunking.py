@@ -0,0 +1,25 @@
+import unittest
+
+from debugging_framework.docker.chunking import AdaptiveChunkSize
+
+
+class TestAdaptiveChunkSize(unittest.TestCase):
+    def test_grows_while_round_trips_dominate(self):
+        chunking = AdaptiveChunkSize(initial_size=16, max_size=1000, target_seconds=10)
+        size = chunking.size
+        sizes = []
+        for _ in range(10):
+            # 2s per round trip, 1ms per input
+            size = chunking.update(size, 2.0 + 0.001 * size)
+            sizes.append(size)
+        self.assertEqual(sizes[:3], [32, 64, 128])
+        self.assertEqual(sizes[-1], 1000)
+
+    def test_shrinks_for_slow_inputs(self):
+        chunking = AdaptiveChunkSize(initial_size=100, target_seconds=10)
+        self.assertEqual(chunking.update(100, 100.0), 10)
+        self.assertEqual(chunking.update(10, 100.0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import copy
+import re
+from collections import defaultdict
+
+from debugging_framework.types import RE_NONTERMINAL
+from debugging_framework.fuzzingbook.grammar import (
+    reachable_nonterminals,
+    split_expansion,
+)
+from debugging_framework.fuzzingbook.compiled_grammar import (
+    compile_grammar,
+    grammar_fingerprint,
+)
+from debugging_framework.learning.features import NumericFeature
+from debugging_benchmark.calculator.calculator import calculator_grammar
+from debugging_benchmark.tests4py_benchmark.grammars import grammar_markup
+
+
+class TestCompiledGrammar(unittest.TestCase):
+    def test_fingerprint(self):
+        grammar = copy.deepcopy(calculator_grammar)
+        self.assertEqual(
+            grammar_fingerprint(grammar), grammar_fingerprint(calculator_grammar)
+        )
+        self.assertIs(compile_grammar(grammar), compile_grammar(calculator_grammar))
+
+        grammar["<digit>"] = grammar["<digit>"] + ["a"]
+        self.assertNotEqual(
+            grammar_fingerprint(grammar), grammar_fingerprint(calculator_grammar)
+        )
+
+    def test_tokens(self):
+        compiled = compile_grammar(calculator_grammar)
+        for symbol, expansions in calculator_grammar.items():
+            for index, expansion in enumerate(expansions):
+                self.assertEqual(
+                    compiled.tokens(symbol, index), split_expansion(expansion)
+                )
+            self.assertTrue(compiled.is_nonterminal(symbol))
+
+        self.assertEqual(compiled.tokens("<start>", 0), (("<arith_expr>", True),))
+        self.assertFalse(compiled.is_nonterminal("sqrt"))
+
+    def test_reachability(self):
+        for grammar in (calculator_grammar, grammar_markup):
+            compiled = compile_grammar(grammar)
+            for symbol in grammar:
+                self.assertEqual(
+                    compiled.reachable_nonterminals(symbol),
+                    reachable_nonterminals(grammar, symbol),
+                )
+
+    def test_derivable_chars(self):
+        for grammar in (calculator_grammar, grammar_markup):
+            # The fixpoint iteration over the regex-split grammar
+            expected = defaultdict(set)
+            for rule, expansions in grammar.items():
+                for expansion in expansions:
+                    expected[rule].update(re.sub(RE_NONTERMINAL, "", expansion))
+            updated = True
+            while updated:
+                updated = False
+                for rule in grammar:
+                    for reachable_rule in reachable_nonterminals(grammar, rule):
+                        before_update = len(expected[rule])
+                        expected[rule].update(expected[reachable_rule])
+                        updated |= len(expected[rule]) > before_update
+
+            actual = NumericFeature.get_derivable_chars(grammar)
+            self.assertEqual(
+                {rule: chars for rule, chars in actual.items() if chars},
+                {rule: chars for rule, chars in expected.items() if chars},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+import asyncio
+import threading
+import time
 from typing import Set, Tuple, Union, List
 
 from isla.derivation_tree import DerivationTree
@@ -7,10 +10,18 @@ from isla.parser import EarleyParser
 from debugging_framework.execution.execution_handler import (
     SingleExecutionHandler,
     BatchExecutionHandler,
+    ParallelExecutionHandler,
+    AsyncExecutionHandler,
+    to_async_oracle,
 )
 from debugging_framework.input.input import Input
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.execution.report import MultipleFailureReport
+from debugging_framework.execution.stopping_policy import (
+    FailureQuotaStoppingPolicy,
+    TotalFailuresStoppingPolicy,
+    TimeBudgetStoppingPolicy,
+)
 from debugging_framework.types import OracleResultType
 
 from debugging_benchmark.calculator.calculator import calculator_grammar as grammar
@@ -79,6 +90,178 @@ class TestExecutionHandler(unittest.TestCase):
         for inp in self.test_inputs:
             print(inp, inp.oracle)
 
+    def test_parallel_execution_handler(self):
+        handler = ParallelExecutionHandler(oracle=oracle, max_workers=2, chunk_size=1)
+        report = MultipleFailureReport()
+
+        handler.label(self.test_inputs, report)
+        self.assertEqual(len(report.get_all_failing_inputs()), 2)
+        for inp in self.test_inputs:
+            expected = OracleResult.PASSING if str(inp) == "sin(1)" else OracleResult.FAILING
+            self.assertEqual(inp.oracle, expected)
+
+    def test_parallel_execution_handler_strings(self):
+        inputs = {"sqrt(-900)", "cos(10)", "sin(1)"}
+        parallel_report = MultipleFailureReport()
+        ParallelExecutionHandler(oracle=oracle, max_workers=2).label_strings(
+            inputs, parallel_report
+        )
+        single_report = MultipleFailureReport()
+        SingleExecutionHandler(oracle=oracle).label_strings(inputs, single_report)
+
+        self.assertEqual(parallel_report.to_dict(), single_report.to_dict())
+
+    def test_parallel_execution_handler_stream(self):
+        report = MultipleFailureReport()
+        labelled_while_generating = []
+
+        def stream():
+            for i in range(200):
+                # Only a bounded number of chunks is read ahead of the results
+                labelled_while_generating.append(len(report.telemetry))
+                yield ["sqrt(-900)", "cos(10)", "sin(1)"][i % 3]
+
+        ParallelExecutionHandler(oracle=oracle, max_workers=2, chunk_size=5).label_strings(
+            stream(), report
+        )
+        self.assertEqual(len(report.telemetry), 200)
+        self.assertEqual(labelled_while_generating[0], 0)
+        self.assertGreater(labelled_while_generating[-1], 150)
+
+    def test_async_execution_handler(self):
+        async def async_oracle(test_input):
+            await asyncio.sleep(0.2)
+            return oracle(test_input)
+
+        handler = AsyncExecutionHandler(oracle=async_oracle, max_concurrency=3)
+        report = MultipleFailureReport()
+
+        start = time.perf_counter()
+        handler.label(self.test_inputs, report)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(report.get_all_failing_inputs()), 2)
+        for inp in self.test_inputs:
+            self.assertIsNotNone(inp.oracle)
+
+    def test_async_execution_handler_timeout(self):
+        async def async_oracle(test_input):
+            if str(test_input) == "sin(1)":
+                await asyncio.sleep(10)
+            return oracle(test_input)
+
+        handler = AsyncExecutionHandler(
+            oracle=async_oracle, timeout=0.1, timeout_result=OracleResult.FAILING
+        )
+        report = MultipleFailureReport()
+        handler.label_strings({"sin(1)", "cos(10)"}, report)
+        self.assertEqual(
+            set(report.get_all_failing_inputs()), {"sin(1)", "cos(10)"}
+        )
+
+        report = MultipleFailureReport()
+        blocking_oracle = to_async_oracle(oracle)
+        AsyncExecutionHandler(oracle=blocking_oracle).label_strings(
+            {"sin(1)", "cos(10)"}, report
+        )
+        self.assertEqual(report.get_all_failing_inputs(), ["cos(10)"])
+
+        blocking_oracle.close()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(blocking_oracle("sin(1)"))
+
+    def test_async_execution_handler_bounds_threads(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_oracle(test_input):
+            with lock:
+                running.append(test_input)
+                peak.append(len(running))
+            time.sleep(0.3)
+            with lock:
+                running.remove(test_input)
+            return oracle(test_input)
+
+        # Timed-out calls keep their threads, so at most max_concurrency calls run at once
+        async_oracle = to_async_oracle(slow_oracle, max_concurrency=2)
+        handler = AsyncExecutionHandler(
+            oracle=async_oracle,
+            max_concurrency=2,
+            timeout=0.05,
+        )
+        handler.label_strings([f"sqrt({i})" for i in range(6)], MultipleFailureReport())
+        self.assertLessEqual(max(peak), 2)
+
+        async_oracle.close()
+        self.assertFalse(
+            [t for t in threading.enumerate() if t.name.startswith("async-oracle")]
+        )
+
+    def test_async_execution_handler_oracle_error(self):
+        async def async_oracle(test_input):
+            if str(test_input) == "sin(1)":
+                raise RuntimeError("Oracle crashed")
+            return oracle(test_input)
+
+        report = MultipleFailureReport()
+        AsyncExecutionHandler(oracle=async_oracle).label(self.test_inputs, report)
+        self.assertEqual(len(report.get_all_failing_inputs()), 2)
+        self.assertEqual(
+            {str(inp): inp.oracle for inp in self.test_inputs}["sin(1)"],
+            OracleResult.UNDEFINED,
+        )
+
+    def test_execution_telemetry(self):
+        def slow_oracle(test_input):
+            if str(test_input) == "sin(1)":
+                return OracleResult.UNDEFINED, TimeoutError("Function call timed out")
+            if str(test_input) == "sqrt(-900)":
+                return OracleResult.UNDEFINED, RuntimeError("Harness crashed")
+            return oracle(test_input)
+
+        report = MultipleFailureReport()
+        SingleExecutionHandler(oracle=slow_oracle).label(self.test_inputs, report)
+        summary = report.telemetry.summary()
+
+        self.assertEqual(summary["inputs"], 3)
+        self.assertEqual(summary["outcomes"], {"TIMEOUT": 1, "CRASH": 1, "FAILING": 1})
+        self.assertLessEqual(summary["p50"], summary["p99"])
+        self.assertGreater(summary["throughput"], 0)
+        self.assertGreater(summary["process_peak_rss"], 0)
+
+        report = MultipleFailureReport()
+        ParallelExecutionHandler(oracle=oracle, max_workers=2).label_strings(
+            {"sin(1)", "cos(10)"}, report
+        )
+        self.assertEqual(
+            report.telemetry.summary()["outcomes"], {"PASSING": 1, "FAILING": 1}
+        )
+
+    def test_stopping_policy(self):
+        inputs = ["sqrt(-900)", "sin(1)", "sqrt(-900)", "cos(10)", "cos(10)", "sin(1)"]
+
+        report = MultipleFailureReport()
+        SingleExecutionHandler(
+            oracle=oracle, stopping_policy=FailureQuotaStoppingPolicy(1, 2)
+        ).label_strings(inputs, report)
+        self.assertEqual(len(report.get_failures()), 2)
+        self.assertEqual(len(report.telemetry), 4)
+
+        report = MultipleFailureReport()
+        SingleExecutionHandler(
+            oracle=oracle, stopping_policy=TotalFailuresStoppingPolicy(1)
+        ).label_strings(inputs, report)
+        self.assertEqual(len(report.telemetry), 1)
+
+        report = MultipleFailureReport()
+        SingleExecutionHandler(
+            oracle=oracle,
+            stopping_policy=TimeBudgetStoppingPolicy(0)
+            | FailureQuotaStoppingPolicy(100),
+        ).label_strings(inputs, report)
+        self.assertEqual(len(report.telemetry), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
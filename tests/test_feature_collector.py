@@ -0,0 +1,57 @@
+import unittest
+
+from isla.parser import EarleyParser
+from isla.derivation_tree import DerivationTree
+
+from debugging_framework.fuzzingbook.grammar import is_nonterminal
+from debugging_framework.input.input import Input
+from debugging_framework.learning.features import FeatureVector, LengthFeature
+from debugging_framework.learning.feature_collector import GrammarFeatureCollector
+from debugging_benchmark.calculator.calculator import calculator_grammar
+
+
+class RecursiveGrammarFeatureCollector(GrammarFeatureCollector):
+    """Visits the derivation tree recursively."""
+
+    def set_features(self, tree, feature_vector):
+        (node, children) = tree
+        for feature in self.get_corresponding_feature(node):
+            feature_vector.set_feature(feature, feature.evaluate(tree))
+        for child in children:
+            if is_nonterminal(child[0]):
+                self.set_features(child, feature_vector)
+
+
+class TestGrammarFeatureCollector(unittest.TestCase):
+    def test_features_match_recursive_collection(self):
+        parser = EarleyParser(calculator_grammar)
+        collector = GrammarFeatureCollector(calculator_grammar)
+        reference = RecursiveGrammarFeatureCollector(calculator_grammar)
+        for inp in ["sqrt(-12.5)", "cos(10)", "tan(-900.123)"]:
+            tree = DerivationTree.from_parse_tree(next(parser.parse(inp)))
+            self.assertEqual(
+                collector.collect_features(Input(tree)).get_features(),
+                reference.collect_features(Input(tree)).get_features(),
+            )
+
+    def test_deep_tree(self):
+        grammar = {
+            "<start>": ["<list>"],
+            "<list>": ["", "<item><list>"],
+            "<item>": ["a", "b"],
+        }
+        depth = 100_000
+        tree = ("<list>", [("", [])])
+        for _ in range(depth):
+            tree = ("<list>", [("<item>", [("a", [])]), tree])
+        tree = ("<start>", [tree])
+
+        collector = GrammarFeatureCollector(grammar, [LengthFeature])
+        feature_vector = FeatureVector("a" * depth)
+        collector.set_features(tree, feature_vector)
+        self.assertEqual(feature_vector.get_feature_value(LengthFeature("<start>")), depth)
+        self.assertEqual(feature_vector.get_feature_value(LengthFeature("<item>")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import random
+
+from isla.parser import EarleyParser
+
+from debugging_framework.fuzzingbook.fuzzer import GrammarFuzzer
+from debugging_framework.fuzzingbook.grammar import exp_probabilities, all_terminals
+from debugging_framework.fuzzingbook.helper import tree_to_string
+from debugging_framework.fuzzingbook.probalistic_fuzzer import (
+    ProbabilisticGrammarFuzzer,
+)
+from debugging_framework.fuzzingbook.probalistic_grammar_miner import (
+    ProbabilisticGrammarMiner,
+)
+from debugging_benchmark.calculator.calculator import calculator_grammar
+from debugging_benchmark.tests4py_benchmark.grammars import grammar_markup
+
+
+class TreeWalkingGrammarFuzzer(GrammarFuzzer):
+    """Expands trees by walking them for every expansion, as the fuzzingbook does.
+    Overriding expand_tree_once makes expand_tree_with_strategy call it for every expansion."""
+
+    def expand_tree_once(self, tree):
+        (symbol, children) = tree
+        if children is None:
+            return self.expand_node(tree)
+
+        expandable_children = [c for c in children if self.any_possible_expansions(c)]
+        index_map = [i for (i, c) in enumerate(children) if c in expandable_children]
+        child_to_be_expanded = self.choose_tree_expansion(tree, expandable_children)
+        children[index_map[child_to_be_expanded]] = self.expand_tree_once(
+            expandable_children[child_to_be_expanded]
+        )
+        return tree
+
+
+class RecomputingProbabilisticGrammarFuzzer(GrammarFuzzer):
+    """Computes the expansion probabilities for every choice, as the fuzzingbook does."""
+
+    def choose_node_expansion(self, node, children_alternatives):
+        (symbol, tree) = node
+        probabilities = exp_probabilities(self.grammar[symbol])
+        weights = [
+            probabilities[all_terminals((symbol, children))]
+            for children in children_alternatives
+        ]
+        if sum(weights) == 0:
+            return random.choices(range(len(children_alternatives)))[0]
+        return random.choices(range(len(children_alternatives)), weights=weights)[0]
+
+
+class TestGrammarFuzzer(unittest.TestCase):
+    def test_costs(self):
+        fuzzer = GrammarFuzzer(calculator_grammar)
+        self.assertEqual(fuzzer.symbol_cost("<one_nine>"), 1)
+        self.assertEqual(fuzzer.symbol_cost("<maybe_frac>"), 1)
+        self.assertEqual(fuzzer.expansion_cost("<maybe_minus><one_nine>"), 3)
+        self.assertEqual(fuzzer.expansion_cost("<digits>", {"<digits>"}), float("inf"))
+
+        costs = fuzzer.node_expansion_costs("<digits>")
+        self.assertEqual(costs, [2, float("inf")])
+        self.assertIs(fuzzer.node_expansion_costs("<digits>"), costs)
+
+    def test_fuzz_recursive_grammar(self):
+        fuzzer = GrammarFuzzer(grammar_markup, max_nonterminals=5)
+        parser = EarleyParser(grammar_markup)
+        for _ in range(20):
+            inp = fuzzer.fuzz()
+            self.assertIsNotNone(next(parser.parse(inp)))
+
+    def test_frontier_expansion_matches_tree_walk(self):
+        for grammar in (calculator_grammar, grammar_markup):
+            for seed in range(5):
+                random.seed(seed)
+                expected = TreeWalkingGrammarFuzzer(
+                    grammar, min_nonterminals=3, max_nonterminals=20
+                ).fuzz()
+                random.seed(seed)
+                actual = GrammarFuzzer(
+                    grammar, min_nonterminals=3, max_nonterminals=20
+                ).fuzz()
+                self.assertEqual(actual, expected)
+
+    def test_expand_tree_once_override(self):
+        calls = []
+
+        class CountingGrammarFuzzer(GrammarFuzzer):
+            def expand_tree_once(self, tree):
+                calls.append(tree)
+                return super().expand_tree_once(tree)
+
+        random.seed(0)
+        expected = GrammarFuzzer(calculator_grammar).fuzz()
+        random.seed(0)
+        self.assertEqual(CountingGrammarFuzzer(calculator_grammar).fuzz(), expected)
+        self.assertGreater(len(calls), 0)
+
+    def test_probabilistic_sampling_tables(self):
+        prob_grammar = ProbabilisticGrammarMiner(
+            EarleyParser(calculator_grammar)
+        ).mine_probabilistic_grammar(inputs=["sqrt(-900)", "cos(10)", "tan(-1.5)"])
+        for seed in range(5):
+            random.seed(seed)
+            expected = RecomputingProbabilisticGrammarFuzzer(
+                prob_grammar, min_nonterminals=3, max_nonterminals=20
+            ).fuzz()
+            random.seed(seed)
+            actual = ProbabilisticGrammarFuzzer(
+                prob_grammar, min_nonterminals=3, max_nonterminals=20
+            ).fuzz()
+            self.assertEqual(actual, expected)
+
+    def test_deep_tree(self):
+        grammar = {
+            "<start>": ["<list>"],
+            "<list>": ["", "<item><list>"],
+            "<item>": ["a", "b"],
+        }
+        depth = 100_000
+        tree = ("<list>", None)
+        for _ in range(depth):
+            tree = ("<list>", [("<item>", [("a", [])]), tree])
+        tree = ("<start>", [tree])
+
+        fuzzer = GrammarFuzzer(grammar)
+        self.assertEqual(fuzzer.possible_expansions(tree), 1)
+        self.assertTrue(fuzzer.any_possible_expansions(tree))
+        self.assertEqual(all_terminals(tree), "a" * depth + "<list>")
+        self.assertEqual(tree_to_string(tree), "a" * depth)
+
+        fuzzer.expand_node = fuzzer.expand_node_min_cost
+        fuzzer.expand_tree_once(tree)
+        self.assertEqual(fuzzer.possible_expansions(tree), 0)
+        self.assertFalse(fuzzer.any_possible_expansions(tree))
+
+    def test_fuzz_many(self):
+        fuzzer = GrammarFuzzer(calculator_grammar, max_nonterminals=5)
+        first = list(fuzzer.fuzz_many(50, seed=1))
+        self.assertEqual(len(first), 50)
+        self.assertEqual(len(set(first)), 50)
+        self.assertFalse(fuzzer.exhausted)
+        self.assertEqual(list(fuzzer.fuzz_many(50, seed=1)), first)
+        self.assertNotEqual(list(fuzzer.fuzz_many(50, seed=1, stream=1)), first)
+        self.assertIs(fuzzer.rng, random)
+
+    def test_fuzz_many_exhausted(self):
+        fuzzer = GrammarFuzzer({"<start>": ["a", "b", "<start><start>"]})
+        fuzzer.max_nonterminals = 0
+        inputs = list(fuzzer.fuzz_many(10, seed=0, max_consecutive_duplicates=50))
+        self.assertEqual(sorted(inputs), ["a", "b"])
+        self.assertTrue(fuzzer.exhausted)
+
+    def test_fuzz_many_early_stop(self):
+        fuzzer = GrammarFuzzer(calculator_grammar, max_nonterminals=5)
+        inputs = fuzzer.fuzz_many(50, seed=1)
+        next(inputs)
+        # The seeded RNG is only used while drawing
+        self.assertIs(fuzzer.rng, random)
+        self.assertFalse(fuzzer.exhausted)
+
+    def test_fuzz_many_external_deduplication(self):
+        fuzzer = GrammarFuzzer(calculator_grammar, max_nonterminals=5)
+        seen = set()
+        inputs = []
+        for inp in fuzzer.fuzz_many(50, seed=1, is_duplicate=seen.__contains__):
+            seen.add(inp)
+            inputs.append(inp)
+        self.assertEqual(inputs, list(fuzzer.fuzz_many(50, seed=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
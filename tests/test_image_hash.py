@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from debugging_framework.docker.manager import get_build_hash, IMAGE_HASH_LENGTH
+
+
+class TestBuildHash(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.runner = os.path.join(self.temp_dir.name, "docker_runner.py")
+        self.setup = os.path.join(self.temp_dir.name, "docker_setup.py")
+        for file in (self.runner, self.setup):
+            with open(file, "w") as f:
+                f.write("print('hello')\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hash_is_stable(self):
+        build_hash = get_build_hash("FROM base", [self.runner, self.setup], "3.10.9")
+        self.assertEqual(len(build_hash), IMAGE_HASH_LENGTH)
+        self.assertEqual(
+            build_hash, get_build_hash("FROM base", [self.setup, self.runner], "3.10.9")
+        )
+
+    def test_hash_changes_with_build_inputs(self):
+        build_hash = get_build_hash("FROM base", [self.runner], "3.10.9", "pysnooper_2")
+        self.assertNotEqual(
+            build_hash, get_build_hash("FROM other", [self.runner], "3.10.9", "pysnooper_2")
+        )
+        self.assertNotEqual(
+            build_hash, get_build_hash("FROM base", [self.runner], "3.11.4", "pysnooper_2")
+        )
+        self.assertNotEqual(
+            build_hash, get_build_hash("FROM base", [self.runner], "3.10.9", "pysnooper_3")
+        )
+
+        with open(self.runner, "a") as f:
+            f.write("print('changed')\n")
+        self.assertNotEqual(
+            build_hash, get_build_hash("FROM base", [self.runner], "3.10.9", "pysnooper_2")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
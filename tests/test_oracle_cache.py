@@ -0,0 +1,80 @@
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+from debugging_framework.input.oracle import OracleResult
+from debugging_framework.execution.oracle_cache import CachedOracle, decode_exception
+from debugging_benchmark.calculator.calculator import calculator_oracle
+
+
+class TestOracleCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = Path(self.temp_dir.name) / "cache.db"
+        self.calls = []
+
+        def oracle(inp):
+            self.calls.append(str(inp))
+            return calculator_oracle(inp)
+
+        self.oracle = oracle
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_repeated_inputs_hit_cache(self):
+        cached_oracle = CachedOracle(self.oracle, "calculator", self.cache_file)
+
+        first = cached_oracle("sqrt(-900)")
+        second = cached_oracle("sqrt(-900)")
+
+        self.assertEqual(self.calls, ["sqrt(-900)"])
+        self.assertEqual(first[0], OracleResult.FAILING)
+        self.assertEqual(second[0], OracleResult.FAILING)
+        self.assertIsInstance(second[1], ValueError)
+        self.assertEqual((cached_oracle.hits, cached_oracle.misses), (1, 1))
+        cached_oracle.close()
+
+    def test_cache_persists_across_instances(self):
+        cached_oracle = CachedOracle(self.oracle, "calculator", self.cache_file)
+        cached_oracle("cos(10)")
+        cached_oracle.close()
+
+        cached_oracle = CachedOracle(self.oracle, "calculator", self.cache_file)
+        self.assertEqual(cached_oracle("cos(10)"), (OracleResult.PASSING, None))
+        self.assertEqual(self.calls, ["cos(10)"])
+
+        other_subject = CachedOracle(self.oracle, "other", self.cache_file)
+        other_subject("cos(10)")
+        self.assertEqual(self.calls, ["cos(10)", "cos(10)"])
+        cached_oracle.close()
+        other_subject.close()
+
+    def test_lru_eviction(self):
+        cached_oracle = CachedOracle(
+            self.oracle, "calculator", self.cache_file, max_entries=10
+        )
+        for i in range(1, 12):
+            cached_oracle(f"sin({i})")
+        cached_oracle("sin(11)")
+        self.assertLessEqual(cached_oracle._number_of_entries, 10)
+
+        cached_oracle("sin(1)")
+        self.assertEqual(self.calls.count("sin(1)"), 2)
+        self.assertEqual(self.calls.count("sin(11)"), 1)
+        cached_oracle.close()
+
+    def test_decode_exception_does_not_import(self):
+        self.assertIsInstance(decode_exception("builtins:ValueError", "x"), ValueError)
+        self.assertIsInstance(
+            decode_exception("unittest.case:SkipTest", "x"), unittest.SkipTest
+        )
+        for exception_type in ("antigravity:Exception", "builtins:print", "os:system"):
+            decoded = decode_exception(exception_type, "x")
+            self.assertIs(type(decoded), Exception)
+        self.assertNotIn("antigravity", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
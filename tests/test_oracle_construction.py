@@ -1,15 +1,26 @@
 import unittest
+from unittest import mock
 import string
+import signal
+import threading
+import time
+import gc
+import os
 
 from debugging_framework.input.oracle_construction import (
     FailureOracleConstructor,
     FunctionalOracleConstructor,
     UnexpectedResultError,
+    CopyStrategy,
+    copy_parameters,
+    ReferenceMemo,
 )
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.input.input import Input
 from debugging_framework.types import Grammar
 from debugging_framework.execution.timeout_manager import ManageTimeout
+from debugging_framework.execution.fork_server import ForkServer
+from debugging_framework.execution.exceptions import WorkerDiedError
 
 grammar: Grammar = {
     "<start>": ["<input>"],
@@ -197,6 +208,386 @@ class TestConstructOracle(unittest.TestCase):
         oracle_result, _ = my_oracle(Input.from_str(grammar, "1 1"))
         self.assertTrue(isinstance(oracle_result, OracleResult))
 
+    def test_fork_server_oracle(self):
+        def oracle(x, y):
+            return x + y
+
+        def under_test(x, y):
+            return x * y + 1
+
+        my_oracle = FunctionalOracleConstructor(
+            under_test,
+            oracle,
+            error_definitions=self.error_definitions,
+            harness_function=self.harness_function,
+            use_fork_server=True,
+        ).build()
+        self.addCleanup(my_oracle.close)
+
+        oracle_result, exception = my_oracle(Input.from_str(grammar, "1 1"))
+        self.assertEqual(oracle_result, OracleResult.PASSING)
+        oracle_result, exception = my_oracle(Input.from_str(grammar, "2 3"))
+        self.assertEqual(oracle_result, OracleResult.FAILING)
+        self.assertIsInstance(exception, UnexpectedResultError)
+
+    def test_fork_server_timeout_from_threads(self):
+        def under_test(x, y):
+            while x > 1:
+                pass
+            return x + y
+
+        my_oracle = FailureOracleConstructor(
+            program=under_test,
+            error_definitions={TimeoutError: OracleResult.FAILING},
+            harness_function=self.harness_function,
+            timeout=0.2,
+            use_fork_server=True,
+            number_of_workers=2,
+        ).build()
+        self.addCleanup(my_oracle.close)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(my_oracle, ["2 1", "1 1", "3 1", "1 2"]))
+
+        self.assertEqual(
+            [oracle_result for oracle_result, _ in results],
+            [
+                OracleResult.FAILING,
+                OracleResult.PASSING,
+                OracleResult.FAILING,
+                OracleResult.PASSING,
+            ],
+        )
+        self.assertIsInstance(results[0][1], TimeoutError)
+
+    def test_batch_oracle(self):
+        def oracle(x, y):
+            return x + y
+
+        def under_test(x, y):
+            while x > 5:
+                pass
+            return x * y + 1
+
+        inputs = ["1 1", "2 3", "7 1", "1 1"]
+        for use_fork_server in (False, True):
+            constructor = FunctionalOracleConstructor(
+                under_test,
+                oracle,
+                error_definitions=self.error_definitions,
+                harness_function=self.harness_function,
+                timeout=0.1,
+                use_fork_server=use_fork_server,
+            )
+            with self.subTest(use_fork_server=use_fork_server):
+                batch_oracle = constructor.build_batch()
+                if use_fork_server:
+                    self.addCleanup(batch_oracle.close)
+                results = batch_oracle(inputs)
+                self.assertEqual(
+                    [oracle_result for oracle_result, _ in results],
+                    [
+                        OracleResult.PASSING,
+                        OracleResult.FAILING,
+                        OracleResult.UNDEFINED,
+                        OracleResult.PASSING,
+                    ],
+                )
+                self.assertIsInstance(results[1][1], UnexpectedResultError)
+                self.assertIsInstance(results[2][1], TimeoutError)
+
+    def test_harness_errors(self):
+        def harness_function(inp):
+            return {"a": (1, 2)}[str(inp)]
+
+        inputs = ["a", "b"]
+        results = {}
+        for use_fork_server in (False, True):
+            constructor = FailureOracleConstructor(
+                program=lambda x, y: x + y,
+                harness_function=harness_function,
+                use_fork_server=use_fork_server,
+            )
+            my_oracle = constructor.build()
+            batch_oracle = constructor.build_batch()
+            if use_fork_server:
+                self.addCleanup(my_oracle.close)
+                self.addCleanup(batch_oracle.close)
+            results[f"oracle, use_fork_server={use_fork_server}"] = [
+                my_oracle(inp) for inp in inputs
+            ]
+            results[f"batch, use_fork_server={use_fork_server}"] = batch_oracle(inputs)
+
+        for path, path_results in results.items():
+            with self.subTest(path):
+                self.assertEqual(path_results[0], (OracleResult.PASSING, None))
+                self.assertEqual(path_results[1][0], OracleResult.UNDEFINED)
+                self.assertIsInstance(path_results[1][1], KeyError)
+
+    def test_batch_oracle_worker_death(self):
+        def under_test(x, y):
+            if x == 3:
+                os._exit(1)
+            return x + y
+
+        inputs = ["1 1", "2", "3 1", "1 2"]
+        constructor = FailureOracleConstructor(
+            program=under_test,
+            error_definitions={TypeError: OracleResult.FAILING},
+            harness_function=self.harness_function,
+            use_fork_server=True,
+        )
+        my_oracle = constructor.build()
+        self.addCleanup(my_oracle.close)
+        batch_oracle = constructor.build_batch()
+        self.addCleanup(batch_oracle.close)
+
+        results = batch_oracle(inputs)
+        self.assertEqual(
+            [oracle_result for oracle_result, _ in results],
+            [
+                OracleResult.PASSING,
+                OracleResult.FAILING,
+                OracleResult.UNDEFINED,
+                OracleResult.PASSING,
+            ],
+        )
+        self.assertIsInstance(results[2][1], WorkerDiedError)
+        self.assertEqual(
+            [oracle_result for oracle_result, _ in results],
+            [my_oracle(inp)[0] for inp in inputs],
+        )
+
+    def test_memory_limit(self):
+        def under_test(x, y):
+            return len(bytearray(x * 1024 * 1024)) + y
+
+        my_oracle = FailureOracleConstructor(
+            program=under_test,
+            error_definitions={MemoryError: OracleResult.UNDEFINED},
+            harness_function=self.harness_function,
+            timeout=5,
+            max_memory=64,
+        ).build()
+        self.addCleanup(my_oracle.close)
+
+        oracle_result, exception = my_oracle("512 1")
+        self.assertEqual(oracle_result, OracleResult.UNDEFINED)
+        self.assertIsInstance(exception, MemoryError)
+        self.assertEqual(my_oracle("8 1"), (OracleResult.PASSING, None))
+
+    def test_worker_death_under_memory_limit(self):
+        def under_test(x, y):
+            os.kill(os.getpid(), x)
+            return y
+
+        my_oracle = FailureOracleConstructor(
+            program=under_test,
+            harness_function=self.harness_function,
+            timeout=5,
+            max_memory=64,
+        ).build()
+        self.addCleanup(my_oracle.close)
+
+        oracle_result, exception = my_oracle(f"{signal.SIGTERM.value} 1")
+        self.assertEqual(oracle_result, OracleResult.UNDEFINED)
+        self.assertIsInstance(exception, WorkerDiedError)
+        self.assertEqual(exception.exitcode, -signal.SIGTERM)
+
+        oracle_result, exception = my_oracle(f"{signal.SIGKILL.value} 1")
+        self.assertIsInstance(exception, MemoryError)
+
+    def test_fork_server_lifecycle(self):
+        my_oracle = FailureOracleConstructor(
+            program=lambda x, y: x + y,
+            harness_function=self.harness_function,
+            use_fork_server=True,
+        ).build()
+        self.assertEqual(my_oracle("1 1"), (OracleResult.PASSING, None))
+        process = my_oracle.fork_server._workers[0].process
+
+        # The workers are killed once the oracle owning the server is gone
+        del my_oracle
+        gc.collect()
+        process.join(timeout=5)
+        self.assertFalse(process.is_alive())
+
+    def test_fork_server_fork_failure(self):
+        def under_test(param):
+            x, y = param
+            while x > 1:
+                pass
+            return x + y
+
+        fork_server = ForkServer(under_test, timeout=0.2)
+        self.addCleanup(fork_server.close)
+        with self.assertRaises(TimeoutError):
+            fork_server((2, 1))
+
+        fork_worker = fork_server._fork_worker
+        fork_server._fork_worker = mock.Mock(side_effect=OSError("fork failed"))
+        with self.assertRaises(ChildProcessError):
+            fork_server((1, 1))
+
+        # The free slot is kept, so the next call forks a replacement instead of blocking
+        fork_server._fork_worker = fork_worker
+        self.assertEqual(fork_server((1, 1)), 2)
+
+    def test_fork_server_slots(self):
+        def under_test(param):
+            time.sleep(param)
+            return param
+
+        fork_server = ForkServer(under_test, timeout=5)
+        self.addCleanup(fork_server.close)
+
+        # A request that cannot be pickled does not take the only slot with it
+        with self.assertRaises(Exception):
+            fork_server(lambda: 0)
+        self.assertEqual(fork_server(0), 0)
+
+        # Closing the server while one call runs and another waits for the worker leaves both with a slot
+        results = {}
+
+        def call(name, param):
+            try:
+                results[name] = fork_server(param)
+            except Exception as e:
+                results[name] = e
+
+        running = threading.Thread(target=call, args=("running", 2))
+        running.start()
+        time.sleep(0.5)
+        waiting = threading.Thread(target=call, args=("waiting", 0))
+        waiting.start()
+        time.sleep(0.2)
+        fork_server.close()
+        running.join(timeout=10)
+        waiting.join(timeout=10)
+        self.assertIsInstance(results["running"], WorkerDiedError)
+        self.assertEqual(results["waiting"], 0)
+        self.assertEqual(fork_server(0), 0)
+
+    def test_copy_parameters(self):
+        immutable = (1, "a", (2.0, None))
+        self.assertIs(copy_parameters(immutable, CopyStrategy.AUTO), immutable)
+
+        mutable = (1, [2, {"a": [3]}])
+        for strategy in [CopyStrategy.AUTO, CopyStrategy.STRUCTURAL, CopyStrategy.DEEP]:
+            with self.subTest(strategy):
+                copied = copy_parameters(mutable, strategy)
+                self.assertEqual(copied, mutable)
+                self.assertIsNot(copied[1], mutable[1])
+                self.assertIsNot(copied[1][1]["a"], mutable[1][1]["a"])
+
+        self.assertIs(copy_parameters(mutable, CopyStrategy.NONE), mutable)
+
+        class Element:
+            pass
+
+        element = Element()
+        for container in [{element}, frozenset({element})]:
+            with self.subTest(container):
+                copied = copy_parameters((container,), CopyStrategy.STRUCTURAL)[0]
+                self.assertIs(type(copied), type(container))
+                self.assertIsNot(next(iter(copied)), element)
+
+    def test_copy_strategy_isolates_reference(self):
+        def oracle(data):
+            return sum(data["numbers"])
+
+        def under_test(data):
+            data["numbers"].append(10)
+            return sum(data["numbers"]) - 10
+
+        def harness_function(inp):
+            return [{"numbers": list(map(int, str(inp).split()))}]
+
+        for strategy, expected in [
+            (CopyStrategy.AUTO, OracleResult.PASSING),
+            (CopyStrategy.STRUCTURAL, OracleResult.PASSING),
+            (CopyStrategy.DEEP, OracleResult.PASSING),
+            (CopyStrategy.NONE, OracleResult.FAILING),
+        ]:
+            with self.subTest(strategy):
+                my_oracle = FunctionalOracleConstructor(
+                    under_test,
+                    oracle,
+                    harness_function=harness_function,
+                    copy_strategy=strategy,
+                ).build()
+                oracle_result, _ = my_oracle("3 1 2")
+                self.assertEqual(oracle_result, expected)
+
+    def test_reference_memo(self):
+        reference_calls = []
+
+        def oracle(x, y):
+            reference_calls.append((x, y))
+            return x + y
+
+        def under_test_1(x, y):
+            return x + y
+
+        def under_test_2(x, y):
+            return y + x + 1
+
+        memo = ReferenceMemo()
+        oracles = [
+            FunctionalOracleConstructor(
+                under_test,
+                oracle,
+                harness_function=self.harness_function,
+                reference_memo=memo,
+            ).build()
+            for under_test in [under_test_1, under_test_2]
+        ]
+
+        results = [my_oracle(inp)[0] for my_oracle in oracles for inp in ["1 2", "3 4"]]
+        self.assertEqual(
+            results,
+            [
+                OracleResult.PASSING,
+                OracleResult.PASSING,
+                OracleResult.FAILING,
+                OracleResult.FAILING,
+            ],
+        )
+        self.assertEqual(reference_calls, [(1, 2), (3, 4)])
+        self.assertEqual((memo.hits, memo.misses), (2, 2))
+
+    def test_reference_memo_keys(self):
+        memo = ReferenceMemo()
+        self.assertEqual(memo.get_or_compute(({"a": 1, "b": 2},), lambda: 1), 1)
+        self.assertEqual(memo.get_or_compute(({"b": 2, "a": 1},), lambda: 2), 1)
+        self.assertEqual(memo.get_or_compute((True,), lambda: 3), 3)
+        self.assertEqual(memo.get_or_compute((1,), lambda: 4), 4)
+
+        # Objects without a canonical serialization bypass the memo
+        class Point:
+            pass
+
+        self.assertEqual(memo.get_or_compute((Point(),), lambda: 5), 5)
+        self.assertEqual(memo.get_or_compute((Point(),), lambda: 6), 6)
+        self.assertEqual((memo.hits, memo.misses, len(memo)), (1, 3, 3))
+
+    def test_reference_memo_exceptions(self):
+        memo = ReferenceMemo()
+
+        def reference():
+            raise ValueError("invalid", 1)
+
+        raised = []
+        for _ in range(2):
+            with self.assertRaises(ValueError) as context:
+                memo.get_or_compute(("x",), reference)
+            raised.append(context.exception)
+        self.assertEqual(raised[1].args, ("invalid", 1))
+        self.assertIsNot(raised[0], raised[1])
+        self.assertEqual(memo.hits, 1)
+
     @unittest.skip
     def test_oracle_sigkill(self):
         """
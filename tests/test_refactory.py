@@ -38,6 +38,17 @@ class TestRefactory(unittest.TestCase):
         for repo in self.repos:
             self.assertTrue(is_valid_grammar(repo.get_grammar()))
 
+    def test_build_question(self):
+        refactorys = Question1RefactoryBenchmarkRepository().build()
+        self.assertTrue(refactorys)
+
+        for refactory in refactorys[:5]:
+            with self.subTest(refactory):
+                oracle = refactory.get_oracle()
+                for inp in refactory.get_initial_inputs():
+                    result, _ = oracle(inp)
+                    self.assertIsInstance(result, OracleResult)
+
     def test_subject_parsing_inputs(self):
         for refactory in self.refactorys:
             with self.subTest(refactory):
@@ -5,6 +5,14 @@ from isla.parser import EarleyParser
 
 from debugging_framework.input.oracle import OracleResult
 from debugging_framework.input.input import Input
+from debugging_framework.input.parsing import (
+    get_parser,
+    get_parse_tree_cache_info,
+    clear_parser_cache,
+)
+from debugging_framework.fuzzingbook.probalistic_grammar_miner import (
+    ExpansionCountMiner,
+)
 from debugging_framework.types import Grammar
 from debugging_framework.fuzzingbook.grammar import is_valid_grammar
 from debugging_benchmark.calculator.calculator import (
@@ -76,6 +84,49 @@ class TestInputs(unittest.TestCase):
 
         self.assertEqual(1, len(test_inputs))
 
+    def test_parser_cache(self):
+        grammar_copy = {symbol: list(exp) for symbol, exp in grammar.items()}
+        self.assertIs(get_parser(grammar), get_parser(grammar_copy))
+
+        grammar_copy["<function>"] = grammar_copy["<function>"] + ["log"]
+        self.assertIsNot(get_parser(grammar), get_parser(grammar_copy))
+
+        # Changing a grammar after its parser was cached must not change the cached parser
+        parser = get_parser(grammar_copy)
+        grammar_copy["<function>"].append(("exp", {"prob": 0.1}))
+        self.assertEqual(parser.grammar()["<function>"][-1], "log")
+
+    def test_parse_tree_cache(self):
+        clear_parser_cache()
+        first = Input.from_str(grammar, "sqrt(-900)")
+        second = Input.from_str(grammar, "sqrt(-900)")
+        self.assertIs(first.tree, second.tree)
+        info = get_parse_tree_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (1, 1))
+
+        miner = ExpansionCountMiner(get_parser(grammar))
+        miner.count_expansions(["sqrt(-900)", "cos(10)"])
+        info = get_parse_tree_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (2, 2))
+        self.assertEqual(miner.counts()["<function> -> sqrt"], 1)
+        self.assertEqual(miner.counts()["<start> -> <arith_expr>"], 2)
+
+        # A parser with a custom start symbol is used as it is
+        miner = ExpansionCountMiner(EarleyParser(grammar, start_symbol="<number>"))
+        miner.count_expansions(["-900"])
+        self.assertEqual(miner.counts()["<maybe_minus> -> -"], 1)
+        self.assertNotIn("<start> -> <arith_expr>", miner.counts())
+        self.assertEqual(get_parse_tree_cache_info()["misses"], 2)
+
+    def test_from_strings(self):
+        inputs = ["sqrt(-900)", "cos(10)", "tan(1.5)", "sin(-2)"]
+        expected = [Input.from_str(grammar, inp) for inp in inputs]
+        self.assertEqual(Input.from_strings(grammar, inputs), expected)
+
+        parsed = Input.from_strings(grammar, inputs, workers=2)
+        self.assertEqual(parsed, expected)
+        self.assertEqual([str(inp) for inp in parsed], inputs)
+
 
 if __name__ == "__main__":
     unittest.main()
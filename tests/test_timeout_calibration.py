@@ -0,0 +1,62 @@
+import unittest
+import time
+
+from debugging_framework.execution.timeout_calibration import (
+    calibrate_timeout,
+    get_calibration_inputs,
+    measure_execution_times,
+    MIN_TIMEOUT,
+)
+from debugging_benchmark.calculator.calculator import calculator_grammar
+from debugging_benchmark.student_assignments.repository import (
+    GCDStudentAssignmentRepository,
+)
+
+
+def sleeping_program(seconds: str):
+    time.sleep(float(seconds))
+
+
+class TestTimeoutCalibration(unittest.TestCase):
+    def test_calibrate_timeout(self):
+        inputs = ["0.001"] * 19 + ["0.005"]
+        timeout = calibrate_timeout(sleeping_program, inputs, multiplier=2.0)
+        self.assertGreaterEqual(timeout, 0.002)
+        self.assertLess(timeout, 0.01 * 2)
+
+        # Fast programs never get a timeout below the absolute floor, even if a lower bound is passed
+        self.assertGreaterEqual(calibrate_timeout(sleeping_program, ["0.0"]), MIN_TIMEOUT)
+        self.assertEqual(
+            calibrate_timeout(sleeping_program, ["0.0"], min_timeout=0.0001), MIN_TIMEOUT
+        )
+        self.assertEqual(
+            calibrate_timeout(sleeping_program, ["0.0"], min_timeout=0.02), 0.02
+        )
+        self.assertEqual(
+            calibrate_timeout(sleeping_program, ["5"], max_timeout=0.05), 0.05
+        )
+
+    def test_calibration_inputs_are_reproducible(self):
+        first = get_calibration_inputs(calculator_grammar, ["sqrt(1)"], 10)
+        second = get_calibration_inputs(calculator_grammar, ["sqrt(1)"], 10)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], "sqrt(1)")
+        self.assertEqual(len(first), 11)
+
+    def test_timeout_stored_with_program(self):
+        repository = GCDStudentAssignmentRepository()
+        for program in repository.build():
+            self.assertIsNotNone(program.get_timeout())
+            # Fast subjects keep at least 10ms, so scheduler jitter under load does not cause spurious timeouts
+            self.assertGreaterEqual(program.get_timeout(), 0.01)
+
+    def test_measure_all_repetitions(self):
+        execution_times = measure_execution_times(sleeping_program, "0.001", repetitions=5)
+        self.assertEqual(len(execution_times), 5)
+        self.assertIsNone(
+            measure_execution_times(sleeping_program, "x", harness_function=float)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
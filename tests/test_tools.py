@@ -1,6 +1,8 @@
 import unittest
 
 from debugging_framework.execution.report import Report
+from debugging_framework.execution.stopping_policy import TotalFailuresStoppingPolicy
+from debugging_framework.evaluation.streaming import InputStream
 from debugging_benchmark.calculator.calculator import CalculatorBenchmarkRepository
 from debugging_framework.evaluation.tools import (
     GrammarBasedEvaluationFuzzer,
@@ -29,6 +31,70 @@ class TestTools(unittest.TestCase):
         report = fuzzer.run()
         self.assertTrue(isinstance(report, Report))
 
+    def test_stopping_policy(self):
+        fuzzer = GrammarBasedEvaluationFuzzer(
+            **self.param, stopping_policy=TotalFailuresStoppingPolicy(1)
+        )
+        report = fuzzer.run()
+        self.assertLessEqual(len(report.get_all_failing_inputs()), 1)
+
+        with self.assertRaises(ValueError):
+            GrammarBasedEvaluationFuzzer(
+                **self.param,
+                stopping_policy=TotalFailuresStoppingPolicy(1),
+                max_workers=2,
+            )
+
+    def test_max_generated_inputs_counts_unique_inputs(self):
+        for tool in (GrammarBasedEvaluationFuzzer, ISLaGrammarEvaluationFuzzer):
+            with self.subTest(tool.name):
+                fuzzer = tool(**self.param, max_generated_inputs=50, seed=1)
+                fuzzer.run()
+                self.assertEqual(len(fuzzer.get_generated_inputs()), 50)
+
+    def test_not_exhausted_by_duplicates(self):
+        fuzzer = GrammarBasedEvaluationFuzzer(
+            **self.param, max_generated_inputs=200, seed=1
+        )
+        fuzzer.run()
+        self.assertFalse(fuzzer.exhausted)
+        self.assertEqual(len(fuzzer.get_generated_inputs()), 200)
+
+    def test_seeded_run(self):
+        runs = [
+            InputsFromHellEvaluationFuzzer(
+                **self.param, max_generated_inputs=100, seed=42
+            )
+            for _ in range(2)
+        ]
+        for run in runs:
+            run.run()
+        self.assertEqual(runs[0].get_generated_inputs(), runs[1].get_generated_inputs())
+        self.assertGreater(len(runs[0].get_generated_inputs()), 0)
+
+    def test_input_stream(self):
+        numbers = iter(range(1000))
+        with InputStream(
+            lambda: str(next(numbers) % 10), 1000, max_queue_size=4
+        ) as stream:
+            self.assertEqual(sorted(stream), [str(i) for i in range(10)])
+        self.assertEqual(len(stream.generated_inputs), 10)
+
+        numbers = iter(range(10_000))
+        with InputStream(lambda: str(next(numbers)), 10_000, max_queue_size=4) as stream:
+            for _ in stream:
+                break
+        self.assertLess(len(stream), 10)
+
+        def failing_generator():
+            raise ValueError("Generator failed")
+
+        with self.assertRaises(ValueError):
+            list(InputStream(failing_generator, 10))
+
+        with InputStream(None, 5, inputs=iter(["a", "b", "a", "c", "d", "e"])) as stream:
+            self.assertEqual(list(stream), ["a", "b", "c", "d"])
+
 
 if __name__ == "__main__":
     unittest.main()